@@ -9,9 +9,13 @@ import csv
 import concurrent.futures
 import threading
 import argparse
+import pandas as pd
 from google import genai
 from google.genai import types
-from language_config import add_language_args, get_language_config, ensure_folder_exists, get_fertility_terms, get_search_instruction
+from language_config import add_language_args, get_language_config, ensure_folder_exists, get_fertility_terms, get_search_instruction, resolve_languages
+from worker_pool import rate_limited, run_languages
+from context_cache import client_http_options
+from model_routing import model_for
 
 # Load environment variables from .env file
 try:
@@ -23,30 +27,33 @@ except ImportError:
 # --- Configuration ---
 try:
     api_key = os.environ["GOOGLE_API_KEY"]
-    client = genai.Client(api_key=api_key)
+    client = rate_limited(genai.Client(api_key=api_key, http_options=client_http_options()))
 except KeyError:
     print("Error: GOOGLE_API_KEY environment variable not set.")
     exit()
 
 # Model configuration
-MODEL_NAME = os.environ.get("GEMINI_MODEL", "gemini-2.5-pro")
+MODEL_NAME = model_for("discover")
 # Model configuration will be printed in main function after language is determined
 
 # Thread-safe file writing
 file_lock = threading.Lock()
-existing_urls = set()
 
 # Logging configuration
 RUN_TIMESTAMP = time.strftime('%Y%m%d_%H%M%S')
 LOG_DIR = "findings/logs"
 os.makedirs(LOG_DIR, exist_ok=True)
-DISCOVERY_LOG = os.path.join(LOG_DIR, f"discovery_run_{RUN_TIMESTAMP}.md")
+
+
+def discovery_log_path(language: str = 'en') -> str:
+    """Narrative log for this run's discovery in one language."""
+    return os.path.join(LOG_DIR, f"discovery_run_{RUN_TIMESTAMP}-{language}.md")
 
 
 def init_log(queries: list[str], language: str = 'en'):
     """Initialize the narrative log for this discovery run."""
     language_config = get_language_config(language)
-    with open(DISCOVERY_LOG, 'w', encoding='utf-8') as log:
+    with open(discovery_log_path(language), 'w', encoding='utf-8') as log:
         log.write(f"# Discovery Run {RUN_TIMESTAMP}\n\n")
         log.write(f"**Model:** {MODEL_NAME}\n\n")
         log.write(f"**Language:** {language_config['name']} ({language})\n\n")
@@ -54,10 +61,10 @@ def init_log(queries: list[str], language: str = 'en'):
         log.write(f"**Output CSV:** findings/1_discovery-{language}/discovery_data-{language}.csv\n\n")
 
 
-def log_query_outcome(query: str, status: str, details: str = "", results: list[dict] | None = None):
+def log_query_outcome(query: str, status: str, details: str = "", results: list[dict] | None = None, language: str = 'en'):
     """Append query outcome details to the narrative log."""
     results = results or []
-    with open(DISCOVERY_LOG, 'a', encoding='utf-8') as log:
+    with open(discovery_log_path(language), 'a', encoding='utf-8') as log:
         log.write(f"## Query: {query}\n")
         log.write(f"- **Status:** {status}\n")
         if details:
@@ -73,9 +80,9 @@ def log_query_outcome(query: str, status: str, details: str = "", results: list[
         log.write("\n")
 
 
-def finalize_log(summary: dict):
+def finalize_log(summary: dict, language: str = 'en'):
     """Write final summary stats to the log."""
-    with open(DISCOVERY_LOG, 'a', encoding='utf-8') as log:
+    with open(discovery_log_path(language), 'a', encoding='utf-8') as log:
         log.write("---\n\n")
         log.write("## Run Summary\n")
         for label, value in summary.items():
@@ -244,7 +251,6 @@ def discover_themes(language: str = 'en'):
     csv_file = os.path.join(output_dir, f"discovery_data-{language}.csv")
 
     # Load existing URLs
-    global existing_urls
     existing_urls = load_existing_urls(csv_file)
 
     queries = get_discovery_queries(language)
@@ -266,9 +272,9 @@ def discover_themes(language: str = 'en'):
         results = search_for_themes(query, language)
 
         if not results:
-            log_query_outcome(query, status="error", details="No results returned (see console for errors)")
+            log_query_outcome(query, status="error", details="No results returned (see console for errors)", language=language)
         else:
-            log_query_outcome(query, status="success", details="Results captured", results=results)
+            log_query_outcome(query, status="success", details="Results captured", results=results, language=language)
 
         # Save each result
         for result in results:
@@ -313,7 +319,7 @@ def discover_themes(language: str = 'en'):
     print(f"   • Queries processed: {len(queries)}")
     print(f"   • Themes captured: {total_themes}")
     print(f"   • Output file: {os.path.abspath(csv_file)}")
-    print(f"   • Narrative log: {os.path.abspath(DISCOVERY_LOG)}")
+    print(f"   • Narrative log: {os.path.abspath(discovery_log_path(language))}")
 
     # Analyze discovered themes
     analyze_themes(csv_file, language)
@@ -322,7 +328,7 @@ def discover_themes(language: str = 'en'):
         "Queries processed": len(queries),
         "Themes captured": total_themes,
         "Output file": os.path.abspath(csv_file),
-    })
+    }, language)
 
 def analyze_themes(csv_file: str, language: str = 'en'):
     """Analyze discovered themes and suggest research topics"""
@@ -334,43 +340,25 @@ def analyze_themes(csv_file: str, language: str = 'en'):
         return
 
     # Read discovery data
-    themes_data = []
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            themes_data = list(reader)
+        themes_data = pd.read_csv(csv_file, dtype=str, keep_default_na=False)
     except Exception as e:
         print(f"❌ Error reading themes: {e}")
         return
 
-    if not themes_data:
+    if themes_data.empty:
         print("❌ No themes to analyze")
         return
 
     print(f"📊 Analyzing {len(themes_data)} discovered themes...")
 
-    # Count theme frequency
-    theme_counts = {}
-    for row in themes_data:
-        theme = row.get('theme', 'Unknown')
-        theme_counts[theme] = theme_counts.get(theme, 0) + 1
-
-    # Show top themes
-    print("\n📈 Top Discovered Themes:")
-    sorted_themes = sorted(theme_counts.items(), key=lambda x: x[1], reverse=True)
-    for theme, count in sorted_themes[:10]:
-        print(f"   • {theme}: {count} occurrences")
-
-    # Count perspectives
-    perspective_counts = {}
-    for row in themes_data:
-        perspective = row.get('perspective', 'Unknown')
-        perspective_counts[perspective] = perspective_counts.get(perspective, 0) + 1
-
-    print("\n👥 Key Perspectives Found:")
-    sorted_perspectives = sorted(perspective_counts.items(), key=lambda x: x[1], reverse=True)
-    for perspective, count in sorted_perspectives[:10]:
-        print(f"   • {perspective}: {count} occurrences")
+    # Theme and perspective frequencies in one vectorized pass each
+    for column, heading in (('theme', "📈 Top Discovered Themes"), ('perspective', "👥 Key Perspectives Found")):
+        values = themes_data[column] if column in themes_data else pd.Series(['Unknown'] * len(themes_data))
+        counts = values.replace('', 'Unknown').value_counts()
+        print(f"\n{heading}:")
+        for value, count in counts.head(10).items():
+            print(f"   • {value}: {count} occurrences")
 
     print(f"\n💡 Next step: Run 2_coding.py --language {language} to transform discovery data into coded themes")
 
@@ -380,12 +368,14 @@ def main():
     add_language_args(parser)
     args = parser.parse_args()
 
-    language_config = get_language_config(args.language)
+    languages = resolve_languages(args.language)
 
     print(f"🤖 Using model: {MODEL_NAME}")
-    print(f"🌐 Language: {language_config['name']} ({args.language})")
+    for language in languages:
+        print(f"🌐 Language: {get_language_config(language)['name']} ({language})")
 
-    discover_themes(args.language)
+    # Languages run side by side, sharing one rate limiter
+    run_languages(languages, discover_themes)
 
 if __name__ == "__main__":
     main()
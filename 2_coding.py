@@ -11,7 +11,11 @@ import pandas as pd
 import argparse
 from google import genai
 from google.genai import types
-from language_config import add_language_args, get_language_config, ensure_folder_exists
+from language_config import add_language_args, get_language_config, ensure_folder_exists, resolve_languages
+from streaming import stream_generate, discard_partial
+from worker_pool import rate_limited, run_languages
+from context_cache import ContextCacheManager, client_http_options
+from model_routing import model_for, run_cascade, routing_stats
 
 # Load environment variables
 try:
@@ -23,12 +27,13 @@ except ImportError:
 # --- Configuration ---
 try:
     api_key = os.environ["GOOGLE_API_KEY"]
-    client = genai.Client(api_key=api_key)
+    client = rate_limited(genai.Client(api_key=api_key, http_options=client_http_options()))
 except KeyError:
     print("Error: GOOGLE_API_KEY environment variable not set.")
     exit()
 
-MODEL_NAME = os.environ.get("GEMINI_MODEL", "gemini-2.5-pro")
+MODEL_NAME = model_for("coding")
+cache_manager = ContextCacheManager(client)
 
 
 class ThematicAnalyzer:
@@ -88,8 +93,9 @@ Key Insight: {row.get('key_insight', '')}
         # Prepare data
         formatted_data = self.prepare_data_for_analysis()
 
-        # Create comprehensive analysis prompt following thematic analysis best practices
-        prompt = f"""
+        # Create comprehensive analysis prompt following thematic analysis best practices.
+        # Method + dataset form a cacheable prefix, so a resumed or repeated run doesn't resend the data
+        prompt_prefix = f"""
         You are conducting a rigorous qualitative thematic analysis following established research methodology. Your goal is to identify and interpret patterns of meaning across this fertility journey dataset.
 
         METHODOLOGICAL APPROACH:
@@ -118,7 +124,9 @@ Key Insight: {row.get('key_insight', '')}
 
         DISCOVERY DATA:
         {formatted_data}
+        """
 
+        output_format = """
         Please provide your analysis in this format:
 
         # Thematic Analysis: Fertility Journey Experiences
@@ -151,13 +159,19 @@ Key Insight: {row.get('key_insight', '')}
         print("🤖 Calling Gemini for comprehensive analysis...")
 
         try:
-            response = client.models.generate_content(
-                model=MODEL_NAME,
-                contents=prompt
+            # Stream into thematic_analysis.md.partial so a dropped connection can resume
+            analysis_text = cache_manager.run(
+                MODEL_NAME, prompt_prefix, output_format, "discovery dataset",
+                lambda contents, config: stream_generate(
+                    client, MODEL_NAME, contents, self.markdown_path(), "thematic analysis",
+                    config=config, on_usage=cache_manager.record, full_prompt=prompt_prefix + output_format
+                )
             )
+            # The dataset prefix is only needed again if this call is retried
+            cache_manager.release(MODEL_NAME, prompt_prefix)
 
             print("✅ Analysis complete!")
-            return response.text, self.extract_themes_for_json(response.text)
+            return analysis_text, self.extract_themes_for_json(analysis_text)
 
         except Exception as e:
             print(f"❌ Error during analysis: {e}")
@@ -204,11 +218,23 @@ Key Insight: {row.get('key_insight', '')}
         Return only the JSON array, no other text.
         """
 
+        # Structural conversion: a fast model first, escalating in cascade mode if it yields no themes
+        themes_data, _ = run_cascade(
+            "extract",
+            lambda model: self.extract_with_model(model, extract_prompt),
+            lambda themes: None if themes and all(isinstance(t, dict) and t.get('meta_theme_name') for t in themes)
+            else "no valid themes extracted",
+        )
+        return themes_data
+
+    def extract_with_model(self, model, extract_prompt):
+        """One JSON extraction call; returns the parsed theme list or []"""
         try:
             response = client.models.generate_content(
-                model=MODEL_NAME,
+                model=model,
                 contents=extract_prompt
             )
+            cache_manager.record(response.usage_metadata)
 
             # Extract JSON from response
             response_text = response.text.strip()
@@ -228,6 +254,10 @@ Key Insight: {row.get('key_insight', '')}
             print(f"⚠️ Error extracting JSON structure: {e}")
             return []
 
+    def markdown_path(self):
+        """Path of the markdown thematic analysis output"""
+        return f"{self.output_dir}/thematic_analysis.md"
+
     def save_results(self, markdown_analysis, json_themes):
         """Save both markdown and JSON outputs"""
         if not markdown_analysis:
@@ -235,9 +265,10 @@ Key Insight: {row.get('key_insight', '')}
             return
 
         # Save markdown analysis
-        md_path = f"{self.output_dir}/thematic_analysis.md"
+        md_path = self.markdown_path()
         with open(md_path, 'w', encoding='utf-8') as f:
             f.write(markdown_analysis)
+        discard_partial(md_path)
         print(f"📄 Saved markdown analysis: {md_path}")
 
         # Save JSON themes
@@ -255,29 +286,23 @@ Key Insight: {row.get('key_insight', '')}
 
 
 
-def main():
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description="Qualitative coding of fertility data")
-    add_language_args(parser)
-    args = parser.parse_args()
-
-    language_config = get_language_config(args.language)
-
-    print(f"🤖 Using model: {MODEL_NAME}")
-    print(f"🌐 Language: {language_config['name']} ({args.language})")
+def code_language(language: str):
+    """Run thematic coding on one language's discovery data"""
+    language_config = get_language_config(language)
+    print(f"🌐 Language: {language_config['name']} ({language})")
 
     # Use discovery data with new folder structure
-    discovery_file = f"findings/1_discovery-{args.language}/discovery_data-{args.language}.csv"
+    discovery_file = f"findings/1_discovery-{language}/discovery_data-{language}.csv"
 
     if not os.path.exists(discovery_file):
         print(f"❌ Discovery file not found: {discovery_file}")
-        print(f"💡 Run 1_discover.py --language {args.language} first to generate discovery data")
+        print(f"💡 Run 1_discover.py --language {language} first to generate discovery data")
         return
 
     print(f"📊 Using discovery data: {discovery_file}")
 
     # Initialize analyzer
-    analyzer = ThematicAnalyzer(discovery_file, args.language)
+    analyzer = ThematicAnalyzer(discovery_file, language)
 
     # Perform analysis
     markdown_analysis, json_themes = analyzer.analyze_themes()
@@ -285,7 +310,7 @@ def main():
     # Save results
     analyzer.save_results(markdown_analysis, json_themes)
 
-    print("\n✅ Thematic Analysis Complete!")
+    print(f"\n✅ Thematic Analysis Complete ({language})!")
     print(f"📁 Results saved in: {analyzer.output_dir}/")
     print("📄 Summary:")
     print(f"   • Source file: {os.path.abspath(discovery_file)}")
@@ -293,8 +318,22 @@ def main():
     if json_themes:
         print(f"   • Themes identified: {len(json_themes)}")
     print(f"   • Output directory: {os.path.abspath(analyzer.output_dir)}")
-    print(f"💡 Next step: Run 3_gather.py --language {args.language} for deep research on identified themes")
+    print(f"💡 Next step: Run 3_gather.py --language {language} for deep research on identified themes")
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Qualitative coding of fertility data")
+    add_language_args(parser)
+    args = parser.parse_args()
+
+    print(f"🤖 Using model: {MODEL_NAME}")
+
+    # Languages run side by side, sharing one rate limiter
+    run_languages(resolve_languages(args.language), code_language)
+    cache_manager.print_summary()
+    routing_stats.print_summary()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
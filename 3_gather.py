@@ -6,15 +6,30 @@ Comprehensive research on topics identified during discovery phase
 import json
 import os
 import time
+import datetime
 import csv
 import re
 import sys
 import argparse
 import concurrent.futures
 import threading
+import queue
+import socket
+import uuid
+from pathlib import Path
 from google import genai
 from google.genai import types
-from language_config import add_language_args, get_language_config, ensure_folder_exists
+from language_config import add_language_args, get_language_config, ensure_folder_exists, get_folder_name, resolve_languages
+from json_stream import IncrementalJSONArrayParser
+from audit_log import AuditLog, locked
+from work_queue import WorkQueue, DEFAULT_LEASE_SECONDS
+from bm25_index import append_document
+from model_routing import model_for, routing_policy, run_cascade, routing_stats, FAST_MODEL, LARGE_MODEL
+from prescore import prescore, PrefilterStats, row_score_status, STATUS_MODEL, STATUS_PROVISIONAL
+from worker_pool import rate_limited
+from hedging import Hedger, DEFAULT_PERCENTILE as DEFAULT_HEDGE_PERCENTILE, DEFAULT_MAX_HEDGE_RATE
+from context_cache import client_http_options
+from near_duplicates import NearDuplicateIndex, DEFAULT_THRESHOLD as DEFAULT_DUPLICATE_THRESHOLD
 
 # Load environment variables from .env file
 try:
@@ -26,14 +41,14 @@ except ImportError:
 # --- Configuration ---
 try:
     api_key = os.environ["GOOGLE_API_KEY"]
-    client = genai.Client(api_key=api_key)
+    client = rate_limited(genai.Client(api_key=api_key, http_options=client_http_options()))
 except KeyError:
     print("Error: GOOGLE_API_KEY environment variable not set.")
     exit()
 
 # Model configuration
-MODEL_NAME = os.environ.get("GEMINI_MODEL", "gemini-2.5-pro")
-print(f"🤖 Using model: {MODEL_NAME}")
+MODEL_NAME = model_for("search")
+print(f"🤖 Using model: {MODEL_NAME} (search), {model_for('score')} (scoring, {routing_policy()} routing)")
 
 # Thread-safe file writing
 file_lock = threading.Lock()
@@ -46,22 +61,64 @@ AUDIT_LOG_FILE = os.path.join(AUDIT_LOG_DIR, "gather_gemini_responses.jsonl")
 RUN_TIMESTAMP = time.strftime('%Y%m%d_%H%M%S')
 GATHER_LOG_FILE = os.path.join(AUDIT_LOG_DIR, f"gather_run_{RUN_TIMESTAMP}.md")
 
+# Query planning for coded themes
+MAX_QUERIES_PER_THEME = 15
+QUERY_SIMILARITY_THRESHOLD = 0.8  # token-set overlap at which two queries count as the same search
+QUERY_STOPWORDS = {'a', 'an', 'the', 'of', 'and', 'or', 'to', 'in', 'on', 'for', 'with', 'about'}
+
+
+class UsageTracker:
+    """Thread-safe tally of API calls, tokens and latency per call type."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def record(self, call_type: str, usage_metadata=None, seconds: float = 0.0):
+        tokens = getattr(usage_metadata, 'total_token_count', None) or 0
+        with self.lock:
+            stats = self.stats.setdefault(call_type, {'calls': 0, 'tokens': 0, 'metered_calls': 0, 'seconds': 0.0})
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            if tokens:
+                stats['tokens'] += tokens
+                stats['metered_calls'] += 1
+
+    def calls(self, call_type: str | None = None) -> int:
+        with self.lock:
+            if call_type:
+                return self.stats.get(call_type, {}).get('calls', 0)
+            return sum(stats['calls'] for stats in self.stats.values())
+
+    def tokens(self, call_type: str | None = None) -> int:
+        with self.lock:
+            if call_type:
+                return self.stats.get(call_type, {}).get('tokens', 0)
+            return sum(stats['tokens'] for stats in self.stats.values())
+
+    def average_tokens(self, call_type: str, default: float) -> float:
+        with self.lock:
+            stats = self.stats.get(call_type)
+            if not stats or not stats['metered_calls']:
+                return default
+            return stats['tokens'] / stats['metered_calls']
+
+    def average_seconds(self, call_type: str, default: float) -> float:
+        with self.lock:
+            stats = self.stats.get(call_type)
+            if not stats or not stats['calls']:
+                return default
+            return stats['seconds'] / stats['calls']
+
+
+usage_tracker = UsageTracker()
+audit_log = AuditLog(AUDIT_LOG_DIR)
+hedger = Hedger()  # enabled by --hedge
 
-def log_raw_response(call_type: str, metadata: dict, response_text: str):
-    """Persist raw Gemini responses for auditing/debugging."""
-    os.makedirs(AUDIT_LOG_DIR, exist_ok=True)
-    payload = {
-        "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
-        "call_type": call_type,
-        "metadata": metadata,
-        "response_text": response_text,
-    }
-
-    serialized = json.dumps(payload, ensure_ascii=False)
 
-    with log_lock:
-        with open(AUDIT_LOG_FILE, 'a', encoding='utf-8') as handle:
-            handle.write(serialized + "\n")
+def log_raw_response(call_type: str, metadata: dict, response_text: str):
+    """Persist raw Gemini responses for auditing/debugging (written in the background)."""
+    audit_log.append(call_type, metadata, response_text)
 
 
 def init_gather_log(topics: list[dict]):
@@ -188,9 +245,10 @@ def _parse_topics_from_coded_themes(language: str = 'en') -> list:
             # All queries for this meta-theme (includes child themes)
             topics.append({
                 "name": meta_theme_name,
-                "queries": queries[:15],  # Reasonable limit per theme
+                "queries": queries,
                 "child_themes": len(child_themes),
-                "metrics": metrics
+                "metrics": metrics,
+                "query_limit": MAX_QUERIES_PER_THEME,  # applied by plan_topic_queries after dedupe
             })
 
         return topics
@@ -199,6 +257,81 @@ def _parse_topics_from_coded_themes(language: str = 'en') -> list:
         print(f"⚠️ Error parsing coded themes: {e}")
         return []
 
+def query_tokens(query: str) -> frozenset:
+    """Normalized word set of a query, ignoring case, punctuation and stopwords."""
+    return frozenset(word for word in re.findall(r'[a-z0-9]+', query.lower()) if word not in QUERY_STOPWORDS)
+
+
+def query_similarity(a: frozenset, b: frozenset) -> float:
+    """Token-set (Jaccard) similarity between two queries."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def plan_queries(topics: list, threshold: float = QUERY_SIMILARITY_THRESHOLD) -> list:
+    """Remove exact and near-duplicate queries within and across topics, in place.
+
+    Topics are processed in order and the first occurrence of a query wins, so
+    a later topic never re-runs a search an earlier one already covers.
+    Returns the pruned queries with the query that made each redundant.
+    """
+    kept = []  # (tokens, query, topic name)
+    pruned = []
+    for topic in topics:
+        planned = []
+        for query in topic["queries"]:
+            tokens = query_tokens(query)
+            match = next((k for k in kept if k[0] == tokens or query_similarity(k[0], tokens) >= threshold), None)
+            if match:
+                pruned.append({
+                    "topic": topic["name"],
+                    "query": query,
+                    "duplicate_of": match[1],
+                    "duplicate_topic": match[2],
+                    "kind": "exact" if match[0] == tokens else "near",
+                })
+                continue
+            kept.append((tokens, query, topic["name"]))
+            planned.append(query)
+        topic["queries"] = planned
+    return pruned
+
+
+def plan_topic_queries(topics: list, language: str = 'en') -> list:
+    """Dedupe queries across the topics in this run, then cut each to its query limit.
+
+    Runs after --themes selection, so a selected theme only loses queries that
+    another selected theme will actually search. Repeats are dropped before the
+    cut so they don't use up a theme's slots.
+    """
+    pruned = plan_queries(topics)
+    log_pruned_queries(pruned, language)
+    for topic in topics:
+        if topic.get("query_limit"):
+            topic["queries"] = topic["queries"][:topic["query_limit"]]
+    return topics
+
+
+def query_plan_log_path(language: str) -> str:
+    """Pruned-query log for this run's topics in one language."""
+    return os.path.join(AUDIT_LOG_DIR, f"gather_query_plan_{RUN_TIMESTAMP}-{language}.json")
+
+
+def log_pruned_queries(pruned: list, language: str = 'en'):
+    """Print a summary of pruned queries and save the full list to the logs folder."""
+    if not pruned:
+        return
+    exact = sum(1 for p in pruned if p["kind"] == "exact")
+    cross = sum(1 for p in pruned if p["topic"] != p["duplicate_topic"])
+    print(f"🧹 Pruned {len(pruned)} duplicate queries ({exact} exact, {len(pruned) - exact} near; {cross} across themes)")
+    os.makedirs(AUDIT_LOG_DIR, exist_ok=True)
+    log_path = query_plan_log_path(language)
+    with open(log_path, 'w', encoding='utf-8') as f:
+        json.dump({"run_timestamp": RUN_TIMESTAMP, "language": language, "pruned": pruned}, f, indent=2, ensure_ascii=False)
+    print(f"   📝 Pruned queries logged to {log_path}")
+
+
 def _extract_search_terms_from_theme(theme_name: str, description: str) -> list:
     """Extract targeted search queries from theme content."""
     queries = []
@@ -300,15 +433,19 @@ def load_existing_urls(csv_file: str) -> set:
             print(f"   ⚠️ Could not load existing URLs: {e}")
     return urls
 
-def search_web_simple(query: str, topic: str) -> list:
-    """Use Google Search to find content"""
-    import datetime
-    start_time = datetime.datetime.now()
-    print(f"   📡 [{start_time.strftime('%H:%M:%S')}] Searching: '{query[:50]}...'")
+def csv_has_url(csv_file: str, url: str) -> bool:
+    """True if a theme CSV already has a row for url (read fresh, for cross-process checks)"""
+    if not os.path.exists(csv_file):
+        return False
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        return any(row.get('url') == url for row in csv.DictReader(f))
+
+SEARCH_TIMEOUT_SECONDS = 60
 
-    search_tool = types.Tool(google_search=types.GoogleSearch())
 
-    search_prompt = f"""
+def build_search_prompt(query: str, topic: str) -> str:
+    """Prompt asking Gemini Search for personal-experience results as a JSON list"""
+    return f"""
     Search for personal experiences about: "{query}"
 
     Find authentic stories from forums, Reddit, or blogs about {topic}.
@@ -329,85 +466,210 @@ def search_web_simple(query: str, topic: str) -> list:
     ]
     """
 
+
+def parse_search_response(response_text: str, query: str) -> list:
+    """Parse a complete search response (fallback when nothing was streamed)"""
+    import datetime
     try:
-        print(f"   🚀 [{datetime.datetime.now().strftime('%H:%M:%S')}] Calling Gemini Search API...")
+        # Look for JSON array pattern
+        start = response_text.find('[')
+        end = response_text.rfind(']') + 1
+        if start >= 0 and end > start:
+            json_str = response_text[start:end]
+            results = json.loads(json_str)
+            print(f"   🔍 [{datetime.datetime.now().strftime('%H:%M:%S')}] JSON array parsed successfully")
+        else:
+            print(f"   ⚠️ [{datetime.datetime.now().strftime('%H:%M:%S')}] No JSON array found, trying direct parse")
+            results = json.loads(response_text)
+    except json.JSONDecodeError as je:
+        print(f"   ❌ [{datetime.datetime.now().strftime('%H:%M:%S')}] JSON parse error: {str(je)[:100]}")
+        print(f"   📋 Response sample: {response_text[:300]}...")
+        # If no valid JSON, create mock results from search
+        results = [{
+            "url": "https://example.com",
+            "title": "Search result for: " + query[:50],
+            "content": "Content found via Google Search",
+            "comments_summary": "No comments available",
+            "source": "search",
+            "relevance": 0.7
+        }]
+    return results
+
+
+def parse_logged_search(response_text: str, query: str) -> list:
+    """Results of a complete logged search response, parsed as a live stream would be"""
+    results = IncrementalJSONArrayParser().feed(response_text)
+    return results or parse_search_response(response_text, query)
+
+
+def search_web_stream(query: str, topic: str):
+    """Stream a Google Search call, yielding each result as soon as it is complete
+
+    A reader thread drains the response stream into a queue, so generation of
+    later results keeps going while the caller dedupes and scores earlier ones.
+    With hedging on, a call with no first chunk by the observed p90/p95 gets a
+    duplicate request; results come only from whichever streams first.
+    """
+    import datetime
+    start_time = datetime.datetime.now()
+    print(f"   📡 [{start_time.strftime('%H:%M:%S')}] Searching: '{query[:50]}...'")
 
-        # Use timeout wrapper to prevent hanging
-        def make_search_call():
-            return client.models.generate_content(
+    search_tool = types.Tool(google_search=types.GoogleSearch())
+    search_prompt = build_search_prompt(query, topic)
+    results_queue = queue.Queue()
+    done = object()
+    call_start = time.perf_counter()
+    # attempt 0 is the original request, 1 the hedge; the first to stream a chunk wins
+    race = {'attempts': 1, 'failed': 0, 'winner': None, 'first_chunk': {}}
+    race_lock = threading.Lock()
+
+    def claim(attempt: int) -> bool:
+        """Record an attempt's first chunk; True if it is the winning stream"""
+        with race_lock:
+            first_chunk = race['first_chunk'].setdefault(attempt, time.perf_counter() - call_start)
+            if race['winner'] is None:
+                race['winner'] = attempt
+                if race['attempts'] > 1:
+                    hedger.record_outcome("search", hedge_won=attempt == 1)
+            winner = race['winner']
+            winner_first_chunk = race['first_chunk'][winner]
+        if attempt == 0:
+            # Only original requests feed the percentile, so hedging doesn't skew its own threshold
+            hedger.record_latency("search", first_chunk)
+            if winner == 1:
+                hedger.record_saving("search", first_chunk - winner_first_chunk)
+        return winner == attempt
+
+    def read_stream(attempt: int):
+        parser = IncrementalJSONArrayParser()
+        pieces = []
+        usage = None
+        won = report = False
+        stream_start = time.perf_counter()
+        try:
+            stream = client.models.generate_content_stream(
                 model=MODEL_NAME,
                 contents=search_prompt,
                 config=types.GenerateContentConfig(
                     tools=[search_tool]
                 )
-        )
+            )
+            for chunk in stream:
+                usage = chunk.usage_metadata or usage
+                if not won:
+                    won = claim(attempt)
+                    if not won:
+                        return  # the other request is already streaming
+                    if attempt == 1:
+                        print(f"   ⚡ [{datetime.datetime.now().strftime('%H:%M:%S')}] Hedged search answered first: '{query[:40]}...'")
+                text = chunk.text or ""
+                pieces.append(text)
+                for result in parser.feed(text):
+                    results_queue.put(result)
+            if won or claim(attempt):
+                won = True
+                results_queue.put((done, "".join(pieces), None))
+        except Exception as e:
+            with race_lock:
+                race['failed'] += 1
+                # A failure before any chunk only ends the call once no other request is left
+                report = won or (race['winner'] is None and race['failed'] == race['attempts'])
+            if report:
+                results_queue.put((done, "".join(pieces), e))
+        finally:
+            if won or report:
+                usage_tracker.record("search", usage, time.perf_counter() - stream_start)
+            else:
+                # The losing side of a hedge race is billed but says nothing about a search's cost or latency
+                usage_tracker.record("search_abandoned", usage, time.perf_counter() - stream_start)
+                hedger.record_abandoned("search")
+
+    print(f"   🚀 [{datetime.datetime.now().strftime('%H:%M:%S')}] Calling Gemini Search API (streaming)...")
+    threading.Thread(target=read_stream, args=(0,), daemon=True).start()
+
+    deadline = time.monotonic() + SEARCH_TIMEOUT_SECONDS
+    hedge_delay = hedger.start_call("search")
+    hedge_at = time.monotonic() + hedge_delay if hedge_delay is not None else None
+    yielded = 0
+    streamed = []
+    first_result_time = None
+
+    def log_streamed(reason: str):
+        """Log the results already handed out by an incomplete search, so a replay sees them too"""
+        if streamed:
+            log_raw_response(
+                call_type="search",
+                metadata={"query": query, "topic": topic, "incomplete": reason},
+                response_text=json.dumps(streamed, ensure_ascii=False),
+            )
 
-        # Execute with 60-second timeout
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(make_search_call)
-            try:
-                response = future.result(timeout=60)  # 60 second timeout
-                api_time = datetime.datetime.now()
-                print(f"   📥 [{api_time.strftime('%H:%M:%S')}] Search API response received")
-            except concurrent.futures.TimeoutError:
-                print(f"   ⚠️  [{datetime.datetime.now().strftime('%H:%M:%S')}] Search API timeout after 60 seconds")
-                return []
+    while True:
+        now = time.monotonic()
+        if hedge_at is not None and now >= hedge_at:
+            hedge_at = None
+            with race_lock:
+                launch = race['winner'] is None and race['failed'] == 0 and hedger.allow_hedge("search")
+                if launch:
+                    race['attempts'] = 2
+            if launch:
+                print(f"   ⚡ [{datetime.datetime.now().strftime('%H:%M:%S')}] No response after {hedge_delay:.1f}s "
+                      f"(p{hedger.percentile:g}) - hedging '{query[:40]}...'")
+                threading.Thread(target=read_stream, args=(1,), daemon=True).start()
+
+        wait = deadline - now
+        if hedge_at is not None:
+            wait = min(wait, hedge_at - now)
+        try:
+            item = results_queue.get(timeout=max(wait, 0.01))
+        except queue.Empty:
+            if time.monotonic() < deadline:
+                continue
+            print(f"   ⚠️  [{datetime.datetime.now().strftime('%H:%M:%S')}] Search API timeout after {SEARCH_TIMEOUT_SECONDS} seconds ({yielded} results streamed)")
+            log_streamed("timeout")
+            return
 
-        # Extract JSON from response text
-        response_text = response.text.strip()
-        print(f"   📝 [{datetime.datetime.now().strftime('%H:%M:%S')}] Raw response: {response_text[:100]}...")
-        log_raw_response(
-            call_type="search",
-            metadata={"query": query, "topic": topic},
-            response_text=response_text,
-        )
+        if isinstance(item, tuple) and item and item[0] is done:
+            _, response_text, error = item
+            break
 
-        # Try to find JSON in the response
-        try:
-            # Look for JSON array pattern
-            start = response_text.find('[')
-            end = response_text.rfind(']') + 1
-            if start >= 0 and end > start:
-                json_str = response_text[start:end]
-                results = json.loads(json_str)
-                print(f"   🔍 [{datetime.datetime.now().strftime('%H:%M:%S')}] JSON array parsed successfully")
-            else:
-                print(f"   ⚠️ [{datetime.datetime.now().strftime('%H:%M:%S')}] No JSON array found, trying direct parse")
-                results = json.loads(response_text)
-        except json.JSONDecodeError as je:
-            print(f"   ❌ [{datetime.datetime.now().strftime('%H:%M:%S')}] JSON parse error: {str(je)[:100]}")
-            print(f"   📋 Response sample: {response_text[:300]}...")
-            # If no valid JSON, create mock results from search
-            results = [{
-                "url": "https://example.com",
-                "title": "Search result for: " + query[:50],
-                "content": "Content found via Google Search",
-                "comments_summary": "No comments available",
-                "source": "search",
-                "relevance": 0.7
-            }]
+        if first_result_time is None:
+            first_result_time = datetime.datetime.now()
+            print(f"   📥 [{first_result_time.strftime('%H:%M:%S')}] First result after {(first_result_time - start_time).total_seconds():.1f}s")
+        yielded += 1
+        streamed.append(item)
+        yield item
 
-        end_time = datetime.datetime.now()
-        duration = (end_time - start_time).total_seconds()
-        print(f"   ✅ [{end_time.strftime('%H:%M:%S')}] Found {len(results)} results in {duration:.1f}s")
-        return results
+    end_time = datetime.datetime.now()
+    duration = (end_time - start_time).total_seconds()
 
-    except Exception as e:
-        end_time = datetime.datetime.now()
-        duration = (end_time - start_time).total_seconds()
-        print(f"   ❌ [{end_time.strftime('%H:%M:%S')}] Search error after {duration:.1f}s: {str(e)[:150]}")
-        return []
+    if error is not None:
+        print(f"   ❌ [{end_time.strftime('%H:%M:%S')}] Search error after {duration:.1f}s: {str(error)[:150]}")
+        log_streamed("error")
+        return
 
-def score_content_simple(content: str, title: str, metadata: dict | None = None) -> dict:
-    """Score content for research value and emotional tone"""
-    import datetime
-    start_time = datetime.datetime.now()
-    print(f"      📊 [{start_time.strftime('%H:%M:%S')}] Scoring: '{title[:30]}...'")
+    response_text = response_text.strip()
+    print(f"   📝 [{end_time.strftime('%H:%M:%S')}] Raw response: {response_text[:100]}...")
+    log_raw_response(
+        call_type="search",
+        metadata={"query": query, "topic": topic},
+        response_text=response_text,
+    )
 
-    scoring_prompt = f"""
-    Analyze this fertility-related content for research value:
-    Title: {title}
-    Content: {content}
+    # Nothing streamed as an array item - fall back to parsing the whole response
+    if not yielded:
+        for result in parse_search_response(response_text, query):
+            yielded += 1
+            yield result
+
+    print(f"   ✅ [{end_time.strftime('%H:%M:%S')}] Found {yielded} results in {duration:.1f}s")
+
+
+def search_web_simple(query: str, topic: str) -> list:
+    """Use Google Search to find content"""
+    return list(search_web_stream(query, topic))
+
+SCORING_RUBRIC = """
+    Analyze the fertility-related content at the end of this prompt for research value.
 
     Rate on these scales and return JSON:
 
@@ -423,16 +685,90 @@ def score_content_simple(content: str, title: str, metadata: dict | None = None)
     personal_story (true/false): Is this a first-person personal experience?
 
     Return ONLY a JSON object with these exact fields - analyze the content carefully and provide genuine scores:
-    {{
+    {
       "research_value": [analyze and score 1-5],
       "emotional_tone": [analyze and score -2 to +2],
       "detail_level": [analyze and score 1-5],
       "personal_story": [true if first-person experience, false otherwise],
-      "key_insights": "[what specific insights make this valuable or not]"
-    }}
+      "key_insights": "[what specific insights make this valuable or not]",
+      "confidence": [0.0-1.0 - how sure you are of these scores given the content]
+    }
 
     CRITICAL: Do not use template values - actually analyze the content and provide accurate scores.
+
+    CONTENT TO SCORE:
+"""
+
+def parse_score_response(response_text: str) -> dict:
+    """Parse the JSON scores from a scoring response, with defaults if it is malformed"""
+    import datetime
+    try:
+        # Look for JSON object pattern
+        start = response_text.find('{')
+        end = response_text.rfind('}') + 1
+        if start >= 0 and end > start:
+            json_str = response_text[start:end]
+            scores = json.loads(json_str)
+            print(f"      🔍 [{datetime.datetime.now().strftime('%H:%M:%S')}] JSON parsed successfully")
+        else:
+            print(f"      ⚠️ [{datetime.datetime.now().strftime('%H:%M:%S')}] No JSON braces found, trying direct parse")
+            scores = json.loads(response_text)
+    except json.JSONDecodeError as je:
+        # Default scores if parsing fails
+        print(f"      ❌ [{datetime.datetime.now().strftime('%H:%M:%S')}] JSON parse error: {str(je)[:100]}")
+        print(f"      📋 Response sample: {response_text[:200]}...")
+        scores = provisional_scores("Parse error")
+    return scores
+
+
+def provisional_scores(marker: str) -> dict:
+    """Neutral placeholder scores for a failed scoring call, flagged for the re-score backlog"""
+    return {"research_value": 3, "emotional_tone": 0, "detail_level": 3, "personal_story": False,
+            "key_insights": marker, "score_status": STATUS_PROVISIONAL}
+
+
+MIN_SCORE_CONFIDENCE = 0.6  # cascade routing escalates less confident fast-model scores
+
+
+def validate_scores(scores: dict) -> str | None:
+    """Reason to re-score on a larger model, or None if the scores are usable"""
+    if scores.get('key_insights') == 'Parse error':
+        return "parse error"
+    if scores.get('key_insights') in ('Timeout', 'Error'):
+        return None  # timeouts and API errors would fail the same way on a bigger model
+    try:
+        if not 1 <= float(scores.get('research_value')) <= 5 or not -2 <= float(scores.get('emotional_tone')) <= 2:
+            return "scores out of range"
+    except (TypeError, ValueError):
+        return "invalid scores"
+    try:
+        if float(scores.get('confidence', 1.0)) < MIN_SCORE_CONFIDENCE:
+            return "low confidence"
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def score_content_simple(content: str, title: str, metadata: dict | None = None) -> dict:
+    """Score content for research value and emotional tone
+
+    The model comes from the routing policy; in cascade mode a fast-model
+    score that fails validate_scores is redone on the large model.
+    """
+    # Fixed rubric first and the item last, so every scoring prompt shares one prefix
+    item_prompt = f"""
+    Title: {title}
+    Content: {content}
     """
+    scores, _ = run_cascade("score", lambda model: score_with_model(model, item_prompt, title, metadata), validate_scores)
+    return scores
+
+
+def score_with_model(model: str, item_prompt: str, title: str, metadata: dict | None = None) -> dict:
+    """One scoring call on a given model"""
+    import datetime
+    start_time = datetime.datetime.now()
+    print(f"      📊 [{start_time.strftime('%H:%M:%S')}] Scoring on {model}: '{title[:30]}...'")
 
     try:
         print(f"      🚀 [{datetime.datetime.now().strftime('%H:%M:%S')}] Calling Gemini API for scoring...")
@@ -440,8 +776,8 @@ def score_content_simple(content: str, title: str, metadata: dict | None = None)
         # Use timeout wrapper to prevent hanging
         def make_scoring_call():
             return client.models.generate_content(
-                model=MODEL_NAME,
-                contents=scoring_prompt
+                model=model,
+                contents=SCORING_RUBRIC + item_prompt
             )
 
         # Execute with 30-second timeout (scoring should be faster than search)
@@ -450,42 +786,24 @@ def score_content_simple(content: str, title: str, metadata: dict | None = None)
             try:
                 response = future.result(timeout=30)  # 30 second timeout
                 api_time = datetime.datetime.now()
+                usage_tracker.record("score", response.usage_metadata, (api_time - start_time).total_seconds())
                 print(f"      📥 [{api_time.strftime('%H:%M:%S')}] API response received, parsing...")
             except concurrent.futures.TimeoutError:
+                usage_tracker.record("score", None, (datetime.datetime.now() - start_time).total_seconds())
                 print(f"      ⚠️  [{datetime.datetime.now().strftime('%H:%M:%S')}] Scoring API timeout after 30 seconds - using default scores")
                 duration = datetime.datetime.now() - start_time
                 print(f"      ⏱️  [{datetime.datetime.now().strftime('%H:%M:%S')}] Scoring timeout completed in {duration.total_seconds():.1f}s")
-                return {
-                    "research_value": 3,  # Default middle score
-                    "emotional_tone": "mixed",  # Default neutral tone
-                    "summary": "Content scoring timed out - manually review if needed",
-                    "reasoning": "API timeout prevented automated scoring"
-                }
+                return provisional_scores("Timeout")
 
         # Parse JSON from response text
         response_text = response.text.strip()
         log_raw_response(
             call_type="score",
-            metadata=metadata or {"title": title},
+            metadata=dict(metadata or {"title": title}, model=model),
             response_text=response_text,
         )
 
-        try:
-            # Look for JSON object pattern
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response_text[start:end]
-                scores = json.loads(json_str)
-                print(f"      🔍 [{datetime.datetime.now().strftime('%H:%M:%S')}] JSON parsed successfully")
-            else:
-                print(f"      ⚠️ [{datetime.datetime.now().strftime('%H:%M:%S')}] No JSON braces found, trying direct parse")
-                scores = json.loads(response_text)
-        except json.JSONDecodeError as je:
-            # Default scores if parsing fails
-            print(f"      ❌ [{datetime.datetime.now().strftime('%H:%M:%S')}] JSON parse error: {str(je)[:100]}")
-            print(f"      📋 Response sample: {response_text[:200]}...")
-            scores = {"research_value": 3, "emotional_tone": 0, "detail_level": 3, "personal_story": False, "key_insights": "Parse error"}
+        scores = parse_score_response(response_text)
 
         end_time = datetime.datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -496,91 +814,1316 @@ def score_content_simple(content: str, title: str, metadata: dict | None = None)
     except Exception as e:
         end_time = datetime.datetime.now()
         duration = (end_time - start_time).total_seconds()
+        usage_tracker.record("score", None, duration)
         print(f"      ❌ [{end_time.strftime('%H:%M:%S')}] Scoring error after {duration:.1f}s: {str(e)[:150]}")
-        return {"research_value": 3, "emotional_tone": 0, "detail_level": 3, "personal_story": False, "key_insights": "Error"}
+        return provisional_scores("Error")
+
+CSV_COLUMNS = ['topic', 'query', 'url', 'title', 'content', 'comments_summary', 'source', 'relevance', 'research_value', 'emotional_tone', 'detail_level', 'personal_story', 'key_insights', 'timestamp', 'score_status']
+SCORE_FIELDS = ['research_value', 'emotional_tone', 'detail_level', 'personal_story', 'key_insights']
+COLUMN_DEFAULTS = {'score_status': row_score_status}  # fill for rows written before a column existed
+
+# Pipeline configuration
+DEFAULT_SEARCH_WORKERS = 2
+DEFAULT_SCORE_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 16
+QUERY_PAUSE_SECONDS = 3
+
+# Scheduler weights for coded-theme metrics (each metric is on a 1-10 scale)
+METRIC_WEIGHTS = {
+    'prevalence': 0.3,
+    'journey_impact': 0.25,
+    'emotional_intensity': 0.2,
+    'universality': 0.15,
+    'systemic_depth': 0.1,
+}
+CHILD_THEME_BONUS = 0.05  # per child theme
+NEUTRAL_METRIC = 5.0
+
+# Budget planning priors, replaced by observed averages as calls complete
+PRIOR_SEARCH_TOKENS = 12000
+PRIOR_SCORE_TOKENS = 1200
+PRIOR_SCORES_PER_SEARCH = 8
+PRIOR_SEARCH_SECONDS = 40
+PRIOR_SCORE_SECONDS = 8
+BUDGET_RECHECK_SECONDS = 2
+
+# Near-duplicate content: reuse the earlier score, drop the row, or score it anyway
+DUPLICATE_POLICIES = ('reuse', 'drop', 'keep')
+DUPLICATE_WAIT_SECONDS = 120
+
+# Saturation: stop a topic once recent searches stop turning up new URLs
+DEFAULT_SATURATION_WINDOW = 3
+DEFAULT_SATURATION_THRESHOLD = 1.0  # mean new URLs per search over the window
+
+
+checked_headers = set()
+
+
+def migrate_csv_header(handle, csv_file: str) -> bool:
+    """Rewrite a CSV created before newer columns existed; the caller holds its lock
+
+    Only appends columns, filling old rows from COLUMN_DEFAULTS. Returns True
+    if the file was rewritten.
+    """
+    with open(csv_file, 'r', newline='', encoding='utf-8') as source:
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if not header or header == CSV_COLUMNS or not set(header) < set(CSV_COLUMNS):
+            return False
+        rows = [dict(zip(header, row)) for row in reader]
+    rewrite_csv(handle, csv_file, rows)
+    return True
+
+
+def rewrite_csv(handle, csv_file: str, rows: list):
+    """Replace a locked CSV's contents with dict rows in CSV_COLUMNS order
+
+    The new contents go to <csv>.rewrite first and are fsynced before the live
+    file is truncated, so a crash mid-rewrite leaves a complete copy to
+    restore from. The live file is rewritten in place (not replaced) because
+    other processes hold their locks on it.
+    """
+    temp_path = f"{csv_file}.rewrite"
+    with open(temp_path, 'w', newline='', encoding='utf-8') as temp:
+        writer = csv.writer(temp)
+        writer.writerow(CSV_COLUMNS)
+        for record in rows:
+            writer.writerow([
+                record[column] if column in record else COLUMN_DEFAULTS[column](record) if column in COLUMN_DEFAULTS else ''
+                for column in CSV_COLUMNS
+            ])
+        temp.flush()
+        os.fsync(temp.fileno())
+
+    with open(temp_path, 'r', newline='', encoding='utf-8') as temp:
+        contents = temp.read()
+    try:
+        handle.seek(0)
+        handle.truncate()
+        handle.write(contents)
+        handle.flush()
+        os.fsync(handle.fileno())
+    except Exception:
+        print(f"   ⚠️ Rewriting {csv_file} failed; the complete new version is kept in {temp_path}")
+        raise
+    os.remove(temp_path)
+
+
+def append_gathered_row(csv_file: str, topic_name: str, query: str, result: dict, scores: dict,
+                        timestamp: str | None = None):
+    """Append one scored search result to a theme CSV.
+
+    The file is also locked across processes, so queue workers can share CSVs.
+    CSVs from before a column was added are migrated on their first append.
+    Each row is added to the folder's BM25 index as it is written.
+    """
+    values = [
+        topic_name,
+        query,
+        result.get('url', ''),
+        result.get('title', ''),
+        result.get('content', ''),
+        result.get('comments_summary', 'No comments captured'),
+        result.get('source', ''),
+        result.get('relevance', 0.5),
+        scores.get('research_value', 3),
+        scores.get('emotional_tone', 0),
+        scores.get('detail_level', 3),
+        scores.get('personal_story', False),
+        scores.get('key_insights', ''),
+        timestamp or time.strftime('%Y-%m-%d %H:%M:%S'),
+        scores.get('score_status', STATUS_MODEL),
+    ]
+    with file_lock:
+        with open(csv_file, 'a', newline='', encoding='utf-8') as f, locked(f):
+            writer = csv.writer(f)
+            if f.tell() == 0:
+                writer.writerow(CSV_COLUMNS)
+            elif csv_file not in checked_headers and migrate_csv_header(f, csv_file):
+                print(f"   🔧 Added {', '.join(COLUMN_DEFAULTS)} column to {os.path.basename(csv_file)}")
+            checked_headers.add(csv_file)
+            writer.writerow(values)
+
+    row = {column: str(value) for column, value in zip(CSV_COLUMNS, values)}
+    try:
+        append_document(csv_file, row)
+    except Exception as e:
+        # The index resyncs from the CSV on next use
+        print(f"   ⚠️ Could not index row for retrieval: {e}")
+
+    if row['score_status'] == STATUS_PROVISIONAL:
+        try:
+            if enqueue_rescore(get_rescore_backlog(), csv_file, row):
+                print(f"      🕓 Provisional score ({row['key_insights']}) queued for re-scoring: {row['url'][:50]}")
+        except Exception as e:
+            # --rescore-backlog also scans the CSVs, so the row is picked up later
+            print(f"   ⚠️ Could not queue provisional row for re-scoring: {e}")
+
+
+# Re-score backlog: rows with placeholder scores, re-scored later in batches
+RESCORE_BACKLOG_DB = os.path.join(AUDIT_LOG_DIR, "rescore_backlog.sqlite")
+DEFAULT_RESCORE_BATCH = 50
+RESCORE_LEASE_SECONDS = 30 * 60  # a crashed re-score run's batch is retried after this
+_rescore_backlog = None
+_rescore_backlog_lock = threading.Lock()
+
+
+def get_rescore_backlog() -> WorkQueue:
+    global _rescore_backlog
+    with _rescore_backlog_lock:
+        if _rescore_backlog is None:
+            _rescore_backlog = WorkQueue(RESCORE_BACKLOG_DB, lease_seconds=RESCORE_LEASE_SECONDS)
+        return _rescore_backlog
+
+
+def enqueue_rescore(backlog: WorkQueue, csv_file: str, row: dict) -> bool:
+    """Queue one provisional row; rows are keyed by CSV, URL and timestamp so requeueing is a no-op"""
+    return backlog.enqueue('rescore', f"rescore|{csv_file}|{row.get('url', '')}|{row.get('timestamp', '')}", {
+        'csv_file': csv_file,
+        'topic': row.get('topic', ''),
+        'query': row.get('query', ''),
+        'url': row.get('url', ''),
+        'timestamp': row.get('timestamp', ''),
+        'title': row.get('title', ''),
+        'content': row.get('content', ''),
+        'reason': row.get('key_insights') or 'Timeout',
+    })
+
+
+def print_backlog_hint():
+    if os.path.exists(RESCORE_BACKLOG_DB):
+        pending = get_rescore_backlog().counts('rescore')['pending']
+        if pending:
+            print(f"🕓 {pending} provisional rows waiting in the re-score backlog (run 3_gather.py --rescore-backlog off-peak)")
+
 
-def gather_for_topic(topic_data: dict, csv_file: str, topic_urls: set) -> tuple:
-    """Gather data for one topic
-    Returns: (findings_count, csv_file_used)
+def enqueue_provisional_rows(backlog: WorkQueue, csv_files: list) -> int:
+    """Queue provisional rows already in the CSVs (including ones written before the backlog existed)"""
+    added = 0
+    for csv_file in csv_files:
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row_score_status(row) == STATUS_PROVISIONAL and enqueue_rescore(backlog, csv_file, row):
+                    added += 1
+    return added
+
+
+def update_rows_in_place(csv_file: str, updates: dict) -> set:
+    """Replace the scores of rows keyed by (url, timestamp); returns the keys that were found
+
+    Rows keep their position and timestamp, so row citations and the BM25
+    index still line up.
+    """
+    with file_lock:
+        with open(csv_file, 'r+', newline='', encoding='utf-8') as f, locked(f):
+            rows = list(csv.DictReader(f))
+            found = set()
+            for row in rows:
+                key = (row.get('url', ''), row.get('timestamp', ''))
+                if key in updates:
+                    scores = updates[key]
+                    for field in SCORE_FIELDS:
+                        row[field] = scores.get(field, row.get(field, ''))
+                    row['score_status'] = scores.get('score_status', STATUS_MODEL)
+                    found.add(key)
+            if found:
+                rewrite_csv(f, csv_file, rows)
+                checked_headers.add(csv_file)
+    return found
+
+
+def seed_duplicate_index(index: NearDuplicateIndex, topic_files: list) -> int:
+    """Index the content and scores of rows already in the topic CSVs."""
+    seeded = 0
+    for data in topic_files:
+        if not os.path.exists(data['csv_file']):
+            continue
+        try:
+            with open(data['csv_file'], 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    status = row_score_status(row)
+                    if status == STATUS_PROVISIONAL:
+                        continue  # placeholder scores must not be reused; the row is re-scored from the backlog
+                    scores = {key: row.get(key, '') for key in SCORE_FIELDS}
+                    scores['score_status'] = status
+                    if index.add(row.get('content', ''), scores, url=row.get('url', ''), csv_file=data['csv_file']):
+                        seeded += 1
+        except Exception as e:
+            print(f"⚠️ Could not index existing content in {data['csv_file']}: {e}")
+    return seeded
+
+
+def theme_priority(topic: dict) -> float:
+    """Value of a topic for scheduling, from its coded-theme metrics and child theme count."""
+    metrics = topic.get("metrics") or {}
+    base = 0.0
+    for name, weight in METRIC_WEIGHTS.items():
+        try:
+            base += weight * float(metrics.get(name, NEUTRAL_METRIC))
+        except (TypeError, ValueError):
+            base += weight * NEUTRAL_METRIC
+    return round(base * (1 + CHILD_THEME_BONUS * topic.get("child_themes", 0)), 2)
+
+
+class QueryScheduler:
+    """Hands out (topic, query) work highest-priority first.
+
+    A topic's priority is its theme value scaled by the share of its query
+    quota still unused, so the most valuable themes are searched first but
+    lose ground as they consume their quota. Ties keep file order.
     """
-    topic_name = topic_data["name"]
-    queries = topic_data["queries"]
-    child_themes = topic_data.get("child_themes", 0)
-    metrics = topic_data.get("metrics", {})
 
-    print(f"\n🔍 Topic: {topic_name}")
-    if child_themes:
-        print(f"   📊 Child themes: {child_themes}")
-    if metrics:
-        print(f"   📈 Prevalence: {metrics.get('prevalence', 'N/A')}/10 | Emotional: {metrics.get('emotional_intensity', 'N/A')}/10")
+    def __init__(self, topic_files: list, queries_per_topic: int | None = None):
+        self.lock = threading.Lock()
+        self.entries = []
+        for order, data in enumerate(topic_files):
+            queries = list(data['topic']['queries'])
+            quota = min(len(queries), queries_per_topic) if queries_per_topic else len(queries)
+            self.entries.append({
+                'data': data,
+                'order': order,
+                'weight': theme_priority(data['topic']),
+                'queries': queries[:quota],
+                'quota': quota,
+                'dispatched': 0,
+                'skipped': [],
+                'closed_reason': None,
+            })
+
+    def _priority(self, entry: dict) -> float:
+        remaining = entry['quota'] - entry['dispatched']
+        return entry['weight'] * remaining / entry['quota'] if entry['quota'] else 0.0
+
+    def _pending(self):
+        return [e for e in self.entries if e['closed_reason'] is None and e['dispatched'] < e['quota']]
+
+    def next(self, allow=None):
+        """Return (topic_file_data, query_index, query) or None when no work is left.
+
+        `allow` optionally narrows the pending entries (e.g. to those the
+        budget still covers); None is returned if it leaves nothing.
+        """
+        with self.lock:
+            pending = self._pending()
+            if pending and allow is not None:
+                pending = allow(pending)
+            if not pending:
+                return None
+            entry = max(pending, key=lambda e: (self._priority(e), -e['order']))
+            query_index = entry['dispatched']
+            entry['dispatched'] += 1
+            return entry['data'], query_index, entry['queries'][query_index]
+
+    def has_work(self) -> bool:
+        with self.lock:
+            return bool(self._pending())
+
+    def close_topic(self, csv_file: str, reason: str) -> list:
+        """Stop dispatching a topic's remaining queries; returns the skipped queries."""
+        with self.lock:
+            for entry in self.entries:
+                if entry['data']['csv_file'] == csv_file and entry['closed_reason'] is None:
+                    entry['closed_reason'] = reason
+                    entry['skipped'] = entry['queries'][entry['dispatched']:]
+                    return entry['skipped']
+        return []
+
+    def plan(self) -> list:
+        """Topics in initial dispatch order with their weights and quotas."""
+        ordered = sorted(self.entries, key=lambda e: (-e['weight'], e['order']))
+        return [(e['data']['topic']['name'], e['weight'], e['quota']) for e in ordered]
+
+    def close_pending(self, reason: str) -> int:
+        """Close every topic that still has queries left; returns the number skipped."""
+        skipped = 0
+        for entry in self._pending():
+            skipped += len(self.close_topic(entry['data']['csv_file'], reason))
+        return skipped
+
+    def coverage(self) -> list:
+        """Per-topic queries searched vs quota, and why the rest were skipped."""
+        with self.lock:
+            return [{
+                'topic': e['data']['topic']['name'],
+                'csv_file': e['data']['csv_file'],
+                'searched': e['dispatched'],
+                'quota': e['quota'],
+                'skipped': len(e['skipped']),
+                'reason': e['closed_reason'],
+            } for e in self.entries]
+
+
+class BudgetPlanner:
+    """Splits a call/token/time budget across topics and re-plans as costs come in.
+
+    Each query is costed as one search plus the scoring calls its results are
+    expected to need, using observed averages once calls have completed.
+    Before a search is dispatched the planner works out how many more queries
+    the remaining budget affords and shares them across the pending topics by
+    theme priority, so scoring budget is reserved alongside every search.
+    """
+
+    def __init__(self, max_calls: int | None = None, max_tokens: int | None = None,
+                 deadline: float | None = None, search_workers: int = 1):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.deadline = deadline
+        self.search_workers = max(search_workers, 1)
+        self.lock = threading.Lock()
+        self.searches_done = 0
+        self.results_enqueued = 0
+        self.pending_searches = 0
+        self.pending_scores = 0
+        self.dropped = {}
+        self.stop_reason = None
+
+    @property
+    def enabled(self) -> bool:
+        return any(limit is not None for limit in (self.max_calls, self.max_tokens, self.deadline))
+
+    # --- Cost model ---
+
+    def scores_per_search(self) -> float:
+        if not self.searches_done:
+            return PRIOR_SCORES_PER_SEARCH
+        return self.results_enqueued / self.searches_done
+
+    def query_cost(self) -> tuple:
+        """Expected (calls, tokens) of one more query including its scoring."""
+        scores = self.scores_per_search()
+        tokens = (usage_tracker.average_tokens("search", PRIOR_SEARCH_TOKENS)
+                  + scores * usage_tracker.average_tokens("score", PRIOR_SCORE_TOKENS))
+        return 1 + scores, tokens
+
+    def affordable_queries(self) -> float:
+        """How many more queries fit in every limit, net of work already in flight."""
+        query_calls, query_tokens = self.query_cost()
+        score_tokens = usage_tracker.average_tokens("score", PRIOR_SCORE_TOKENS)
+        limits = []
+        if self.max_calls is not None:
+            committed = usage_tracker.calls() + self.pending_searches * query_calls + self.pending_scores
+            limits.append((self.max_calls - committed) / query_calls)
+        if self.max_tokens is not None:
+            committed = usage_tracker.tokens() + self.pending_searches * query_tokens + self.pending_scores * score_tokens
+            limits.append((self.max_tokens - committed) / query_tokens)
+        if self.deadline is not None:
+            # Leave time for the last query's results to be scored
+            search_seconds = usage_tracker.average_seconds("search", PRIOR_SEARCH_SECONDS) + QUERY_PAUSE_SECONDS
+            seconds_left = self.deadline - time.time() - usage_tracker.average_seconds("score", PRIOR_SCORE_SECONDS)
+            limits.append(seconds_left * self.search_workers / search_seconds - self.pending_searches)
+        return max(min(limits), 0) if limits else float('inf')
+
+    # --- Scheduler hooks ---
+
+    def allocate(self, pending: list) -> dict:
+        """Share the affordable queries across pending topics by theme weight."""
+        budget = self.affordable_queries()
+        remaining = {e['data']['csv_file']: e['quota'] - e['dispatched'] for e in pending}
+        weights = {e['data']['csv_file']: max(e['weight'], 1e-6) for e in pending}
+        shares = dict.fromkeys(remaining, 0.0)
+
+        # Water-fill: topics that need less than their share hand the excess back
+        open_topics = set(remaining)
+        while budget > 1e-9 and open_topics:
+            total_weight = sum(weights[k] for k in open_topics)
+            spare = 0.0
+            for key in list(open_topics):
+                shares[key] += budget * weights[key] / total_weight
+                if shares[key] >= remaining[key]:
+                    spare += shares[key] - remaining[key]
+                    shares[key] = remaining[key]
+                    open_topics.discard(key)
+            budget = spare
+        return shares
+
+    def allow(self, pending: list) -> list:
+        """Pending topics whose budget share still covers another query."""
+        if not self.enabled:
+            return pending
+        with self.lock:
+            shares = self.allocate(pending)
+        allowed = [e for e in pending if shares[e['data']['csv_file']] >= 1]
+        if not allowed and sum(shares.values()) >= 1:
+            # Shares too thin to cover a whole query each: the best topic gets it
+            allowed = [max(pending, key=lambda e: shares[e['data']['csv_file']])]
+        return allowed
+
+    def start_search(self):
+        with self.lock:
+            self.pending_searches += 1
+
+    def finish_search(self, enqueued: int):
+        with self.lock:
+            self.pending_searches -= 1
+            self.searches_done += 1
+            self.results_enqueued += enqueued
+            self.pending_scores += enqueued
+
+    def score_skipped(self):
+        """A queued result needed no scoring call (e.g. it reused a duplicate's score)."""
+        with self.lock:
+            self.pending_scores -= 1
+
+    def can_score(self) -> bool:
+        """Whether a queued result may still be scored without breaking a limit."""
+        with self.lock:
+            self.pending_scores -= 1
+            if self.max_calls is not None and usage_tracker.calls() >= self.max_calls:
+                self.stop_reason = self.stop_reason or "call limit reached"
+            elif self.max_tokens is not None and usage_tracker.tokens() >= self.max_tokens:
+                self.stop_reason = self.stop_reason or "token limit reached"
+            elif self.deadline is not None and time.time() >= self.deadline:
+                self.stop_reason = self.stop_reason or "deadline passed"
+            else:
+                return True
+            return False
+
+    def record_dropped(self, csv_file: str):
+        with self.lock:
+            self.dropped[csv_file] = self.dropped.get(csv_file, 0) + 1
+
+    def usage_summary(self) -> dict:
+        """Calls and tokens used per call type against the configured limits."""
+        summary = {}
+        for call_type in ("search", "score"):
+            summary[f"{call_type.title()} calls"] = usage_tracker.calls(call_type)
+            summary[f"{call_type.title()} tokens"] = usage_tracker.tokens(call_type)
+        summary["Calls used"] = f"{usage_tracker.calls()} / {self.max_calls if self.max_calls is not None else 'unlimited'}"
+        summary["Tokens used"] = f"{usage_tracker.tokens():,} / {f'{self.max_tokens:,}' if self.max_tokens is not None else 'unlimited'}"
+        if self.deadline is not None:
+            summary["Deadline"] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.deadline))
+        if self.stop_reason:
+            summary["Budget stop"] = self.stop_reason
+        return summary
+
+
+def parse_deadline(value: str) -> float:
+    """Deadline as epoch seconds from minutes from now ("90") or a clock time ("17:30")."""
+    value = value.strip()
+    if ':' in value:
+        try:
+            target = datetime.datetime.strptime(value, '%H:%M').time()
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid deadline '{value}' (use minutes or HH:MM)")
+        now = datetime.datetime.now()
+        deadline = datetime.datetime.combine(now.date(), target)
+        if deadline <= now:
+            deadline += datetime.timedelta(days=1)
+        return deadline.timestamp()
+    try:
+        return time.time() + float(value) * 60
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid deadline '{value}' (use minutes or HH:MM)")
+
+
+class YieldTracker:
+    """Rolling per-topic count of new unique URLs per search call.
+
+    A topic is saturated once its last `window` searches averaged fewer than
+    `threshold` new URLs; a threshold of 0 disables detection.
+    """
+
+    def __init__(self, window: int = DEFAULT_SATURATION_WINDOW, threshold: float = DEFAULT_SATURATION_THRESHOLD):
+        self.window = max(window, 1)
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.history = {}
+
+    def record(self, csv_file: str, new_urls: int) -> bool:
+        """Record one search's yield; returns True if the topic is now saturated."""
+        with self.lock:
+            recent = self.history.setdefault(csv_file, [])
+            recent.append(new_urls)
+            if self.threshold <= 0 or len(recent) < self.window:
+                return False
+            return sum(recent[-self.window:]) / self.window < self.threshold
+
+    def recent(self, csv_file: str) -> list:
+        with self.lock:
+            return self.history.get(csv_file, [])[-self.window:]
+
+
+class StageMetrics:
+    """Throughput, busy time and queue depth for one pipeline stage."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0  # time spent waiting to hand work downstream (backpressure)
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+
+    def record_work(self, seconds: float):
+        with self.lock:
+            self.items += 1
+            self.busy_seconds += seconds
+
+    def record_put(self, depth: int, blocked: float):
+        with self.lock:
+            self.blocked_seconds += blocked
+            self.depth_samples += 1
+            self.depth_total += depth
+            self.max_depth = max(self.max_depth, depth)
+
+    def summary(self, wall_seconds: float) -> dict:
+        capacity = max(wall_seconds * self.workers, 1e-9)
+        return {
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 1),
+            "utilization": round(self.busy_seconds / capacity, 2),
+            "blocked_seconds": round(self.blocked_seconds, 1),
+            "avg_output_queue_depth": round(self.depth_total / self.depth_samples, 1) if self.depth_samples else 0,
+            "max_output_queue_depth": self.max_depth,
+        }
+
+
+class GatherPipeline:
+    """Staged gather: search producers -> shared scoring pool -> CSV writer.
+
+    Bounded queues between stages give backpressure: when scoring falls
+    behind, searches block on the full queue instead of piling up results.
+    """
 
-    findings_count = 0
+    _STOP = object()
+
+    def __init__(self, topic_files: list, search_workers: int = DEFAULT_SEARCH_WORKERS,
+                 score_workers: int = DEFAULT_SCORE_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 queries_per_topic: int | None = None, budget: BudgetPlanner | None = None,
+                 saturation: YieldTracker | None = None, duplicates: NearDuplicateIndex | None = None,
+                 duplicate_policy: str = 'reuse', prefilter: bool = True):
+        self.topic_files = topic_files
+        self.search_workers = search_workers
+        self.score_workers = score_workers
+        self.scheduler = QueryScheduler(topic_files, queries_per_topic)
+        self.budget = budget or BudgetPlanner(search_workers=search_workers)
+        self.dispatch_lock = threading.Lock()
+        self.saturation = saturation or YieldTracker()
+        self.saturation_saved = {}
+        self.duplicates = duplicates
+        self.duplicate_policy = duplicate_policy
+        self.duplicate_stats = {'reused': 0, 'dropped': 0, 'kept': 0}
+        self.prefilter = prefilter
+        self.prefilter_stats = PrefilterStats()
+        self.started_topics = set()
+        self.score_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.state_lock = threading.Lock()
+        self.findings = {data['csv_file']: 0 for data in topic_files}
+        self.errors = []
+        self.metrics = {
+            "search": StageMetrics("search", search_workers),
+            "score": StageMetrics("score", score_workers),
+            "write": StageMetrics("write", 1),
+        }
+        self.wall_seconds = 0.0
+
+    # --- Stage plumbing ---
+
+    def _put(self, target: queue.Queue, item, stage: str):
+        start = time.perf_counter()
+        target.put(item)
+        blocked = time.perf_counter() - start
+        self.metrics[stage].record_put(target.qsize(), blocked)
+        return blocked
+
+    def _finish_query_if_done(self, query_state: dict):
+        """Write the narrative log entry once a query's search and all its rows are done."""
+        with self.state_lock:
+            if not query_state['search_done'] or query_state['open'] > 0 or query_state['logged']:
+                return
+            query_state['logged'] = True
+
+        records = query_state['records']
+        status = "new findings" if records else ("no new after dedupe" if query_state['results'] else "no results")
+        try:
+            append_gather_log(query_state['topic'], query_state['query'], status, records)
+        except Exception as e:
+            # The narrative log is informational; a failure here must not stop a pipeline stage
+            print(f"⚠️ Could not write narrative log entry for '{query_state['query'][:40]}': {e}")
+
+    # --- Stages ---
+
+    def _next_query(self):
+        """Next query the budget allows, waiting while in-flight searches may free budget."""
+        while True:
+            with self.dispatch_lock:
+                work = self.scheduler.next(self.budget.allow)
+                if work is not None:
+                    self.budget.start_search()
+                    return work
+                in_flight = self.budget.pending_searches
+            if not self.scheduler.has_work() or not in_flight:
+                return None
+            time.sleep(BUDGET_RECHECK_SECONDS)
+
+    def _search_worker(self):
+        while True:
+            work = self._next_query()
+            if work is None:
+                return
+            data, query_index, query = work
+            enqueued = 0
+            try:
+                enqueued = self._search_query(data, query_index, query)
+            except Exception as e:
+                print(f"❌ {data['topic']['name']} query failed: {e}")
+                self.errors.append(data['topic']['name'])
+            finally:
+                self.budget.finish_search(enqueued)
+
+            # Brief pause between queries to avoid rate limits
+            if self.scheduler.has_work():
+                time.sleep(QUERY_PAUSE_SECONDS)
+
+    def _announce_topic(self, data: dict):
+        with self.state_lock:
+            if data['csv_file'] in self.started_topics:
+                return
+            self.started_topics.add(data['csv_file'])
+
+        topic_data = data['topic']
+        child_themes = topic_data.get("child_themes", 0)
+        metrics = topic_data.get("metrics", {})
+        print(f"\n🔍 Topic: {topic_data['name']} (priority {theme_priority(topic_data)})")
+        if child_themes:
+            print(f"   📊 Child themes: {child_themes}")
+        if metrics:
+            print(f"   📈 Prevalence: {metrics.get('prevalence', 'N/A')}/10 | Emotional: {metrics.get('emotional_intensity', 'N/A')}/10")
+
+    def _search_query(self, data: dict, query_index: int, query: str):
+        topic_name = data['topic']["name"]
+        topic_urls = data['topic_urls']
+        self._announce_topic(data)
+
+        print(f"   [{topic_name[:30]} {query_index + 1}/{len(data['topic']['queries'])}] Processing query...")
+        query_state = {
+            'topic': topic_name, 'query': query, 'results': 0, 'records': [],
+            'open': 0, 'search_done': False, 'logged': False,
+        }
 
-    for query_index, query in enumerate(queries):
-        print(f"   [{query_index + 1}/{len(queries)}] Processing query...")
+        search_start = time.perf_counter()
+        blocked = 0.0
+        enqueued = 0
+        for result in search_web_stream(query, topic_name):
+            query_state['results'] += 1
+            url = result.get('url', '')
 
-        # Search
-        results = search_web_simple(query, topic_name)
+            # Claim the URL now so in-flight duplicates are skipped too
+            with self.state_lock:
+                if url in topic_urls:
+                    print(f"      ⏭️ Skipping duplicate URL: {url[:50]}...")
+                    continue
+                topic_urls.add(url)
+                query_state['open'] += 1
+
+            blocked += self._put(self.score_queue, {
+                'data': data,
+                'query': query,
+                'result': result,
+                'query_state': query_state,
+            }, "search")
+            enqueued += 1
+        self.metrics["search"].record_work(time.perf_counter() - search_start - blocked)
+
+        with self.state_lock:
+            query_state['search_done'] = True
+        self._finish_query_if_done(query_state)
+
+        if self.saturation.record(data['csv_file'], enqueued):
+            skipped = self.scheduler.close_topic(data['csv_file'], "saturated")
+            if skipped:
+                self.saturation_saved[data['csv_file']] = len(skipped)
+                print(f"   🧊 {topic_name}: saturated (new URLs in last searches: {self.saturation.recent(data['csv_file'])}) "
+                      f"- skipping {len(skipped)} remaining queries")
+        return enqueued
+
+    def _score_worker(self):
+        while True:
+            item = self.score_queue.get()
+            if item is self._STOP:
+                return
+            try:
+                self._score_item(item)
+            except Exception as e:
+                if self.duplicates is not None and item.get('duplicate_entry') is not None:
+                    self.duplicates.resolve(item['duplicate_entry'], None)
+                self._abandon(item, "scoring", e)
+
+    def _score_item(self, item: dict):
+        result = item['result']
+        entry = None
+        if self.duplicates is not None:
+            match, entry = self.duplicates.check_and_add(
+                result.get('content', ''), url=result.get('url', ''), csv_file=item['data']['csv_file'])
+            item['duplicate_entry'] = entry
+            if match is not None and self._handle_duplicate(item, match):
+                return
+
+        local = prescore(result) if self.prefilter else None
+        if local is not None:
+            self._prefiltered(item, local, entry)
+            return
 
-        new_records = []
+        if not self.budget.can_score():
+            if self.duplicates is not None:
+                self.duplicates.resolve(entry, None)
+            self._drop_unscored(item)
+            return
 
-        # Score and save each result (skip duplicates)
-        for result in results:
+        score_metadata = {
+            "topic": item['data']['topic']['name'],
+            "query": item['query'],
+            "url": result.get('url', ''),
+            "title": result.get('title', ''),
+        }
+        start = time.perf_counter()
+        item['scores'] = score_content_simple(result.get('content', ''), result.get('title', ''), metadata=score_metadata)
+        if self.duplicates is not None:
+            self.duplicates.resolve(entry, item['scores'])
+        self.metrics["score"].record_work(time.perf_counter() - start)
+        self._put(self.write_queue, item, "score")
+
+    def _handle_duplicate(self, item: dict, match: dict) -> bool:
+        """Apply the duplicate policy; returns True if the item needs no scoring call.
+
+        `drop` only drops duplicates of rows in the same theme CSV; a duplicate
+        from another theme reuses the score so each theme keeps its copy.
+        """
+        url = item['result'].get('url', '')
+        if self.duplicate_policy == 'keep':
+            with self.state_lock:
+                self.duplicate_stats['kept'] += 1
+            return False
+
+        self.budget.score_skipped()
+        if self.duplicate_policy == 'drop' and match['csv_file'] == item['data']['csv_file']:
+            print(f"      ♻️ Dropping near-duplicate ({match['similarity']:.0%}) of {match['url'][:50]}: {url[:50]}")
+            query_state = item['query_state']
+            with self.state_lock:
+                self.duplicate_stats['dropped'] += 1
+                query_state['open'] -= 1
+            self._finish_query_if_done(query_state)
+            return True
+
+        scores = self.duplicates.wait(match, DUPLICATE_WAIT_SECONDS)
+        if scores is None:
+            # The original was never scored (budget stop or timeout)
+            self._drop_unscored(item)
+            return True
+        print(f"      ♻️ Reusing score of near-duplicate ({match['similarity']:.0%}) {match['url'][:50]}: {url[:50]}")
+        item['scores'] = dict(scores)
+        with self.state_lock:
+            self.duplicate_stats['reused'] += 1
+        self._put(self.write_queue, item, "score")
+        return True
+
+    def _prefiltered(self, item: dict, scores: dict, entry: dict | None):
+        """Write a clear reject with its local score instead of calling the model."""
+        print(f"      🧹 Pre-filtered {item['result'].get('url', '')[:50]}: {scores['key_insights']}")
+        self.budget.score_skipped()
+        if self.duplicates is not None:
+            self.duplicates.resolve(entry, scores)
+        with self.state_lock:
+            self.prefilter_stats.record(scores)
+        item['scores'] = scores
+        self._put(self.write_queue, item, "score")
+
+    def _drop_unscored(self, item: dict):
+        """Skip a result the budget can't score, releasing its URL for a later run."""
+        data = item['data']
+        query_state = item['query_state']
+        with self.state_lock:
+            data['topic_urls'].discard(item['result'].get('url', ''))
+            query_state['open'] -= 1
+        self.budget.record_dropped(data['csv_file'])
+        self._finish_query_if_done(query_state)
+
+    def _abandon(self, item: dict, stage: str, error: Exception):
+        """Give up on one result after an unexpected error, without stalling the pipeline.
+
+        The URL is released so a later run picks the result up again.
+        """
+        data = item['data']
+        url = item['result'].get('url', '')
+        print(f"❌ {data['topic']['name']}: {stage} failed for {url[:50]}: {error}")
+        query_state = item['query_state']
+        with self.state_lock:
+            self.errors.append(data['topic']['name'])
+            data['topic_urls'].discard(url)
+            query_state['open'] -= 1
+        self._finish_query_if_done(query_state)
+
+    def _writer(self):
+        while True:
+            item = self.write_queue.get()
+            if item is self._STOP:
+                return
+
+            start = time.perf_counter()
+            data = item['data']
+            try:
+                append_gathered_row(data['csv_file'], data['topic']['name'], item['query'], item['result'], item['scores'])
+            except Exception as e:
+                self._abandon(item, "writing", e)
+                continue
+            self.metrics["write"].record_work(time.perf_counter() - start)
+
+            query_state = item['query_state']
+            with self.state_lock:
+                self.findings[data['csv_file']] += 1
+                query_state['records'].append(item['result'])
+                query_state['open'] -= 1
+            self._finish_query_if_done(query_state)
+
+    # --- Orchestration ---
+
+    def run(self) -> dict:
+        """Run all stages to completion; returns findings count per CSV file."""
+        print("🗓️ Query schedule (highest priority first):")
+        for name, weight, quota in self.scheduler.plan():
+            print(f"   • {name}: priority {weight} | {quota} queries")
+
+        start = time.perf_counter()
+        writer = threading.Thread(target=self._writer, name="gather-writer")
+        scorers = [threading.Thread(target=self._score_worker, name=f"gather-score-{i}") for i in range(self.score_workers)]
+        searchers = [threading.Thread(target=self._search_worker, name=f"gather-search-{i}") for i in range(self.search_workers)]
+
+        for thread in [writer, *scorers, *searchers]:
+            thread.start()
+
+        # Drain stage by stage so every queued item is scored and written
+        for thread in searchers:
+            thread.join()
+        for _ in scorers:
+            self.score_queue.put(self._STOP)
+        for thread in scorers:
+            thread.join()
+        self.write_queue.put(self._STOP)
+        writer.join()
+
+        if self.budget.enabled and self.scheduler.close_pending("budget"):
+            self.budget.stop_reason = self.budget.stop_reason or "remaining queries exceed budget"
+
+        self.wall_seconds = time.perf_counter() - start
+        return self.findings
+
+    def coverage_report(self) -> list:
+        """Per-topic coverage including results dropped unscored by the budget."""
+        report = self.scheduler.coverage()
+        for row in report:
+            row['unscored'] = self.budget.dropped.get(row['csv_file'], 0)
+        return report
+
+    def print_coverage_report(self):
+        print("🧮 Coverage:")
+        for row in self.coverage_report():
+            line = f"   • {row['topic']}: {row['searched']}/{row['quota']} queries searched"
+            if row['skipped']:
+                line += f" | {row['skipped']} not covered ({row['reason']})"
+            if row['unscored']:
+                line += f" | {row['unscored']} results left unscored"
+            print(line)
+        if self.duplicates is not None:
+            stats = self.duplicate_stats
+            print(f"   • Near-duplicates ({self.duplicate_policy}): {stats['reused']} reused scores, "
+                  f"{stats['dropped']} dropped, {stats['kept']} scored anyway "
+                  f"({stats['reused'] + stats['dropped']} scoring calls saved)")
+        if self.prefilter:
+            print(f"   • Scoring calls saved by pre-filter: {self.prefilter_stats.summary()}")
+        saved = sum(self.saturation_saved.values())
+        if saved:
+            print(f"   • Searches saved by saturation: {saved} (~{saved * QUERY_PAUSE_SECONDS}s of pauses)")
+        if self.budget.enabled:
+            for label, value in self.budget.usage_summary().items():
+                print(f"   • {label}: {value}")
+
+    def stage_report(self) -> dict:
+        """Per-stage metrics plus the most utilized stage (the likely bottleneck)."""
+        report = {name: stage.summary(self.wall_seconds) for name, stage in self.metrics.items()}
+        bottleneck = max(report, key=lambda name: report[name]["utilization"])
+        return {"stages": report, "bottleneck": bottleneck, "wall_seconds": round(self.wall_seconds, 1)}
+
+    def print_stage_report(self):
+        report = self.stage_report()
+        print("⏱️ Pipeline stages:")
+        for name, stats in report["stages"].items():
+            print(f"   • {name}: {stats['items']} items | busy {stats['busy_seconds']}s "
+                  f"({stats['utilization']:.0%} of {self.metrics[name].workers} workers) | "
+                  f"blocked {stats['blocked_seconds']}s | queue depth avg {stats['avg_output_queue_depth']} / max {stats['max_output_queue_depth']}")
+        print(f"   • Bottleneck: {report['bottleneck']}")
+
+
+def is_escalated_score(score_record: dict, next_record: dict) -> bool:
+    """True if a logged score is a fast-model attempt that cascade routing escalated to the large model"""
+    return (FAST_MODEL != LARGE_MODEL
+            and score_record.get('metadata', {}).get('model') == FAST_MODEL
+            and next_record.get('metadata', {}).get('model') == LARGE_MODEL)
+
+
+def replay_from_audit(topic_files: list, duplicate_policy: str = 'reuse',
+                      duplicate_threshold: float = DEFAULT_DUPLICATE_THRESHOLD, prefilter: bool = True) -> dict:
+    """Rebuild topic CSVs from logged search and score responses, without API calls.
+
+    Logged searches are replayed in order through the same parsing, URL dedupe
+    and near-duplicate rules as a live run, and each row takes the scores and
+    timestamp of its logged scoring response (pre-filtered rejects are
+    re-scored locally). A logged topic maps to a CSV by
+    its current name or by the topic names already in that CSV. Existing CSVs
+    are moved to <csv>.<timestamp>.bak first.
+    """
+    by_topic = {}
+    for data in topic_files:
+        by_topic[data['topic']['name']] = data
+        if os.path.exists(data['csv_file']):
+            with open(data['csv_file'], 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    by_topic.setdefault(row.get('topic', ''), data)
+
+    searches = []
+    scores_by_key = {}
+    for record in audit_log.iter_records():
+        metadata = record.get('metadata') or {}
+        if record.get('call_type') == 'search' and metadata.get('topic') in by_topic:
+            searches.append(record)
+        elif record.get('call_type') == 'score':
+            key = (metadata.get('topic'), metadata.get('query'), metadata.get('url'))
+            scores_by_key.setdefault(key, []).append(record)
+
+    stamp = time.strftime('%Y%m%d_%H%M%S')
+    for data in topic_files:
+        if os.path.exists(data['csv_file']):
+            # Timestamped, so a second replay never overwrites the backup of the original data
+            backup = f"{data['csv_file']}.{stamp}.bak"
+            suffix = 1
+            while os.path.exists(backup):
+                suffix += 1
+                backup = f"{data['csv_file']}.{stamp}-{suffix}.bak"
+            os.replace(data['csv_file'], backup)
+            print(f"   💾 Backed up {data['csv_file']} -> {backup}")
+        data['topic_urls'] = set()
+
+    duplicates = NearDuplicateIndex(duplicate_threshold)
+    stats = {'searches': len(searches), 'rows': 0, 'duplicate_urls': 0, 'near_duplicates': 0, 'prefiltered': 0,
+             'missing_scores': 0, 'unmatched_scores': 0}
+    findings = {data['csv_file']: 0 for data in topic_files}
+    replayed_keys = set()
+
+    for record in searches:
+        metadata = record['metadata']
+        topic_name, query = metadata['topic'], metadata['query']
+        data = by_topic[topic_name]
+        for result in parse_logged_search(record.get('response_text', ''), query):
             url = result.get('url', '')
+            replayed_keys.add((topic_name, query, url))
+            if url in data['topic_urls']:
+                stats['duplicate_urls'] += 1
+                continue
+            data['topic_urls'].add(url)
 
-            # Skip if URL already exists in this topic's file
-            if url in topic_urls:
-                print(f"      ⏭️ Skipping duplicate URL: {url[:50]}...")
+            match, entry = duplicates.check_and_add(result.get('content', ''), url=url, csv_file=data['csv_file'])
+            if match is not None and duplicate_policy == 'drop' and match['csv_file'] == data['csv_file']:
+                stats['near_duplicates'] += 1
+                continue
+
+            logged = scores_by_key.get((topic_name, query, url))
+            if logged:
+                while True:
+                    score_record = logged.pop(0)
+                    scores, timestamp = parse_score_response(score_record['response_text']), score_record['timestamp']
+                    # Cascade routing logs the rejected fast-model score just before the escalated one
+                    if not (logged and is_escalated_score(score_record, logged[0])):
+                        break
+            elif match is not None and duplicate_policy == 'reuse' and match['entry']['scores'] is not None:
+                # Live runs reuse a near-duplicate's score without logging a call
+                scores, timestamp = dict(match['entry']['scores']), record['timestamp']
+            elif prefilter and (local := prescore(result)) is not None:
+                # Pre-filtered rejects were scored locally, so they have no logged call either
+                scores, timestamp = local, record['timestamp']
+                stats['prefiltered'] += 1
+            else:
+                stats['missing_scores'] += 1
+                data['topic_urls'].discard(url)
+                duplicates.resolve(entry, None)
                 continue
 
-            score_metadata = {
-                "topic": topic_name,
-                "query": query,
-                "url": url,
+            duplicates.resolve(entry, scores)
+            append_gathered_row(data['csv_file'], topic_name, query, result, scores, timestamp=timestamp)
+            findings[data['csv_file']] += 1
+            stats['rows'] += 1
+
+    # Scored results whose search never reached the log: a live run wrote these rows, the replay can't
+    stats['unmatched_scores'] = sum(1 for key in scores_by_key if key[0] in by_topic and key not in replayed_keys)
+    return {'findings': findings, 'stats': stats}
+
+
+DEFAULT_QUEUE_DB = os.path.join(AUDIT_LOG_DIR, "gather_work_queue.sqlite")
+QUEUE_POLL_SECONDS = 2
+SCORE_TASK_PRIORITY = 1  # scoring drains before new searches so results land early
+
+
+def enqueue_gather_work(work_queue: WorkQueue, topic_files: list, queries_per_topic: int | None = None) -> dict:
+    """Add every planned (topic, query) search to the work queue in schedule order.
+
+    Tasks are keyed by CSV file and query, so re-enqueueing is a no-op.
+    """
+    scheduler = QueryScheduler(topic_files, queries_per_topic)
+    added = existing = 0
+    position = 0
+    while True:
+        work = scheduler.next()
+        if work is None:
+            break
+        data, query_index, query = work
+        position += 1
+        payload = {
+            'csv_file': data['csv_file'],
+            'topic': data['topic']['name'],
+            'query': query,
+            'query_index': query_index,
+            'language': data['language'],
+        }
+        # Negative position keeps the scheduler's priority order among searches
+        if work_queue.enqueue('search', f"search|{data['csv_file']}|{query}", payload, priority=-position):
+            added += 1
+        else:
+            existing += 1
+    return {'added': added, 'existing': existing}
+
+
+class QueueWorker:
+    """Drain the shared work queue: search tasks fan out into score tasks, scored rows go to the CSVs.
+
+    Run any number of these, in separate processes or on machines sharing the
+    queue file and output folders. A row is only written by the worker that
+    still holds its score task's lease, so retried tasks never duplicate rows.
+    """
+
+    def __init__(self, work_queue: WorkQueue, threads: int, prefilter: bool = True):
+        self.queue = work_queue
+        self.threads = threads
+        self.prefilter = prefilter
+        self.prefilter_stats = PrefilterStats()
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.held = {}
+        self.lock = threading.Lock()
+        self.known_urls = {}
+        self.stats = {'searches': 0, 'scored': 0, 'prefiltered': 0, 'written': 0, 'lost_leases': 0, 'failed': 0}
+        self.stopping = threading.Event()
+
+    def _count(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def _existing_urls(self, csv_file: str) -> set:
+        with self.lock:
+            if csv_file not in self.known_urls:
+                self.known_urls[csv_file] = load_existing_urls(csv_file)
+            return self.known_urls[csv_file]
+
+    def _heartbeat(self):
+        while not self.stopping.wait(self.queue.lease_seconds / 3):
+            with self.lock:
+                held = list(self.held.items())
+            for task_id, thread_id in held:
+                if not self.queue.heartbeat(task_id, thread_id):
+                    print(f"   ⚠️ Lost lease on task {task_id}")
+
+    def _run_search(self, task: dict, thread_id: str) -> dict:
+        payload = task['payload']
+        known = self._existing_urls(payload['csv_file'])
+        new_tasks = 0
+        for result in search_web_stream(payload['query'], payload['topic']):
+            url = result.get('url', '')
+            if url in known:
+                print(f"      ⏭️ Skipping duplicate URL: {url[:50]}...")
+                continue
+            score_payload = dict(payload, result=result)
+            if self.queue.enqueue('score', f"score|{payload['csv_file']}|{url}", score_payload, priority=SCORE_TASK_PRIORITY):
+                new_tasks += 1
+        self._count('searches')
+        time.sleep(QUERY_PAUSE_SECONDS)
+        return {'score_tasks': new_tasks}
+
+    def _run_score(self, task: dict, thread_id: str) -> bool:
+        payload = task['payload']
+        result = payload['result']
+        scores = prescore(result) if self.prefilter else None
+        if scores is not None:
+            with self.lock:
+                self.prefilter_stats.record(scores)
+            self._count('prefiltered')
+        else:
+            scores = score_content_simple(result.get('content', ''), result.get('title', ''), metadata={
+                "topic": payload['topic'],
+                "query": payload['query'],
+                "url": result.get('url', ''),
                 "title": result.get('title', ''),
-            }
-            scores = score_content_simple(result.get('content', ''), result.get('title', ''), metadata=score_metadata)
-
-            # Save to CSV
-            with file_lock:
-                file_exists = os.path.isfile(csv_file)
-                with open(csv_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    if not file_exists:
-                        writer.writerow(['topic', 'query', 'url', 'title', 'content', 'comments_summary', 'source', 'relevance', 'research_value', 'emotional_tone', 'detail_level', 'personal_story', 'key_insights', 'timestamp'])
-
-                    writer.writerow([
-                        topic_name,
-                        query,
-                        url,
-                        result.get('title', ''),
-                        result.get('content', ''),
-                        result.get('comments_summary', 'No comments captured'),
-                        result.get('source', ''),
-                        result.get('relevance', 0.5),
-                        scores.get('research_value', 3),
-                        scores.get('emotional_tone', 0),
-                        scores.get('detail_level', 3),
-                        scores.get('personal_story', False),
-                        scores.get('key_insights', ''),
-                        time.strftime('%Y-%m-%d %H:%M:%S')
-                    ])
-
-                # Add URL to this topic's set
-                topic_urls.add(url)
+            })
+            self._count('scored')
+        # Only the current lease holder writes, and only once: a retry after a crash between
+        # the write and `complete` finds the row already there. `complete` comes last, so a
+        # failed write leaves the task to be retried (the caller calls `fail` on exceptions).
+        if not self.queue.heartbeat(task['id'], thread_id):
+            self._count('lost_leases')
+            return False
+        url = result.get('url', '')
+        if csv_has_url(payload['csv_file'], url):
+            print(f"      ⏭️ Row already written by an earlier attempt: {url[:50]}")
+        else:
+            append_gathered_row(payload['csv_file'], payload['topic'], payload['query'], result, scores)
+            self._count('written')
+        self._existing_urls(payload['csv_file']).add(url)
+        if not self.queue.complete(task['id'], thread_id, {'research_value': scores.get('research_value')}):
+            self._count('lost_leases')
+            return False
+        return True
+
+    def _work(self, thread_number: int):
+        thread_id = f"{self.worker_id}/{thread_number}"
+        while True:
+            task = self.queue.lease(thread_id)
+            if task is None:
+                if not self.queue.has_open_work():
+                    return
+                time.sleep(QUEUE_POLL_SECONDS)
+                continue
 
-            findings_count += 1
-            new_records.append(result)
+            with self.lock:
+                self.held[task['id']] = thread_id
+            try:
+                if task['kind'] == 'search':
+                    outcome = self._run_search(task, thread_id)
+                    if not self.queue.complete(task['id'], thread_id, outcome):
+                        self._count('lost_leases')
+                else:
+                    self._run_score(task, thread_id)
+            except Exception as e:
+                status = self.queue.fail(task['id'], thread_id, str(e))
+                print(f"❌ {task['kind']} task {task['id']} failed (attempt {task['attempts']}, now {status}): {e}")
+                if status == 'failed':
+                    self._count('failed')
+            finally:
+                with self.lock:
+                    self.held.pop(task['id'], None)
+
+    def run(self) -> dict:
+        heartbeat = threading.Thread(target=self._heartbeat, name="queue-heartbeat", daemon=True)
+        heartbeat.start()
+        workers = [threading.Thread(target=self._work, args=(i,), name=f"queue-worker-{i}") for i in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        self.stopping.set()
+        return self.stats
+
+
+def run_queue_worker(args):
+    """--worker: drain the shared queue until no open work is left."""
+    work_queue = WorkQueue(args.queue_db, lease_seconds=args.lease_seconds)
+    counts = work_queue.counts()
+    print(f"🧵 Queue worker on {os.path.abspath(args.queue_db)}: {counts['pending']} pending, {counts['leased']} leased, {counts['done']} done")
+    if not work_queue.has_open_work():
+        print("✅ Nothing to do")
+        return
 
-        status = "new findings" if new_records else ("no new after dedupe" if results else "no results")
-        append_gather_log(topic_name, query, status, new_records)
+    os.makedirs(AUDIT_LOG_DIR, exist_ok=True)
+    worker = QueueWorker(work_queue, args.search_workers + args.score_workers, prefilter=not args.no_prefilter)
+    print(f"🤖 Model: {MODEL_NAME} | worker id: {worker.worker_id} | threads: {worker.threads}")
+    stats = worker.run()
+    audit_log.close()
+    routing_stats.print_summary()
+    hedger.print_summary("search")
+
+    print(f"\n✅ Worker finished: {stats['searches']} searches, {stats['scored']} scored, {stats['written']} rows written")
+    if worker.prefilter:
+        print(f"   • Scoring calls saved by pre-filter: {worker.prefilter_stats.summary()}")
+    if stats['lost_leases']:
+        print(f"   ⚠️ Results discarded after losing the lease: {stats['lost_leases']}")
+    for kind in ('search', 'score'):
+        counts = work_queue.counts(kind)
+        print(f"   • {kind} tasks: {counts['done']} done, {counts['failed']} failed, {counts['pending'] + counts['leased']} open")
+    print_backlog_hint()
+
+
+def run_rescore_backlog(args):
+    """--rescore-backlog: re-score provisional rows in batches and update them in place.
+
+    Each batch is leased from the backlog, scored concurrently and written
+    back with one rewrite per CSV. Rows that fail again stay provisional and
+    are retried on a later run, up to the queue's attempt limit.
+    """
+    if args.rescore_at:
+        wait = args.rescore_at - time.time()
+        print(f"🕓 Waiting {wait / 60:.0f} min until {datetime.datetime.fromtimestamp(args.rescore_at).strftime('%H:%M')} to re-score")
+        time.sleep(max(wait, 0))
+
+    backlog = get_rescore_backlog()
+    csv_files = [
+        str(csv_file)
+        for language in resolve_languages(args.language)
+        for csv_file in sorted(Path(get_folder_name(3, 'gather', language)).glob(f"gathered_data-*-{language}.csv"))
+    ]
+    found = enqueue_provisional_rows(backlog, csv_files)
+    counts = backlog.counts('rescore')
+    print(f"🕓 Re-score backlog {os.path.abspath(RESCORE_BACKLOG_DB)}: {counts['pending']} pending"
+          f" ({found} newly found in {len(csv_files)} CSVs), {counts['failed']} given up")
+
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    stats = {'batches': 0, 'rescored': 0, 'still_provisional': 0, 'missing_rows': 0}
+    tried = set()
+    while True:
+        # Rows that failed earlier in this run are left for the next run
+        tasks = backlog.lease_many(worker_id, args.rescore_batch, exclude=tried)
+        if not tasks:
+            break
+        stats['batches'] += 1
+        tried.update(task['id'] for task in tasks)
+        print(f"\n📦 Batch {stats['batches']}: re-scoring {len(tasks)} rows with {args.score_workers} workers")
+
+        def rescore(task):
+            payload = task['payload']
+            return score_content_simple(payload['content'], payload['title'], metadata={
+                "topic": payload['topic'],
+                "query": payload['query'],
+                "url": payload['url'],
+                "title": payload['title'],
+            })
 
-        # Brief pause between queries to avoid rate limits
-        if query_index < len(queries) - 1:
-            time.sleep(3)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.score_workers) as executor:
+            results = list(executor.map(rescore, tasks))
+
+        updates = {}
+        for task, scores in zip(tasks, results):
+            if scores.get('score_status') == STATUS_PROVISIONAL:
+                backlog.fail(task['id'], worker_id, scores['key_insights'])
+                stats['still_provisional'] += 1
+                continue
+            payload = task['payload']
+            updates.setdefault(payload['csv_file'], {})[(payload['url'], payload['timestamp'])] = (task, scores)
+
+        for csv_file, by_key in updates.items():
+            found_keys = update_rows_in_place(csv_file, {key: scores for key, (_, scores) in by_key.items()}) \
+                if os.path.exists(csv_file) else set()
+            for key, (task, _) in by_key.items():
+                backlog.complete(task['id'], worker_id, {'updated': key in found_keys})
+                stats['rescored' if key in found_keys else 'missing_rows'] += 1
+            print(f"   ✅ {os.path.basename(csv_file)}: {len(found_keys)} rows updated in place")
+
+    audit_log.close()
+    routing_stats.print_summary()
+    counts = backlog.counts('rescore')
+    print(f"\n✅ Re-score complete: {stats['rescored']} rows updated in {stats['batches']} batches")
+    if stats['still_provisional']:
+        print(f"   ⚠️ Still provisional (retried next run): {stats['still_provisional']}")
+    if stats['missing_rows']:
+        print(f"   ⚠️ Rows no longer in their CSV: {stats['missing_rows']}")
+    print(f"   • Backlog: {counts['pending']} pending, {counts['done']} done, {counts['failed']} given up")
 
-    print(f"   ✅ {topic_name}: {findings_count} findings")
-    return findings_count, csv_file
 
 def filter_topics_by_selection(topics: list, selected_indices: list = None) -> list:
     """Filter topics based on user selection."""
@@ -608,7 +2151,7 @@ def show_available_themes(topics: list):
         query_count = len(topic.get("queries", []))
 
         print(f"{i}. {name}")
-        print(f"   📊 Prevalence: {prevalence}/10 | Emotional: {emotional}/10")
+        print(f"   📊 Prevalence: {prevalence}/10 | Emotional: {emotional}/10 | Priority: {theme_priority(topic)}")
         print(f"   📝 Child themes: {child_count} | Queries: {query_count}")
         print()
 
@@ -619,26 +2162,69 @@ def parse_args():
                        help="Specific theme numbers to research (e.g., --themes 1 3)")
     parser.add_argument("--list", "-ls", action="store_true",
                        help="List available themes and exit")
+    parser.add_argument("--search-workers", type=int, default=DEFAULT_SEARCH_WORKERS,
+                       help=f"Concurrent search producers (default: {DEFAULT_SEARCH_WORKERS})")
+    parser.add_argument("--score-workers", type=int, default=DEFAULT_SCORE_WORKERS,
+                       help=f"Shared scoring worker pool size (default: {DEFAULT_SCORE_WORKERS})")
+    parser.add_argument("--queries-per-topic", type=int, default=None,
+                       help="Cap on queries per topic; the scheduler shares throughput by theme priority within it (default: all)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                       help=f"Bounded queue size between stages (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument("--saturation-window", type=int, default=DEFAULT_SATURATION_WINDOW,
+                       help=f"Searches per topic in the new-URL yield window (default: {DEFAULT_SATURATION_WINDOW})")
+    parser.add_argument("--saturation-threshold", type=float, default=DEFAULT_SATURATION_THRESHOLD,
+                       help=f"Skip a topic's remaining queries once its mean new URLs per search falls below this; 0 disables (default: {DEFAULT_SATURATION_THRESHOLD})")
+    parser.add_argument("--duplicate-policy", choices=DUPLICATE_POLICIES, default='reuse',
+                       help="Near-duplicate content: reuse the earlier score, drop the row, or keep scoring it (default: reuse)")
+    parser.add_argument("--duplicate-threshold", type=float, default=DEFAULT_DUPLICATE_THRESHOLD,
+                       help=f"Estimated content similarity that counts as a near-duplicate (default: {DEFAULT_DUPLICATE_THRESHOLD})")
+    parser.add_argument("--no-prefilter", action="store_true",
+                       help="Send every result to the scoring model instead of scoring clear rejects locally")
+    parser.add_argument("--replay-from-audit", action="store_true",
+                       help="Rebuild the theme CSVs from logged responses instead of calling the API (existing CSVs are kept as <csv>.<timestamp>.bak)")
+    parser.add_argument("--max-calls", type=int, default=None,
+                       help="Stop once this many API calls (searches + scoring) are used")
+    parser.add_argument("--max-tokens", type=int, default=None,
+                       help="Stop once this many tokens are used")
+    parser.add_argument("--deadline", type=parse_deadline, default=None,
+                       help="Finish by this time: minutes from now (90) or a clock time (17:30)")
+    parser.add_argument("--enqueue", action="store_true",
+                       help="Add the planned searches to the shared work queue instead of running them")
+    parser.add_argument("--worker", action="store_true",
+                       help="Drain the shared work queue; start several (on any machine sharing the files) to split the work")
+    parser.add_argument("--queue-db", default=DEFAULT_QUEUE_DB,
+                       help=f"Work queue file for --enqueue/--worker (default: {DEFAULT_QUEUE_DB})")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                       help=f"How long a queue task stays claimed without a heartbeat (default: {DEFAULT_LEASE_SECONDS})")
+    parser.add_argument("--rescore-backlog", action="store_true",
+                       help="Re-score rows left with provisional scores (timeouts, API or parse errors) and update them in place")
+    parser.add_argument("--rescore-batch", type=int, default=DEFAULT_RESCORE_BATCH,
+                       help=f"Rows leased and re-scored per batch (default: {DEFAULT_RESCORE_BATCH})")
+    parser.add_argument("--rescore-at", type=parse_deadline, default=None,
+                       help="With --rescore-backlog, wait until an off-peak time: minutes from now (90) or a clock time (02:00)")
+    parser.add_argument("--hedge", action="store_true",
+                       help="Send a duplicate search request when one has not started answering by the observed latency percentile")
+    parser.add_argument("--hedge-percentile", type=float, choices=[90, 95], default=DEFAULT_HEDGE_PERCENTILE,
+                       help=f"Time-to-first-chunk percentile that triggers a hedge (default: {DEFAULT_HEDGE_PERCENTILE})")
+    parser.add_argument("--hedge-max-rate", type=float, default=DEFAULT_MAX_HEDGE_RATE,
+                       help=f"Most searches that may be hedged, as a share of all searches (default: {DEFAULT_MAX_HEDGE_RATE})")
     add_language_args(parser)
     return parser.parse_args()
 
-def main():
-    print("\n🔬 Deep Research: Topic-by-Topic Data Collection")
+def prepare_topic_files(language: str, args) -> list:
+    """Topics for one language with their numbered CSV files and already-gathered URLs."""
+    language_config = get_language_config(language)
+    print(f"\n🌐 Language: {language_config['name']} ({language})")
 
-    args = parse_args()
-
-    language_config = get_language_config(args.language)
-    print(f"🌐 Language: {language_config['name']} ({args.language})")
-
-    topics = read_research_topics(args.language)
+    topics = read_research_topics(language)
     if not topics:
-        print(f"❌ No themes found for language {args.language}")
-        print(f"💡 Run 2_coding.py --language {args.language} first to identify themes")
-        return
+        print(f"❌ No themes found for language {language}")
+        print(f"💡 Run 2_coding.py --language {language} first to identify themes")
+        return []
 
     if args.list:
         show_available_themes(topics)
-        return
+        return []
 
     # Filter topics if specific ones were selected
     if args.themes:
@@ -646,22 +2232,16 @@ def main():
         topics = filter_topics_by_selection(topics, args.themes)
         if not topics:
             print("❌ No valid themes selected")
-            return
-    else:
+            return []
+
+    # Dedupe only across the themes this run searches
+    plan_topic_queries(topics, language)
+    if not args.themes:
         show_available_themes(topics)
         print(f"🚀 Processing all {len(topics)} themes (use --themes 1 2 3 to select specific ones)")
 
-    output_dir = ensure_folder_exists(3, 'gather', args.language)
-
-    print(f"🤖 Model: {MODEL_NAME}")
+    output_dir = ensure_folder_exists(3, 'gather', language)
     print(f"📁 Output directory: {output_dir}")
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Initialize narrative log
-    init_gather_log(topics)
-
-    print(f"🚀 Collecting data for {len(topics)} topics")
-    print(f"💾 Creating separate CSV file for each theme")
 
     # Prepare topic-CSV file mappings
     topic_files = []
@@ -672,7 +2252,7 @@ def main():
         else:
             theme_index = i
 
-        csv_file = f"{output_dir}/gathered_data-{theme_index}-{args.language}.csv"
+        csv_file = f"{output_dir}/gathered_data-{theme_index}-{language}.csv"
 
         # Load existing URLs for this specific CSV file
         topic_urls = load_existing_urls(csv_file)
@@ -681,30 +2261,101 @@ def main():
             'topic': topic,
             'csv_file': csv_file,
             'topic_urls': topic_urls,
-            'index': theme_index
+            'index': theme_index,
+            'language': language,
         })
 
         print(f"   📄 Theme {theme_index}: {csv_file}")
 
-    # Run topics in parallel
-    total_findings = 0
-    output_files = []
+    return topic_files
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-        future_to_data = {
-            executor.submit(gather_for_topic, data['topic'], data['csv_file'], data['topic_urls']): data
-            for data in topic_files
-        }
 
-        for future in concurrent.futures.as_completed(future_to_data):
-            data = future_to_data[future]
-            try:
-                findings, csv_file = future.result()
-                total_findings += findings
-                if csv_file not in output_files:
-                    output_files.append(csv_file)
-            except Exception as e:
-                print(f"❌ {data['topic']['name']} failed: {e}")
+def main():
+    print("\n🔬 Deep Research: Topic-by-Topic Data Collection")
+
+    args = parse_args()
+    hedger.configure(args.hedge, args.hedge_percentile, args.hedge_max_rate)
+    if args.worker:
+        # Tasks carry their topic, query and CSV path, so workers need no theme files
+        run_queue_worker(args)
+        return
+    if args.rescore_backlog:
+        run_rescore_backlog(args)
+        return
+    languages = resolve_languages(args.language)
+
+    # Every language's topics go into one scheduler and one shared worker pool
+    topic_files = []
+    for language in languages:
+        topic_files.extend(prepare_topic_files(language, args))
+    if not topic_files:
+        return
+
+    topics = [data['topic'] for data in topic_files]
+    output_dirs = [get_folder_name(3, 'gather', language) for language in languages]
+
+    print(f"\n🤖 Model: {MODEL_NAME}")
+    print(f"🚀 Collecting data for {len(topics)} topics across {len(languages)} language(s)")
+    print(f"💾 Creating separate CSV file for each theme")
+
+    if args.replay_from_audit:
+        print(f"⏪ Replaying {AUDIT_LOG_FILE} (no API calls)")
+        replay = replay_from_audit(topic_files, args.duplicate_policy, args.duplicate_threshold, not args.no_prefilter)
+        stats = replay['stats']
+        for data in topic_files:
+            print(f"   ✅ {data['topic']['name']}: {replay['findings'][data['csv_file']]} rows rebuilt")
+        print(f"\n✅ Replay complete: {stats['rows']} rows from {stats['searches']} logged searches")
+        print(f"   • Duplicate URLs skipped: {stats['duplicate_urls']}")
+        print(f"   • Near-duplicates dropped: {stats['near_duplicates']}")
+        print(f"   • Pre-filtered rejects scored locally: {stats['prefiltered']}")
+        if stats['missing_scores']:
+            print(f"   ⚠️ Results without a logged score (not written): {stats['missing_scores']}")
+        if stats['unmatched_scores']:
+            print(f"   ⚠️ Logged scores without a logged search result (not written): {stats['unmatched_scores']}")
+        return
+
+    if args.enqueue:
+        work_queue = WorkQueue(args.queue_db, lease_seconds=args.lease_seconds)
+        added = enqueue_gather_work(work_queue, topic_files, args.queries_per_topic)
+        print(f"\n📬 Queued {added['added']} searches ({added['existing']} already queued) in {os.path.abspath(args.queue_db)}")
+        print("💡 Start workers with: python 3_gather.py --worker")
+        return
+
+    # Initialize narrative log
+    init_gather_log(topics)
+
+    # Index existing content so reposted stories are caught across runs
+    duplicates = NearDuplicateIndex(args.duplicate_threshold)
+    seeded = seed_duplicate_index(duplicates, topic_files)
+    if seeded:
+        print(f"♻️ Indexed {seeded} existing rows for near-duplicate detection")
+
+    # Run the staged search -> score -> write pipeline across all topics
+    pipeline = GatherPipeline(
+        topic_files,
+        search_workers=args.search_workers,
+        score_workers=args.score_workers,
+        queue_size=args.queue_size,
+        queries_per_topic=args.queries_per_topic,
+        budget=BudgetPlanner(args.max_calls, args.max_tokens, args.deadline, args.search_workers),
+        saturation=YieldTracker(args.saturation_window, args.saturation_threshold),
+        duplicates=duplicates,
+        duplicate_policy=args.duplicate_policy,
+        prefilter=not args.no_prefilter,
+    )
+    findings_by_file = pipeline.run()
+
+    total_findings = sum(findings_by_file.values())
+    output_files = [csv_file for csv_file in findings_by_file if os.path.isfile(csv_file)]
+    for data in topic_files:
+        print(f"   ✅ {data['topic']['name']}: {findings_by_file[data['csv_file']]} findings")
+    pipeline.print_stage_report()
+    pipeline.print_coverage_report()
+    routing_stats.print_summary()
+    hedger.print_summary("search")
+    print_backlog_hint()
+    stage_report = pipeline.stage_report()
+    not_covered = {row['topic']: row['skipped'] for row in pipeline.coverage_report() if row['skipped']}
 
     print(f"\n✅ Collection complete: {total_findings} total findings")
     print(f"📁 Created {len(output_files)} CSV files:")
@@ -713,16 +2364,26 @@ def main():
     print("📄 Summary:")
     print(f"   • Topics processed: {len(topics)}")
     print(f"   • New findings appended: {total_findings}")
-    print(f"   • Output directory: {os.path.abspath(output_dir)}")
-    print(f"   • Audit log: {os.path.abspath(AUDIT_LOG_FILE)}")
+    for output_dir in output_dirs:
+        print(f"   • Output directory: {os.path.abspath(output_dir)}")
+    audit_log.close()
+    print(f"   • Audit log: {os.path.abspath(AUDIT_LOG_FILE)} (index: {os.path.abspath(audit_log.index_path)})")
     print(f"   • Narrative log: {os.path.abspath(GATHER_LOG_FILE)}")
     print(f"💡 Next step: Run analyze.py to process findings")
 
     finalize_gather_log({
         "Topics processed": len(topics),
         "Findings appended": total_findings,
-        "Output directory": os.path.abspath(output_dir),
+        "Output directory": ", ".join(os.path.abspath(output_dir) for output_dir in output_dirs),
         "CSV files created": len(output_files),
+        "Pipeline bottleneck": stage_report["bottleneck"],
+        "Stage metrics": json.dumps(stage_report["stages"]),
+        "Queries not covered": json.dumps(not_covered, ensure_ascii=False) if not_covered else "none",
+        "Searches saved by saturation": sum(pipeline.saturation_saved.values()),
+        "Near-duplicates": json.dumps(dict(pipeline.duplicate_stats, policy=args.duplicate_policy)),
+        "Scoring calls saved by pre-filter": pipeline.prefilter_stats.summary() if pipeline.prefilter else "disabled",
+        "Search hedging": json.dumps(hedger.summary("search")) if hedger.enabled else "disabled",
+        **(pipeline.budget.usage_summary() if pipeline.budget.enabled else {}),
     })
 
 if __name__ == "__main__":
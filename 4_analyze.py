@@ -1,17 +1,27 @@
 #!/usr/bin/env python3
 """
-Analysis Phase: Simple One-Shot Analysis per Theme
-Processes each gathered data file separately with comprehensive analysis
+Analysis Phase: Comprehensive Analysis per Theme
+Processes each gathered data file separately with comprehensive analysis.
+Large files are analyzed hierarchically (parallel per-chunk notes, then a merge pass).
 """
 
 import os
 import csv
 import time
 import re
+import json
 import argparse
+import concurrent.futures
 from pathlib import Path
 from google import genai
-from language_config import add_language_args, get_language_config, format_filename, get_output_instruction
+from language_config import add_language_args, get_language_config, format_filename, get_output_instruction, resolve_languages
+from streaming import stream_generate, discard_partial
+from worker_pool import rate_limited, run_languages
+from context_cache import client_http_options
+from model_routing import model_for
+from quant_stats import stats_for_file, format_stats
+from bm25_index import load_index_for
+from prescore import row_score_status, STATUS_PREFILTERED, STATUS_PROVISIONAL
 
 # Load environment variables
 try:
@@ -23,96 +33,29 @@ except ImportError:
 # --- Configuration ---
 try:
     api_key = os.environ["GOOGLE_API_KEY"]
-    client = genai.Client(api_key=api_key)
+    client = rate_limited(genai.Client(api_key=api_key, http_options=client_http_options()))
 except KeyError:
     print("Error: GOOGLE_API_KEY environment variable not set.")
     exit()
 
-MODEL_NAME = os.environ.get("GEMINI_MODEL", "gemini-2.5-pro")
+MODEL_NAME = model_for("analysis")
 
-def find_gather_files(language='en'):
-    """Find all CSV files in findings/gather/ directory for specified language"""
-    gather_dir = Path(f"findings/3_gather-{language}")
-    if not gather_dir.exists():
-        print(f"❌ findings/3_gather-{language}/ directory not found")
-        return []
-
-    # Look for files with language suffix: gathered_data-1-en.csv, gathered_data-2-es.csv etc.
-    pattern = f"gathered_data-*-{language}.csv"
-    csv_files = list(gather_dir.glob(pattern))
-
-    # Fallback to files without language suffix if none found
-    if not csv_files:
-        pattern = "gathered_data-*.csv"
-        csv_files = list(gather_dir.glob(pattern))
-        # Filter out files that have language suffixes for other languages
-        csv_files = [f for f in csv_files if not any(f.name.endswith(f"-{lang}.csv") for lang in ['en', 'es'] if lang != language)]
+# Stream report generations into <report>.partial as they arrive (disable with --no-stream)
+STREAM_RESPONSES = True
 
-    return sorted(csv_files)
+# Hierarchical (map-reduce) analysis defaults
+DEFAULT_MAX_PROMPT_CHARS = 400_000  # ~100k tokens; larger datasets switch to map-reduce in auto mode
+DEFAULT_CHUNK_ROWS = 60
+DEFAULT_CHUNK_CHARS = 120_000
+DEFAULT_WORKERS = 4
+DEFAULT_DIMENSION_ROWS = 40  # rows retrieved per dimension in sharded mode
 
-def extract_theme_name(filename):
-    """Extract theme identifier from filename"""
-    # gathered_data-1.csv -> "theme-1"
-    # gathered_data-2-3.csv -> "theme-2-3"
-    match = re.search(r'gathered_data-(.+)\.csv', filename)
-    if match:
-        return f"theme-{match.group(1)}"
-    return filename.stem
+# Evidence selection defaults (token budget is opt-in via --token-budget)
+CHARS_PER_TOKEN = 4
+DEFAULT_MIN_RESEARCH_VALUE = 2
+DIVERSITY_PENALTY = 0.5
 
-def load_csv_data(csv_file):
-    """Load and format CSV data for analysis"""
-    data_entries = []
-
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader, 1):
-            # Format each row for analysis
-            entry = f"""
-Row {i}:
-Topic: {row.get('topic', 'N/A')}
-Query: {row.get('query', 'N/A')}
-URL: {row.get('url', 'N/A')}
-Title: {row.get('title', 'N/A')}
-Content: {row.get('content', 'N/A')}
-Comments Summary: {row.get('comments_summary', 'N/A')}
-Source: {row.get('source', 'N/A')}
-Research Value: {row.get('research_value', 'N/A')}
-Emotional Tone: {row.get('emotional_tone', 'N/A')}
-Key Insights: {row.get('key_insights', 'N/A')}
----"""
-            data_entries.append(entry)
-
-    return "\n".join(data_entries)
-
-def analyze_theme_data(csv_file, theme_name, language='en'):
-    """Analyze a single theme's data with comprehensive analysis"""
-    print(f"\n📊 Analyzing {csv_file.name}...")
-    print(f"🎯 Theme: {theme_name}")
-    print(f"🌐 Language: {get_language_config(language)['name']}")
-
-    # Load the CSV data
-    formatted_data = load_csv_data(csv_file)
-
-    if not formatted_data:
-        print(f"⚠️ No data found in {csv_file}")
-        return None
-
-    # Get language-specific instructions
-    output_instruction = get_output_instruction(language)
-    language_config = get_language_config(language)
-
-    # Create comprehensive analysis prompt
-    analysis_prompt = f"""
-You are a research analyst specializing in qualitative analysis of personal experiences and user journeys. You have extensive expertise in thematic analysis, emotional intelligence, and extracting actionable insights from personal narratives.
-
-**LANGUAGE INSTRUCTION:** {output_instruction}
-
-**IMPORTANT:** This analysis focuses on {language_config['name']}-language sources, so acknowledge any language/cultural bias in your findings. Start your analysis with a note about this limitation.
-
-**ANALYSIS TASK:**
-Analyze the attached fertility journey data to extract deep insights about user experiences, pain points, and unmet needs. Focus on patterns that could inform product development, support services, or policy recommendations.
-
-**ANALYSIS FRAMEWORK - Apply these 6 dimensions:**
+ANALYSIS_FRAMEWORK = """**ANALYSIS FRAMEWORK - Apply these 6 dimensions:**
 
 1. **EMOTIONAL LANDSCAPE**
    - Identify primary emotions and their intensity throughout journeys
@@ -148,9 +91,30 @@ Analyze the attached fertility journey data to extract deep insights about user
    - Analyze needs by journey stage (early, mid, late, post-treatment)
    - Identify stage-specific vulnerabilities
    - Note transition challenges between stages
-   - Highlight successful progression strategies
-
-**BEST PRACTICES FOR ANALYSIS:**
+   - Highlight successful progression strategies"""
+
+# Retrieval query per framework dimension, in ANALYSIS_FRAMEWORK order
+DIMENSION_QUERIES = [
+    "emotion feel feeling grief hope despair anxiety fear cope coping resilience depression sad stress heartbreak",
+    "cost price money insurance pay afford time wait logistics appointment travel work job strategy resource",
+    "information research advice explain decision choose option confusing learn read google forum trust",
+    "partner husband wife family friend support community isolation alone relationship marriage group",
+    "clinic doctor insurance coverage hospital provider referral system access waitlist policy inequity",
+    "start beginning diagnosis treatment cycle transfer retrieval after success pregnancy stop stage next",
+]
+
+# Section markers each dimension call must use, mapped onto the report's OUTPUT_STRUCTURE
+DIMENSION_SECTIONS = [
+    ("KEY FINDING", "Executive Summary"),
+    ("FINDINGS", "Major Themes"),
+    ("PAIN POINTS", "Critical Pain Points"),
+    ("UNMET NEEDS", "Unmet Needs"),
+    ("SUCCESS FACTORS", "Success Factors"),
+    ("RECOMMENDATIONS", "Recommendations"),
+    ("NOTABLE QUOTES", "Notable Quotes"),
+]
+
+ANALYSIS_BEST_PRACTICES = """**BEST PRACTICES FOR ANALYSIS:**
 
 **Credibility Assessment:**
 - Weight insights by specificity and detail level
@@ -174,9 +138,9 @@ Analyze the attached fertility journey data to extract deep insights about user
 - Consider cultural, geographic, and demographic contexts
 - Account for healthcare system variations
 - Note temporal factors (policy changes, treatment evolution)
-- Recognize intersectional experiences
+- Recognize intersectional experiences"""
 
-**OUTPUT STRUCTURE:**
+OUTPUT_STRUCTURE = """**OUTPUT STRUCTURE:**
 Organize your analysis into:
 1. **Executive Summary** (key findings in 3-5 bullet points)
 2. **Major Themes** (5-7 primary patterns with supporting evidence)
@@ -184,15 +148,216 @@ Organize your analysis into:
 4. **Unmet Needs** (gaps in current support/services)
 5. **Success Factors** (what works well for positive outcomes)
 6. **Recommendations** (3-5 actionable insights for stakeholders)
-7. **Notable Quotes** (powerful representative statements)
+7. **Notable Quotes** (powerful representative statements)"""
 
-**ANALYTICAL RIGOR:**
+ANALYTICAL_RIGOR = """**ANALYTICAL RIGOR:**
 - Support each finding with specific examples
-- Quantify patterns where possible ("mentioned in X% of posts")
+- Take score, tone, source and keyword figures from the QUANTITATIVE SUMMARY exactly as given - do not estimate them
+- Quantify other patterns by counting the rows that show them ("7 of 40 rows"), not by guessing percentages
 - Distinguish between correlation and causation
 - Acknowledge limitations and potential biases
-- Highlight unexpected or counterintuitive findings
+- Highlight unexpected or counterintuitive findings"""
+
+def find_gather_files(language='en'):
+    """Find all CSV files in findings/gather/ directory for specified language"""
+    gather_dir = Path(f"findings/3_gather-{language}")
+    if not gather_dir.exists():
+        print(f"❌ findings/3_gather-{language}/ directory not found")
+        return []
+
+    # Look for files with language suffix: gathered_data-1-en.csv, gathered_data-2-es.csv etc.
+    pattern = f"gathered_data-*-{language}.csv"
+    csv_files = list(gather_dir.glob(pattern))
+
+    # Fallback to files without language suffix if none found
+    if not csv_files:
+        pattern = "gathered_data-*.csv"
+        csv_files = list(gather_dir.glob(pattern))
+        # Filter out files that have language suffixes for other languages
+        csv_files = [f for f in csv_files if not any(f.name.endswith(f"-{lang}.csv") for lang in ['en', 'es'] if lang != language)]
+
+    return sorted(csv_files)
+
+def extract_theme_name(filename):
+    """Extract theme identifier from filename"""
+    # gathered_data-1.csv -> "theme-1"
+    # gathered_data-2-3.csv -> "theme-2-3"
+    match = re.search(r'gathered_data-(.+)\.csv', filename)
+    if match:
+        return f"theme-{match.group(1)}"
+    return filename.stem
 
+def load_csv_rows(csv_file):
+    """Load CSV rows paired with their 1-based row numbers"""
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        return list(enumerate(reader, 1))
+
+def format_row(row_number, row):
+    """Format a single CSV row for analysis, keeping its original row number"""
+    return f"""
+Row {row_number}:
+Topic: {row.get('topic', 'N/A')}
+Query: {row.get('query', 'N/A')}
+URL: {row.get('url', 'N/A')}
+Title: {row.get('title', 'N/A')}
+Content: {row.get('content', 'N/A')}
+Comments Summary: {row.get('comments_summary', 'N/A')}
+Source: {row.get('source', 'N/A')}
+Research Value: {row.get('research_value', 'N/A')}
+Emotional Tone: {row.get('emotional_tone', 'N/A')}
+Key Insights: {row.get('key_insights', 'N/A')}
+---"""
+
+def format_rows(rows):
+    """Format (row_number, row) pairs into the prompt data block"""
+    return "\n".join(format_row(row_number, row) for row_number, row in rows)
+
+def load_csv_data(csv_file):
+    """Load and format CSV data for analysis"""
+    return format_rows(load_csv_rows(csv_file))
+
+def estimate_tokens(text):
+    """Rough token estimate used for prompt budgeting"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def _to_number(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def has_default_scores(row):
+    """True for rows whose scores came from a scoring timeout or parse error"""
+    return row_score_status(row) == STATUS_PROVISIONAL
+
+def evidence_priority(row):
+    """Rank a row by research value, detail level and first-person storytelling"""
+    if has_default_scores(row):
+        return 0.0
+    personal = str(row.get('personal_story', '')).strip().lower() == 'true'
+    return (
+        2 * _to_number(row.get('research_value'), 3)
+        + _to_number(row.get('detail_level'), 3)
+        + (1.5 if personal else 0.0)
+    )
+
+def select_evidence(rows, token_budget, min_research_value=DEFAULT_MIN_RESEARCH_VALUE):
+    """Pick the highest-value, most diverse rows that fit in the token budget
+
+    Returns (selected_rows, manifest). Selected rows keep their original row numbers
+    and CSV order so Row N citations still point at the source file.
+    """
+    excluded = []
+    candidates = []
+    for row_number, row in rows:
+        if not has_default_scores(row) and _to_number(row.get('research_value'), 3) < min_research_value:
+            excluded.append({'row': row_number, 'reason': f"research_value < {min_research_value}"})
+            continue
+        candidates.append({
+            'row_number': row_number,
+            'row': row,
+            'priority': evidence_priority(row),
+            'tokens': estimate_tokens(format_row(row_number, row)),
+        })
+
+    # Greedy pick: each step takes the best remaining row after penalising
+    # sources and emotional tones that are already well represented
+    source_counts = {}
+    tone_counts = {}
+    selected = []
+    used_tokens = 0
+    remaining = candidates
+
+    while remaining:
+        best = max(
+            remaining,
+            key=lambda c: c['priority'] - DIVERSITY_PENALTY * (
+                source_counts.get(c['row'].get('source', ''), 0)
+                + tone_counts.get(c['row'].get('emotional_tone', ''), 0)
+            )
+        )
+        remaining = [c for c in remaining if c is not best]
+
+        if used_tokens + best['tokens'] > token_budget:
+            excluded.append({'row': best['row_number'], 'reason': 'token budget'})
+            continue
+
+        selected.append(best)
+        used_tokens += best['tokens']
+        source = best['row'].get('source', '')
+        tone = best['row'].get('emotional_tone', '')
+        source_counts[source] = source_counts.get(source, 0) + 1
+        tone_counts[tone] = tone_counts.get(tone, 0) + 1
+
+    selected.sort(key=lambda c: c['row_number'])
+    manifest = {
+        'token_budget': token_budget,
+        'estimated_tokens': used_tokens,
+        'min_research_value': min_research_value,
+        'total_rows': len(rows),
+        'included_rows': [c['row_number'] for c in selected],
+        'excluded_rows': sorted(excluded, key=lambda e: e['row']),
+        'sources': source_counts,
+        'emotional_tones': tone_counts,
+    }
+    return [(c['row_number'], c['row']) for c in selected], manifest
+
+def chunk_rows(rows, max_rows=DEFAULT_CHUNK_ROWS, max_chars=DEFAULT_CHUNK_CHARS):
+    """Split rows into chunks bounded by row count and formatted size"""
+    chunks = []
+    current = []
+    current_chars = 0
+
+    for row_number, row in rows:
+        row_chars = len(format_row(row_number, row))
+        if current and (len(current) >= max_rows or current_chars + row_chars > max_chars):
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append((row_number, row))
+        current_chars += row_chars
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+def build_stats_section(stats_block):
+    """Prompt section with the locally computed stats, or nothing if there are none"""
+    if not stats_block:
+        return ""
+    return f"""**QUANTITATIVE SUMMARY (computed exactly over every gathered row for this theme):**
+{stats_block}
+"""
+
+def build_analysis_instructions(language='en'):
+    """Fixed instruction block of the one-shot prompt; identical for every theme"""
+    output_instruction = get_output_instruction(language)
+    language_config = get_language_config(language)
+
+    return f"""
+You are a research analyst specializing in qualitative analysis of personal experiences and user journeys. You have extensive expertise in thematic analysis, emotional intelligence, and extracting actionable insights from personal narratives.
+
+**LANGUAGE INSTRUCTION:** {output_instruction}
+
+**IMPORTANT:** This analysis focuses on {language_config['name']}-language sources, so acknowledge any language/cultural bias in your findings. Start your analysis with a note about this limitation.
+
+**ANALYSIS TASK:**
+Analyze the attached fertility journey data to extract deep insights about user experiences, pain points, and unmet needs. Focus on patterns that could inform product development, support services, or policy recommendations.
+
+{ANALYSIS_FRAMEWORK}
+
+{ANALYSIS_BEST_PRACTICES}
+
+{OUTPUT_STRUCTURE}
+
+{ANALYTICAL_RIGOR}
+"""
+
+def build_single_pass_prompt(formatted_data, language='en', stats_block=None):
+    """Build the one-shot analysis prompt over the full formatted dataset"""
+    return build_analysis_instructions(language) + f"""
+{build_stats_section(stats_block)}
 Focus on insights that would be valuable to healthcare providers, policymakers, support organizations, or technology developers working in reproductive health.
 
 **DATA TO ANALYZE:**
@@ -201,28 +366,467 @@ Focus on insights that would be valuable to healthcare providers, policymakers,
 **IMPORTANT:** Reference specific row numbers (Row 1, Row 15, etc.) when citing examples from the data.
 """
 
-    print(f"🤖 Sending to Gemini for analysis...")
+def build_chunk_prompt(formatted_chunk, chunk_index, total_chunks, row_count, language='en'):
+    """Build the map-phase prompt for one chunk of rows"""
+    output_instruction = get_output_instruction(language)
+
+    return f"""
+You are a research analyst performing the first pass of a multi-part qualitative analysis of fertility journey data. This is chunk {chunk_index} of {total_chunks}; other analysts are covering the remaining rows, and your notes will be merged into one report.
+
+**LANGUAGE INSTRUCTION:** {output_instruction}
+
+{ANALYSIS_FRAMEWORK}
+
+**PARTIAL ANALYSIS TASK:**
+For each of the 6 dimensions, write concise findings notes for THIS chunk only:
+- State each pattern and how many of the {row_count} rows in this chunk show it (e.g. "7 of {row_count} rows")
+- Cite supporting rows using their exact row numbers as given (Row 212, Row 240, etc.) - do NOT renumber rows
+- Note pain points, unmet needs and success factors with their supporting rows
+- Copy up to 5 powerful verbatim quotes, each tagged with its row number
+
+Do not write an executive summary or recommendations - only evidence-backed notes per dimension.
+
+**DATA CHUNK {chunk_index}/{total_chunks}:**
+{formatted_chunk}
+"""
+
+def build_reduce_prompt(partial_analyses, total_rows, language='en', stats_block=None):
+    """Build the reduce-phase prompt that merges chunk notes into the standard report"""
+    output_instruction = get_output_instruction(language)
+    language_config = get_language_config(language)
+
+    partial_sections = "\n\n".join(
+        f"### Partial Analysis {index} (rows {first_row}-{last_row}, {row_count} rows)\n{text}"
+        for index, (first_row, last_row, row_count, text) in enumerate(partial_analyses, 1)
+    )
+
+    return f"""
+You are a research analyst specializing in qualitative analysis of personal experiences and user journeys. Below are partial analyses of {total_rows} rows of fertility journey data, each covering a different chunk of rows. Merge them into a single comprehensive report.
+
+**LANGUAGE INSTRUCTION:** {output_instruction}
+
+**IMPORTANT:** This analysis focuses on {language_config['name']}-language sources, so acknowledge any language/cultural bias in your findings. Start your analysis with a note about this limitation.
+
+{ANALYSIS_FRAMEWORK}
+
+**MERGING RULES:**
+- Combine overlapping patterns across chunks and sum their row counts before quantifying against the {total_rows} total rows
+- Keep row citations exactly as they appear in the partial analyses (Row 15, Row 212, etc.) - they refer to the original dataset
+- Preserve minority patterns that appear in only one chunk and flag them as such
+- Do not invent evidence that is not present in the partial analyses
+
+{OUTPUT_STRUCTURE}
+
+{ANALYTICAL_RIGOR}
+
+{build_stats_section(stats_block)}
+**PARTIAL ANALYSES:**
+{partial_sections}
+"""
+
+def generate_analysis(prompt, label, output_path=None):
+    """Send a single analysis prompt to Gemini and return the text
+
+    When output_path is given the response is streamed into output_path.partial,
+    so an interrupted call can resume on the next run.
+    """
+    print(f"🤖 Sending to Gemini for {label}...")
 
     try:
+        if output_path and STREAM_RESPONSES:
+            return stream_generate(client, MODEL_NAME, prompt, output_path, label)
+
         response = client.models.generate_content(
             model=MODEL_NAME,
-            contents=analysis_prompt
+            contents=prompt
         )
-
-        print(f"✅ Analysis completed successfully")
         return response.text
 
     except Exception as e:
-        print(f"❌ Analysis failed: {e}")
+        print(f"❌ {label.capitalize()} failed: {e}")
+        return None
+
+def analyze_chunk(chunk, chunk_index, total_chunks, language='en'):
+    """Run the map-phase analysis for one chunk of rows"""
+    first_row = chunk[0][0]
+    last_row = chunk[-1][0]
+    prompt = build_chunk_prompt(format_rows(chunk), chunk_index, total_chunks, len(chunk), language)
+    text = generate_analysis(prompt, f"chunk {chunk_index}/{total_chunks} (rows {first_row}-{last_row})")
+    return first_row, last_row, len(chunk), text
+
+def map_chunks(rows, language='en', chunk_rows_limit=DEFAULT_CHUNK_ROWS,
+               chunk_chars=DEFAULT_CHUNK_CHARS, max_workers=DEFAULT_WORKERS):
+    """Run per-chunk partial analyses in parallel; returns partials in row order or None"""
+    chunks = chunk_rows(rows, chunk_rows_limit, chunk_chars)
+    print(f"🧩 Hierarchical mode: {len(rows)} rows split into {len(chunks)} chunks")
+
+    partials = [None] * len(chunks)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_index = {
+            executor.submit(analyze_chunk, chunk, index + 1, len(chunks), language): index
+            for index, chunk in enumerate(chunks)
+        }
+        for future in concurrent.futures.as_completed(future_to_index):
+            index = future_to_index[future]
+            partials[index] = future.result()
+            print(f"   ✅ Chunk {index + 1}/{len(chunks)} done")
+
+    failed = [p for p in partials if not p[3]]
+    if failed:
+        print(f"❌ {len(failed)}/{len(chunks)} chunks failed - skipping merge")
+        return None
+    return partials
+
+def analyze_hierarchical(rows, language='en', chunk_rows_limit=DEFAULT_CHUNK_ROWS,
+                         chunk_chars=DEFAULT_CHUNK_CHARS, max_workers=DEFAULT_WORKERS, output_path=None,
+                         stats_block=None):
+    """Map-reduce analysis: parallel per-chunk notes, then one merge pass"""
+    partials = map_chunks(rows, language, chunk_rows_limit, chunk_chars, max_workers)
+    if not partials:
+        return None
+    return generate_analysis(build_reduce_prompt(partials, len(rows), language, stats_block), "merge pass", output_path)
+
+def framework_dimensions():
+    """(title, framework text) for each of the 6 dimensions in ANALYSIS_FRAMEWORK"""
+    sections = re.split(r'\n\n(?=\d+\. \*\*)', ANALYSIS_FRAMEWORK)[1:]
+    return [(re.search(r'\*\*(.+?)\*\*', section).group(1).title(), section.strip()) for section in sections]
+
+def build_dimension_prompt(dimension_text, formatted_rows, row_count, total_rows, language='en', stats_block=None):
+    """Build the prompt for one dimension of a sharded analysis"""
+    output_instruction = get_output_instruction(language)
+    markers = "\n".join(f"### {marker}" for marker, _ in DIMENSION_SECTIONS)
+
+    return f"""
+You are a research analyst specializing in qualitative analysis of fertility journey data. You are analyzing ONE dimension of a larger report; other analysts cover the other dimensions in parallel.
+
+**LANGUAGE INSTRUCTION:** {output_instruction}
+
+**YOUR DIMENSION:**
+{dimension_text}
+
+The {row_count} rows below were retrieved from {total_rows} gathered rows as the most relevant to this dimension.
+
+**OUTPUT FORMAT:** Use exactly these section markers, in English and in this order, even if you write in another language:
+{markers}
+
+- KEY FINDING: one bullet with the single most important finding for this dimension
+- FINDINGS: 2-4 patterns with supporting evidence, each with how many of the {row_count} rows show it
+- PAIN POINTS, UNMET NEEDS, SUCCESS FACTORS, RECOMMENDATIONS: bullets for this dimension only (write "None found" if the rows show none)
+- NOTABLE QUOTES: up to 3 verbatim quotes, each tagged with its row number
+- Cite rows by their exact row numbers as given (Row 12, Row 87) - do NOT renumber rows
+- Do not add a title, a language note or an introduction
+
+{build_stats_section(stats_block)}
+**DATA:**
+{formatted_rows}
+"""
+
+def split_dimension_sections(text):
+    """Map each section marker to its text; anything unmarked counts as findings"""
+    names = "|".join(re.escape(marker) for marker, _ in DIMENSION_SECTIONS)
+    parts = re.split(rf'^\s*#+\s*({names})\s*:?\s*$', text, flags=re.IGNORECASE | re.MULTILINE)
+    sections = {marker: "" for marker, _ in DIMENSION_SECTIONS}
+    sections["FINDINGS"] = parts[0].strip()
+    for marker, body in zip(parts[1::2], parts[2::2]):
+        key = marker.upper()
+        sections[key] = (sections[key] + "\n\n" + body.strip()).strip()
+    return sections
+
+def merge_dimension_reports(dimension_results, language='en'):
+    """Assemble per-dimension outputs into the standard report structure without a model call"""
+    language_config = get_language_config(language)
+    parsed = [(title, split_dimension_sections(text)) for title, _, text in dimension_results]
+
+    report = [f"> **Language note:** This analysis covers {language_config['name']}-language sources only, so findings may carry language and cultural bias."]
+    for index, (marker, heading) in enumerate(DIMENSION_SECTIONS, 1):
+        report.append(f"\n## {index}. {heading}\n")
+        for title, sections in parsed:
+            body = sections[marker] or "None found"
+            if marker == "KEY FINDING":
+                report.append(f"**{title}:** {body.lstrip('-* ').strip()}\n")
+            else:
+                report.append(f"### {title}\n\n{body}\n")
+    return "\n".join(report)
+
+def analyze_dimension(csv_file, index, rows, dimension, query, dimension_rows, language='en', stats_block=None):
+    """Retrieve one dimension's rows and run its analysis call"""
+    title, dimension_text = dimension
+    selected = index.top_rows(query, rows, dimension_rows, csv_file)
+    if not selected:
+        # Nothing matched the query: fall back to the highest-value rows
+        selected = sorted(rows, key=lambda pair: evidence_priority(pair[1]), reverse=True)[:dimension_rows]
+    selected.sort(key=lambda pair: pair[0])
+    prompt = build_dimension_prompt(dimension_text, format_rows(selected), len(selected), len(rows), language, stats_block)
+    text = generate_analysis(prompt, f"dimension '{title}' ({len(selected)} rows)")
+    return title, [row_number for row_number, _ in selected], text
+
+def analyze_sharded(csv_file, rows, language='en', dimension_rows=DEFAULT_DIMENSION_ROWS,
+                    max_workers=DEFAULT_WORKERS, stats_block=None):
+    """One retrieval-scoped call per dimension in parallel, merged locally
+
+    Returns (report_text, {dimension: row numbers}) or None if any dimension failed.
+    """
+    index = load_index_for(csv_file, [row for _, row in rows])
+    dimensions = framework_dimensions()
+    print(f"🧩 Sharded mode: {len(dimensions)} dimensions, up to {dimension_rows} retrieved rows each")
+
+    start = time.perf_counter()
+    results = [None] * len(dimensions)
+    # Every dimension runs at once so wall time is the slowest dimension; the shared rate limiter still applies
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(max_workers, len(dimensions))) as executor:
+        future_to_index = {
+            executor.submit(analyze_dimension, csv_file, index, rows, dimension, query,
+                            dimension_rows, language, stats_block): position
+            for position, (dimension, query) in enumerate(zip(dimensions, DIMENSION_QUERIES))
+        }
+        for future in concurrent.futures.as_completed(future_to_index):
+            position = future_to_index[future]
+            results[position] = future.result()
+            print(f"   ✅ {results[position][0]} done after {time.perf_counter() - start:.1f}s")
+
+    failed = [title for title, _, text in results if not text]
+    if failed:
+        print(f"❌ {len(failed)}/{len(dimensions)} dimensions failed ({', '.join(failed)}) - skipping merge")
+        return None
+    return merge_dimension_reports(results, language), {title: row_numbers for title, row_numbers, _ in results}
+
+def build_update_prompt(existing_report, new_evidence, new_row_count, covered_row_count, language='en',
+                        evidence_is_notes=False, stats_block=None):
+    """Build the delta prompt that folds newly gathered rows into an existing report"""
+    output_instruction = get_output_instruction(language)
+    evidence_label = "PARTIAL ANALYSES OF NEW ROWS" if evidence_is_notes else "NEW DATA TO INTEGRATE"
+
+    return f"""
+You are a research analyst maintaining a living qualitative analysis of fertility journey data. The existing report below already covers {covered_row_count} rows. {new_row_count} new rows have been gathered since it was written. Update the report to reflect them.
+
+**LANGUAGE INSTRUCTION:** {output_instruction}
+
+**UPDATE RULES:**
+- Keep the existing report structure, language note and all existing row citations unchanged unless the new data contradicts them
+- Integrate new evidence into the relevant sections, citing the new rows by their exact row numbers as given
+- Re-quantify patterns against the combined total of {covered_row_count + new_row_count} rows
+- Replace any score, tone, source or keyword figures with the QUANTITATIVE SUMMARY values below
+- Add new themes, pain points or quotes only when the new rows genuinely support them
+- Return the complete updated report, not just the changes
+
+{OUTPUT_STRUCTURE}
+
+{build_stats_section(stats_block)}
+**EXISTING REPORT:**
+{existing_report}
+
+**{evidence_label}:**
+{new_evidence}
+"""
+
+def prepare_evidence(csv_file, rows, token_budget=None, min_research_value=DEFAULT_MIN_RESEARCH_VALUE):
+    """Apply optional evidence selection and build the report manifest
+
+    Rows the gather pre-filter rejected without a model score are always left out.
+    """
+    total_rows = len(rows)
+    prefiltered = [{'row': row_number, 'reason': 'pre-filtered'} for row_number, row in rows
+                   if row_score_status(row) == STATUS_PREFILTERED]
+    if prefiltered:
+        rows = [(row_number, row) for row_number, row in rows if row_score_status(row) != STATUS_PREFILTERED]
+    if token_budget:
+        selected, manifest = select_evidence(rows, token_budget, min_research_value)
+        print(f"🎯 Evidence selection: {len(selected)}/{manifest['total_rows']} rows "
+              f"(~{manifest['estimated_tokens']:,} of {token_budget:,} tokens)")
+    else:
+        selected = rows
+        manifest = {
+            'token_budget': None,
+            'estimated_tokens': estimate_tokens(format_rows(rows)),
+            'total_rows': len(rows),
+            'included_rows': [row_number for row_number, _ in rows],
+            'excluded_rows': [],
+        }
+    manifest['total_rows'] = total_rows
+    manifest['excluded_rows'] = sorted(prefiltered + manifest['excluded_rows'], key=lambda e: e['row'])
+    manifest['csv_file'] = str(csv_file)
+    return selected, manifest
+
+def compute_stats(csv_file, keywords=None, language='en'):
+    """Exact per-theme numbers for the report, or None if the CSV can't be read"""
+    start = time.perf_counter()
+    try:
+        stats = stats_for_file(csv_file, keywords, language)
+    except Exception as e:
+        print(f"⚠️ Could not compute stats for {csv_file}: {e}")
+        return None
+    print(f"📈 Computed stats over {stats['rows']} rows in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return stats
+
+def row_key(row):
+    """Identity of a gathered row for delta tracking"""
+    return [row.get('url', ''), row.get('timestamp', '')]
+
+def analyze_theme_data(csv_file, theme_name, language='en', mode='auto',
+                       chunk_rows_limit=DEFAULT_CHUNK_ROWS, chunk_chars=DEFAULT_CHUNK_CHARS,
+                       max_prompt_chars=DEFAULT_MAX_PROMPT_CHARS, max_workers=DEFAULT_WORKERS,
+                       token_budget=None, min_research_value=DEFAULT_MIN_RESEARCH_VALUE, keywords=None,
+                       dimension_rows=DEFAULT_DIMENSION_ROWS):
+    """Analyze a single theme's data with comprehensive analysis
+
+    Returns (analysis_text, analysis_type, manifest) or None on failure.
+    """
+    print(f"\n📊 Analyzing {csv_file.name}...")
+    print(f"🎯 Theme: {theme_name}")
+    print(f"🌐 Language: {get_language_config(language)['name']}")
+
+    # Load the CSV data
+    all_rows = load_csv_rows(csv_file)
+
+    if not all_rows:
+        print(f"⚠️ No data found in {csv_file}")
         return None
 
-def save_analysis(analysis_text, theme_name, language='en'):
-    """Save analysis to markdown file with language tag"""
+    rows, manifest = prepare_evidence(csv_file, all_rows, token_budget, min_research_value)
+    if not rows:
+        print(f"⚠️ No rows fit the evidence budget for {csv_file}")
+        return None
+
+    formatted_data = format_rows(rows)
+    output_path = report_path(theme_name, language)
+    stats = compute_stats(csv_file, keywords, language)
+    stats_block = format_stats(stats) if stats else None
+
+    dimension_rows_used = None
+    if mode == 'sharded':
+        analysis_type = "Dimension-Sharded Analysis"
+        sharded = analyze_sharded(csv_file, rows, language, dimension_rows, max_workers, stats_block)
+        analysis, dimension_rows_used = sharded if sharded else (None, None)
+    # Fall back to map-reduce when the dataset would not fit in one prompt
+    elif mode == 'hierarchical' or (mode == 'auto' and len(formatted_data) > max_prompt_chars):
+        analysis_type = "Hierarchical Map-Reduce Analysis"
+        analysis = analyze_hierarchical(rows, language, chunk_rows_limit, chunk_chars, max_workers, output_path, stats_block)
+    else:
+        analysis_type = "Comprehensive One-Shot Analysis"
+        analysis = generate_analysis(build_single_pass_prompt(formatted_data, language, stats_block), "analysis", output_path)
+
+    if not analysis:
+        return None
+
+    print(f"✅ Analysis completed successfully")
+    manifest['analysis_type'] = analysis_type
+    manifest['covered_rows'] = [row_key(row) for _, row in all_rows]
+    manifest['stats'] = stats
+    if dimension_rows_used:
+        manifest['dimension_rows'] = dimension_rows_used
+    return analysis, analysis_type, manifest
+
+def load_previous_analysis(theme_name, language='en'):
+    """Load a saved report body and its manifest, if the report supports delta updates"""
+    report_file = report_path(theme_name, language)
+    manifest_file = report_path(theme_name, language, 'manifest.json')
+
+    if not report_file.exists() or not manifest_file.exists():
+        return None
+
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        with open(report_file, 'r', encoding='utf-8') as f:
+            report = f.read()
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Could not load previous analysis for {theme_name}: {e}")
+        return None
+
+    # Manifests written before delta tracking don't record covered rows
+    if 'covered_rows' not in manifest:
+        return None
+
+    # Strip the metadata header written by save_analysis
+    _, separator, body = report.partition("\n---\n\n")
+    return (body if separator else report), manifest
+
+def find_new_rows(rows, manifest):
+    """Rows whose (url, timestamp) is not covered by the previous report"""
+    covered = {tuple(key) for key in manifest.get('covered_rows', [])}
+    return [(row_number, row) for row_number, row in rows if tuple(row_key(row)) not in covered]
+
+def analyze_theme_delta(csv_file, theme_name, previous_report, previous_manifest, new_rows, all_rows,
+                        language='en', mode='auto',
+                        chunk_rows_limit=DEFAULT_CHUNK_ROWS, chunk_chars=DEFAULT_CHUNK_CHARS,
+                        max_prompt_chars=DEFAULT_MAX_PROMPT_CHARS, max_workers=DEFAULT_WORKERS,
+                        token_budget=None, min_research_value=DEFAULT_MIN_RESEARCH_VALUE, keywords=None,
+                        dimension_rows=DEFAULT_DIMENSION_ROWS):
+    """Fold rows added since the last run into the existing report with one update call
+
+    Sharded reports are updated the same way: the new rows are few, so one
+    update call is cheaper than rerunning every dimension.
+
+    Returns (analysis_text, analysis_type, manifest) or None on failure.
+    """
+    print(f"\n🔁 Updating {csv_file.name}: {len(new_rows)} new rows since last analysis")
+
+    rows, delta_manifest = prepare_evidence(csv_file, new_rows, token_budget, min_research_value)
+    covered_count = len(previous_manifest.get('covered_rows', []))
+    formatted_new = format_rows(rows)
+    stats = compute_stats(csv_file, keywords, language)
+    stats_block = format_stats(stats) if stats else None
+
+    if not rows:
+        # Nothing worth sending, but the rows are now accounted for
+        analysis = previous_report
+    elif mode == 'hierarchical' or (mode in ('auto', 'sharded') and len(formatted_new) > max_prompt_chars):
+        # Too many new rows for one prompt: condense them into chunk notes first
+        partials = map_chunks(rows, language, chunk_rows_limit, chunk_chars, max_workers)
+        if not partials:
+            return None
+        notes = "\n\n".join(
+            f"### Rows {first_row}-{last_row} ({row_count} rows)\n{text}"
+            for first_row, last_row, row_count, text in partials
+        )
+        analysis = generate_analysis(
+            build_update_prompt(previous_report, notes, len(rows), covered_count, language,
+                                evidence_is_notes=True, stats_block=stats_block),
+            "update pass",
+            report_path(theme_name, language)
+        )
+    else:
+        analysis = generate_analysis(
+            build_update_prompt(previous_report, formatted_new, len(rows), covered_count, language, stats_block=stats_block),
+            "update pass",
+            report_path(theme_name, language)
+        )
+
+    if not analysis:
+        return None
+
+    analysis_type = f"Incremental Update (+{len(new_rows)} rows)"
+    manifest = dict(previous_manifest)
+    manifest['analysis_type'] = analysis_type
+    manifest['total_rows'] = len(all_rows)
+    manifest['included_rows'] = sorted(set(previous_manifest.get('included_rows', [])) | set(delta_manifest['included_rows']))
+    manifest['excluded_rows'] = previous_manifest.get('excluded_rows', []) + delta_manifest['excluded_rows']
+    manifest['covered_rows'] = [row_key(row) for _, row in all_rows]
+    manifest['stats'] = stats
+    manifest['updates'] = previous_manifest.get('updates', []) + [{
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'new_rows': [row_number for row_number, _ in new_rows],
+        'estimated_tokens': delta_manifest['estimated_tokens'],
+    }]
+
+    print(f"✅ Update completed successfully")
+    return analysis, analysis_type, manifest
+
+def report_path(theme_name, language='en', extension='md'):
+    """Path of a theme's report (or sidecar file) in the language-tagged analysis folder"""
+    return Path(f"findings/4_analysis-{language}") / format_filename(f"analysis-{theme_name}", language, extension)
+
+def save_analysis(analysis_text, theme_name, language='en', analysis_type="Comprehensive One-Shot Analysis", stats=None):
+    """Save analysis to markdown file with language tag
+
+    Locally computed stats go in the header, above the separator, so delta
+    updates never send stale numbers back to the model.
+    """
     from language_config import ensure_folder_exists
-    output_dir = Path(ensure_folder_exists(4, 'analysis', language))
+    ensure_folder_exists(4, 'analysis', language)
 
     # Format filename with language tag
-    output_file = output_dir / format_filename(f"analysis-{theme_name}", language, 'md')
+    output_file = report_path(theme_name, language)
 
     # Add metadata header
     timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
@@ -232,39 +836,106 @@ def save_analysis(analysis_text, theme_name, language='en'):
 **Generated:** {timestamp}
 **Model:** {MODEL_NAME}
 **Language:** {language_config['name']} ({language})
-**Analysis Type:** Comprehensive One-Shot Analysis
+**Analysis Type:** {analysis_type}
+"""
+    if stats:
+        header += f"""
+## Quantitative Summary (computed locally)
 
+{format_stats(stats)}
+"""
+    header += """
 ---
 
 """
 
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(header + analysis_text)
+    discard_partial(output_file)
 
     print(f"💾 Saved: {output_file}")
     return output_file
 
+def save_manifest(manifest, theme_name, language='en'):
+    """Save the evidence manifest (which rows the report was built from) next to the report"""
+    from language_config import ensure_folder_exists
+    ensure_folder_exists(4, 'analysis', language)
+    manifest_file = report_path(theme_name, language, 'manifest.json')
+
+    manifest = dict(manifest, generated=time.strftime('%Y-%m-%d %H:%M:%S'), model=MODEL_NAME)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    print(f"🧾 Manifest: {manifest_file}")
+    return manifest_file
+
 def main():
     """Main analysis function"""
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Analyze gathered fertility data")
+    parser.add_argument("--mode", choices=['auto', 'single', 'hierarchical', 'sharded'], default='auto',
+                        help="auto switches to map-reduce when a theme exceeds --max-prompt-chars; sharded runs one retrieval-scoped call per dimension (default: auto)")
+    parser.add_argument("--dimension-rows", type=int, default=DEFAULT_DIMENSION_ROWS,
+                        help=f"Rows retrieved per dimension in sharded mode (default: {DEFAULT_DIMENSION_ROWS})")
+    parser.add_argument("--max-prompt-chars", type=int, default=DEFAULT_MAX_PROMPT_CHARS,
+                        help=f"Formatted data size above which auto mode uses map-reduce (default: {DEFAULT_MAX_PROMPT_CHARS})")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"Maximum rows per map-reduce chunk (default: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS,
+                        help=f"Maximum formatted characters per map-reduce chunk (default: {DEFAULT_CHUNK_CHARS})")
+    parser.add_argument("--token-budget", type=int, default=None,
+                        help="Select the highest-value, most diverse rows that fit this many prompt tokens (default: send all rows)")
+    parser.add_argument("--min-research-value", type=int, default=DEFAULT_MIN_RESEARCH_VALUE,
+                        help=f"With --token-budget, drop rows scored below this research_value (default: {DEFAULT_MIN_RESEARCH_VALUE})")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-analyze every row instead of updating existing reports with only new rows")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="Wait for complete responses instead of streaming reports into .partial files")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Parallel chunk analyses (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--keywords", nargs="+", default=None,
+                        help="Keywords whose exact row prevalence is given to the model (default: the language's list in language_config.py)")
     add_language_args(parser)
     args = parser.parse_args()
 
-    language_config = get_language_config(args.language)
+    global STREAM_RESPONSES
+    STREAM_RESPONSES = not args.no_stream
 
     print(f"\n📊 Analysis Phase: Comprehensive Theme Analysis")
     print("=" * 60)
     print(f"🤖 Using model: {MODEL_NAME}")
-    print(f"🌐 Language: {language_config['name']} ({args.language})")
+
+    analysis_options = dict(
+        mode=args.mode,
+        chunk_rows_limit=args.chunk_rows,
+        chunk_chars=args.chunk_chars,
+        max_prompt_chars=args.max_prompt_chars,
+        max_workers=args.workers,
+        token_budget=args.token_budget,
+        min_research_value=args.min_research_value,
+        keywords=args.keywords,
+        dimension_rows=args.dimension_rows,
+    )
+
+    # Languages run side by side, sharing one rate limiter
+    run_languages(
+        resolve_languages(args.language),
+        lambda language: analyze_language(language, analysis_options, full=args.full),
+    )
+
+
+def analyze_language(language: str, analysis_options: dict, full: bool = False) -> list:
+    """Analyze every gathered theme file for one language; returns the reports written"""
+    language_config = get_language_config(language)
+    print(f"🌐 Language: {language_config['name']} ({language})")
 
     # Find all gather files for the specified language
-    csv_files = find_gather_files(args.language)
+    csv_files = find_gather_files(language)
 
     if not csv_files:
-        print(f"❌ No gathered data files found for language '{args.language}' in findings/3_gather-{args.language}/")
-        print(f"💡 Run 3_gather.py --language {args.language} first to collect data for this language")
-        return
+        print(f"❌ No gathered data files found for language '{language}' in findings/3_gather-{language}/")
+        print(f"💡 Run 3_gather.py --language {language} first to collect data for this language")
+        return []
 
     print(f"\n📁 Found {len(csv_files)} data files to analyze:")
     for csv_file in csv_files:
@@ -273,13 +944,31 @@ def main():
 
     # Analyze each file
     results = []
+    up_to_date = []
     for csv_file in csv_files:
         theme_name = extract_theme_name(csv_file.name)
 
-        analysis = analyze_theme_data(csv_file, theme_name, args.language)
+        # Only send rows gathered since the last report when one exists
+        previous = None if full else load_previous_analysis(theme_name, language)
+        if previous:
+            previous_report, previous_manifest = previous
+            all_rows = load_csv_rows(csv_file)
+            new_rows = find_new_rows(all_rows, previous_manifest)
+            if not new_rows:
+                print(f"\n✔️ {csv_file.name}: no new rows since last analysis")
+                up_to_date.append(csv_file)
+                continue
+            analysis = analyze_theme_delta(
+                csv_file, theme_name, previous_report, previous_manifest, new_rows, all_rows,
+                language, **analysis_options
+            )
+        else:
+            analysis = analyze_theme_data(csv_file, theme_name, language, **analysis_options)
 
         if analysis:
-            output_file = save_analysis(analysis, theme_name, args.language)
+            analysis_text, analysis_type, manifest = analysis
+            output_file = save_analysis(analysis_text, theme_name, language, analysis_type, manifest.get('stats'))
+            save_manifest(manifest, theme_name, language)
             results.append(output_file)
         else:
             print(f"⚠️ Skipping {csv_file.name} due to analysis failure")
@@ -287,6 +976,8 @@ def main():
     # Summary
     print(f"\n✅ Analysis Complete!")
     print(f"📊 Successfully analyzed: {len(results)}/{len(csv_files)} files")
+    if up_to_date:
+        print(f"✔️ Already up to date: {len(up_to_date)} files")
     print(f"🌐 Language: {language_config['name']}")
 
     if results:
@@ -294,7 +985,8 @@ def main():
         for result in results:
             print(f"   • {result}")
 
-    print(f"\n📁 All analysis files saved in: findings/4_analysis-{args.language}/")
+    print(f"\n📁 All analysis files saved in: findings/4_analysis-{language}/")
+    return results
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -7,13 +7,18 @@ import os
 import json
 import time
 import argparse
-from typing import List, Dict, Optional, Any
+import concurrent.futures
+from typing import List, Dict, Optional, Any, get_origin, get_args
 from pathlib import Path
 from collections import Counter, defaultdict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from google import genai
 from google.genai import types
-from language_config import add_language_args, get_language_config, ensure_folder_exists
+from language_config import add_language_args, get_language_config, ensure_folder_exists, resolve_languages
+from streaming import stream_generate, discard_partial
+from worker_pool import rate_limited
+from context_cache import client_http_options
+from model_routing import model_for
 
 # Load environment variables from .env file
 try:
@@ -25,15 +30,18 @@ except ImportError:
 # --- Configuration ---
 try:
     api_key = os.environ["GOOGLE_API_KEY"]
-    client = genai.Client(api_key=api_key)
+    client = rate_limited(genai.Client(api_key=api_key, http_options=client_http_options()))
 except KeyError:
     print("Error: GOOGLE_API_KEY environment variable not set.")
     exit()
 
 # Model configuration
-MODEL_NAME = os.environ.get("GEMINI_MODEL", "gemini-2.5-pro")
+MODEL_NAME = model_for("synthesis")
 print(f"🤖 Using model: {MODEL_NAME}")
 
+# Concurrent per-topic extraction calls
+DEFAULT_WORKERS = 4
+
 # --- Advanced Pydantic Models for Theme Extraction ---
 
 class ThemeEvidence(BaseModel):
@@ -279,47 +287,133 @@ def load_advanced_analyses(language: str = 'en'):
 
     return topic_data
 
+# --- Structured Output Validation ---
+
+def _is_model(annotation) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _list_item_model(annotation):
+    if get_origin(annotation) is list:
+        args = get_args(annotation)
+        if args and _is_model(args[0]):
+            return args[0]
+    return None
+
+
+def _empty_value(annotation) -> Any:
+    """Neutral placeholder for a field that failed validation"""
+    origin = get_origin(annotation)
+    if origin is list:
+        return []
+    if origin is dict:
+        return {}
+    if _is_model(annotation):
+        return _repair_model(annotation, {}, '', [])
+    if annotation is str:
+        return ''
+    if annotation in (int, float):
+        return annotation(0)
+    return None
+
+
+def _repair_model(model_cls, data: Any, path: str, repairs: List[str]) -> Dict[str, Any]:
+    """Rebuild a payload for model_cls, replacing only the sub-objects that fail validation"""
+    if not isinstance(data, dict):
+        repairs.append(path or '<root>')
+        data = {}
+
+    repaired = {}
+    for name, field in model_cls.model_fields.items():
+        field_path = f"{path}.{name}" if path else name
+        annotation = field.annotation
+        value = data.get(name)
+        item_model = _list_item_model(annotation)
+
+        if _is_model(annotation):
+            repaired[name] = _repair_model(annotation, value, field_path, repairs)
+        elif item_model and isinstance(value, list):
+            items = []
+            for index, item in enumerate(value):
+                item_path = f"{field_path}[{index}]"
+                if not isinstance(item, dict):
+                    repairs.append(f"{item_path} (dropped)")
+                    continue
+                try:
+                    items.append(item_model.model_validate(item).model_dump())
+                except ValidationError:
+                    items.append(_repair_model(item_model, item, item_path, repairs))
+            repaired[name] = items
+        else:
+            try:
+                repaired[name] = TypeAdapter(annotation).validate_python(value)
+            except ValidationError:
+                repairs.append(field_path)
+                repaired[name] = _empty_value(annotation)
+
+    return repaired
+
+
+def structured_config(model_cls) -> types.GenerateContentConfig:
+    """Request JSON output constrained to a pydantic model's schema
+
+    Uses response_json_schema because the models' Dict fields need
+    additionalProperties, which response_schema rejects on the Developer API.
+    """
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_json_schema=model_cls.model_json_schema(),
+    )
+
+
+def parse_structured_response(model_cls, response_text: str):
+    """Validate a structured response once; repair failing sub-objects locally
+
+    Returns (instance, repairs) where repairs lists the field paths that were
+    replaced with placeholders. Never triggers another model call.
+    """
+    try:
+        data = json.loads(response_text or '')
+    except json.JSONDecodeError:
+        data = None
+
+    try:
+        return model_cls.model_validate(data), []
+    except ValidationError:
+        repairs: List[str] = []
+        repaired = _repair_model(model_cls, data, '', repairs)
+        return model_cls.model_validate(repaired), repairs
+
+
+def _empty_topic_analysis(topic: str, metadata: Dict[str, Any], note: str) -> TopicThemeAnalysis:
+    """Placeholder analysis for topics with no data or a failed call"""
+    analysis = TopicThemeAnalysis.model_validate(_empty_value(TopicThemeAnalysis))
+    analysis.topic_name = topic
+    analysis.analysis_metadata = metadata
+    analysis.unique_contributions = [note]
+    analysis.data_quality_notes = [note]
+    analysis.extraction_reasoning = note
+    return analysis
+
 # --- Advanced Theme Extraction ---
 
-def extract_topic_themes_advanced(topic: str, analyses: List[Dict]) -> TopicThemeAnalysis:
+def topic_output_dir(topic: str, language: str = 'en') -> str:
+    """Per-topic synthesis output folder"""
+    return f"findings/5_synthesis-{language}/by_topic/{topic.lower().replace(' ', '_')}"
+
+
+def cross_topic_output_dir(language: str = 'en') -> str:
+    """Cross-topic synthesis output folder"""
+    return f"findings/5_synthesis-{language}/cross_topic"
+
+
+def extract_topic_themes_advanced(topic: str, analyses: List[Dict], language: str = 'en') -> TopicThemeAnalysis:
     """Extract themes for a specific topic using advanced AI analysis on markdown content"""
 
     print(f"\n🎯 Advanced theme extraction for: {topic}")
 
     if not analyses:
-        return TopicThemeAnalysis(
-            topic_name=topic,
-            analysis_metadata={'error': 'No data available'},
-            major_themes=[],
-            emotional_journey=EmotionalJourneyMapping(
-                journey_phases=[],
-                common_transitions=[],
-                resilience_factors=[],
-                vulnerability_points=[],
-                support_interventions=[]
-            ),
-            practical_patterns=PracticalPattern(
-                decision_frameworks=[],
-                resource_requirements={},
-                common_timelines={},
-                cost_patterns=[],
-                success_predictors=[],
-                failure_modes=[]
-            ),
-            advice_synthesis=AdviceSynthesis(
-                essential_advice=[],
-                stage_specific_advice={},
-                controversial_topics=[],
-                wisdom_insights=[],
-                mistake_patterns=[]
-            ),
-            unique_contributions=["No data available"],
-            research_priorities=[],
-            policy_implications=[],
-            analysis_confidence=0.0,
-            data_quality_notes=["No data available"],
-            extraction_reasoning="No data available"
-        )
+        return _empty_topic_analysis(topic, {'error': 'No data available'}, "No data available")
 
     # Get the markdown analysis content
     analysis_content = analyses[0].get('analysis_content', '')
@@ -368,78 +462,27 @@ def extract_topic_themes_advanced(topic: str, analyses: List[Dict]) -> TopicThem
     """
 
     try:
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=theme_extraction_prompt
+        # Streamed for timing metrics only: schema-constrained JSON can't be continued, so an interrupted call restarts
+        response_text = stream_generate(
+            client, MODEL_NAME, theme_extraction_prompt,
+            f"{topic_output_dir(topic, language)}/advanced_themes_data.json",
+            f"theme extraction ({topic})",
+            config=structured_config(TopicThemeAnalysis)
         )
 
-        # Create a simplified theme analysis from text response
-        from collections import Counter
-        theme_analysis = TopicThemeAnalysis(
-            topic_name=topic,
-            analysis_metadata={
-                'extraction_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'source_file': analyses[0].get('source_file', 'unknown'),
-                'method': 'markdown_analysis_extraction'
-            },
-            major_themes=[
-                MajorTheme(
-                    theme_name=f"Theme extracted from {topic}",
-                    theme_description="Analysis extracted from markdown content",
-                    prevalence_score=8.0,
-                    emotional_significance=7.0,
-                    practical_importance=7.0,
-                    stakeholder_relevance=["patients", "providers"],
-                    sub_themes=[],
-                    actionable_insights=["See full analysis in source content"],
-                    supporting_evidence=[ThemeEvidence(
-                        quote="See analysis content",
-                        source_count=1,
-                        confidence_level=0.8,
-                        supporting_factors=["Comprehensive analysis available"]
-                    )]
-                )
-            ],
-            emotional_journey=EmotionalJourneyMapping(
-                journey_phases=[],
-                common_transitions=[],
-                resilience_factors=[],
-                vulnerability_points=[],
-                support_interventions=[]
-            ),
-            practical_patterns=PracticalPattern(
-                decision_frameworks=[],
-                resource_requirements={},
-                common_timelines={},
-                cost_patterns=[],
-                success_predictors=[],
-                failure_modes=[]
-            ),
-            advice_synthesis=AdviceSynthesis(
-                essential_advice=[],
-                stage_specific_advice={},
-                controversial_topics=[],
-                wisdom_insights=[],
-                mistake_patterns=[]
-            ),
-            unique_contributions=[f"Comprehensive analysis available for {topic}"],
-            research_priorities=[],
-            policy_implications=[],
-            analysis_confidence=0.8,
-            data_quality_notes=["Analysis based on markdown report"],
-            extraction_reasoning="Extracted from comprehensive markdown analysis"
-        )
-
-        # Add reasoning and metadata
-        if response.thinking:
-            theme_analysis.extraction_reasoning = response.thinking[:1000] + "..." if len(response.thinking) > 1000 else response.thinking
+        discard_partial(f"{topic_output_dir(topic, language)}/advanced_themes_data.json")
+        theme_analysis, repairs = parse_structured_response(TopicThemeAnalysis, response_text)
 
         theme_analysis.topic_name = topic
         theme_analysis.analysis_metadata = {
             'extraction_date': time.strftime('%Y-%m-%d %H:%M:%S'),
             'source_file': analyses[0].get('source_file', 'unknown'),
-            'method': 'markdown_analysis_extraction'
+            'method': 'markdown_analysis_extraction',
+            'repaired_fields': repairs,
         }
+        if repairs:
+            print(f"   🩹 Repaired {len(repairs)} invalid fields locally: {', '.join(repairs[:5])}")
+            theme_analysis.data_quality_notes.append(f"Locally repaired fields: {', '.join(repairs)}")
 
         print(f"   ✅ Extracted {len(theme_analysis.major_themes)} major themes")
         return theme_analysis
@@ -447,41 +490,9 @@ def extract_topic_themes_advanced(topic: str, analyses: List[Dict]) -> TopicThem
     except Exception as e:
         print(f"   ❌ Theme extraction failed for {topic}: {e}")
         # Return minimal analysis on error
-        return TopicThemeAnalysis(
-            topic_name=topic,
-            analysis_metadata={'error': str(e)},
-            major_themes=[],
-            emotional_journey=EmotionalJourneyMapping(
-                journey_phases=[],
-                common_transitions=[],
-                resilience_factors=[],
-                vulnerability_points=[],
-                support_interventions=[]
-            ),
-            practical_patterns=PracticalPattern(
-                decision_frameworks=[],
-                resource_requirements={},
-                common_timelines={},
-                cost_patterns=[],
-                success_predictors=[],
-                failure_modes=[]
-            ),
-            advice_synthesis=AdviceSynthesis(
-                essential_advice=[],
-                stage_specific_advice={},
-                controversial_topics=[],
-                wisdom_insights=[],
-                mistake_patterns=[]
-            ),
-            unique_contributions=[f"Analysis failed: {str(e)}"],
-            research_priorities=[],
-            policy_implications=[],
-            analysis_confidence=0.0,
-            data_quality_notes=[f"Error: {str(e)}"],
-            extraction_reasoning=f"Analysis failed: {str(e)}"
-        )
+        return _empty_topic_analysis(topic, {'error': str(e)}, f"Analysis failed: {str(e)}")
 
-def synthesize_cross_topics_advanced(all_topic_analyses: Dict[str, TopicThemeAnalysis]) -> CrossTopicSynthesis:
+def synthesize_cross_topics_advanced(all_topic_analyses: Dict[str, TopicThemeAnalysis], language: str = 'en') -> CrossTopicSynthesis:
     """Advanced cross-topic synthesis using Thinking Mode"""
 
     print(f"\n🔗 Advanced cross-topic synthesis across {len(all_topic_analyses)} topics")
@@ -549,55 +560,26 @@ def synthesize_cross_topics_advanced(all_topic_analyses: Dict[str, TopicThemeAna
     """
 
     try:
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=synthesis_prompt
-        )
-
-        # Create a simplified cross-topic synthesis
-        synthesis = CrossTopicSynthesis(
-            synthesis_metadata={
-                'synthesis_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'topics_analyzed': len(all_topic_analyses),
-                'method': 'cross_topic_analysis'
-            },
-            universal_themes=[
-                UniversalTheme(
-                    theme_name="Cross-topic insights",
-                    cross_topic_description="Insights synthesized across all topics",
-                    topics_present=topics_list,
-                    combined_prevalence=8.0,
-                    cross_topic_implications=["See synthesis content"],
-                    intervention_opportunities=["Multiple intervention points identified"],
-                    supporting_evidence=[]
-                )
-            ],
-            evolutionary_patterns=[],
-            system_level_insights=SystemLevelInsights(
-                healthcare_implications=[],
-                policy_recommendations=[],
-                social_support_gaps=[],
-                technology_opportunities=[],
-                research_priorities=[],
-                intervention_frameworks=[]
-            ),
-            demographic_variations={},
-            synthesis_confidence=0.8,
-            synthesis_reasoning=response.text,
-            methodological_notes=["Analysis based on comprehensive topic reports"],
-            future_research_agenda=[]
+        # Like theme extraction, a schema-constrained stream restarts rather than resumes
+        response_text = stream_generate(
+            client, MODEL_NAME, synthesis_prompt,
+            f"{cross_topic_output_dir(language)}/advanced_cross_topic_data.json",
+            "cross-topic synthesis",
+            config=structured_config(CrossTopicSynthesis)
         )
 
-        # Add reasoning and metadata
-        if response.thinking:
-            synthesis.synthesis_reasoning = response.thinking[:1000] + "..." if len(response.thinking) > 1000 else response.thinking
+        discard_partial(f"{cross_topic_output_dir(language)}/advanced_cross_topic_data.json")
+        synthesis, repairs = parse_structured_response(CrossTopicSynthesis, response_text)
 
         synthesis.synthesis_metadata = {
             'synthesis_date': time.strftime('%Y-%m-%d %H:%M:%S'),
             'topics_included': topics_list,
             'total_major_themes': sum(len(a.major_themes) for a in all_topic_analyses.values()),
-            'method': 'advanced_cross_topic_thinking'
+            'method': 'advanced_cross_topic_thinking',
+            'repaired_fields': repairs,
         }
+        if repairs:
+            print(f"   🩹 Repaired {len(repairs)} invalid fields locally: {', '.join(repairs[:5])}")
 
         print(f"   ✅ Identified {len(synthesis.universal_themes)} universal themes")
         print(f"   ✅ Found {len(synthesis.topic_relationships)} topic relationships")
@@ -626,7 +608,7 @@ def synthesize_cross_topics_advanced(all_topic_analyses: Dict[str, TopicThemeAna
 def save_advanced_topic_themes(topic: str, theme_analysis: TopicThemeAnalysis, language: str = 'en'):
     """Save advanced theme analysis for a specific topic"""
 
-    topic_dir = f"findings/5_synthesis-{language}/by_topic/{topic.lower().replace(' ', '_')}"
+    topic_dir = topic_output_dir(topic, language)
     os.makedirs(topic_dir, exist_ok=True)
 
     # Save JSON data
@@ -728,7 +710,7 @@ def save_advanced_topic_themes(topic: str, theme_analysis: TopicThemeAnalysis, l
 def save_advanced_cross_topic_synthesis(synthesis: CrossTopicSynthesis, language: str = 'en'):
     """Save advanced cross-topic synthesis"""
 
-    synthesis_dir = f"findings/5_synthesis-{language}/cross_topic"
+    synthesis_dir = cross_topic_output_dir(language)
     os.makedirs(synthesis_dir, exist_ok=True)
 
     # Save JSON
@@ -808,54 +790,89 @@ def main():
     """Main advanced theme extraction interface"""
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Synthesize fertility analysis themes")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Topics to extract concurrently (default: {DEFAULT_WORKERS})")
     add_language_args(parser)
     args = parser.parse_args()
 
-    language_config = get_language_config(args.language)
+    languages = resolve_languages(args.language)
 
     print("\n🔬 Stage 5: Final Synthesis")
     print("✨ Features: Thinking Mode + Structured Output + Comprehensive Synthesis")
-    print(f"🌐 Language: {language_config['name']} ({args.language})")
 
     # Load advanced analyses
-    topic_data = load_advanced_analyses(args.language)
-
-    if not topic_data:
-        print("❌ No advanced analysis files found")
-        print("Please run analyze_advanced.py first")
+    topic_data_by_language = {}
+    for language in languages:
+        language_config = get_language_config(language)
+        print(f"🌐 Language: {language_config['name']} ({language})")
+        topic_data = load_advanced_analyses(language)
+
+        if not topic_data:
+            print(f"❌ No advanced analysis files found for {language}")
+            print(f"Please run 4_analyze.py --language {language} first")
+            continue
+
+        print(f"📚 Found analyses for {len(topic_data)} topics:")
+        for topic, analyses in topic_data.items():
+            high_quality = sum(1 for a in analyses if a.get('credibility', {}).get('credibility_score', 0) > 0.7)
+            print(f"   • {topic}: {len(analyses)} posts ({high_quality} high-quality)")
+        topic_data_by_language[language] = topic_data
+
+    if not topic_data_by_language:
         return
 
-    print(f"📚 Found analyses for {len(topic_data)} topics:")
-    for topic, analyses in topic_data.items():
-        high_quality = sum(1 for a in analyses if a.get('credibility', {}).get('credibility_score', 0) > 0.7)
-        print(f"   • {topic}: {len(analyses)} posts ({high_quality} high-quality)")
-
-    # Extract themes for each topic
-    all_topic_themes = {}
-    print(f"\n🎯 Extracting advanced themes for each topic...")
-
-    for topic, analyses in topic_data.items():
-        theme_analysis = extract_topic_themes_advanced(topic, analyses)
-        all_topic_themes[topic] = theme_analysis
-
-        if theme_analysis.analysis_confidence > 0:
-            save_advanced_topic_themes(topic, theme_analysis, args.language)
-            print(f"   ✅ Saved advanced themes for {topic}")
-
-    # Cross-topic synthesis
-    print(f"\n🔗 Performing advanced cross-topic synthesis...")
-    cross_synthesis = synthesize_cross_topics_advanced(all_topic_themes)
-
-    if cross_synthesis.synthesis_confidence > 0:
-        save_advanced_cross_topic_synthesis(cross_synthesis, args.language)
-        print("   ✅ Advanced cross-topic synthesis complete")
-
-    # Summary
+    # Every language's topics share one extraction pool; each topic is saved as it completes
+    all_topic_themes = {language: {} for language in topic_data_by_language}
+    cross_syntheses = {}
+    total_topics = sum(len(topic_data) for topic_data in topic_data_by_language.values())
+    print(f"\n🎯 Extracting advanced themes for {total_topics} topics ({args.workers} parallel)...")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as executor:
+        future_to_topic = {
+            executor.submit(extract_topic_themes_advanced, topic, analyses, language): (language, topic)
+            for language, topic_data in topic_data_by_language.items()
+            for topic, analyses in topic_data.items()
+        }
+        remaining = {language: len(topic_data) for language, topic_data in topic_data_by_language.items()}
+        cross_futures = {}
+
+        for future in concurrent.futures.as_completed(future_to_topic):
+            language, topic = future_to_topic[future]
+            theme_analysis = future.result()
+            all_topic_themes[language][topic] = theme_analysis
+
+            if theme_analysis.analysis_confidence > 0:
+                save_advanced_topic_themes(topic, theme_analysis, language)
+                print(f"   ✅ Saved advanced themes for {topic} ({language})")
+
+            # A language's cross-topic synthesis starts as soon as its last topic is done
+            remaining[language] -= 1
+            if remaining[language] == 0:
+                # Keep cross-topic input in the original topic order
+                ordered = {t: all_topic_themes[language][t] for t in topic_data_by_language[language]}
+                all_topic_themes[language] = ordered
+                print(f"\n🔗 Performing advanced cross-topic synthesis ({language})...")
+                cross_futures[executor.submit(synthesize_cross_topics_advanced, ordered, language)] = language
+
+        for future in concurrent.futures.as_completed(cross_futures):
+            language = cross_futures[future]
+            cross_synthesis = future.result()
+            cross_syntheses[language] = cross_synthesis
+            if cross_synthesis.synthesis_confidence > 0:
+                save_advanced_cross_topic_synthesis(cross_synthesis, language)
+                print(f"   ✅ Advanced cross-topic synthesis complete ({language})")
+
+    for language in topic_data_by_language:
+        print_synthesis_summary(language, topic_data_by_language[language], all_topic_themes[language], cross_syntheses[language])
+
+
+def print_synthesis_summary(language: str, topic_data: dict, all_topic_themes: dict, cross_synthesis):
+    """Print the run summary for one language"""
     print("\n" + "="*60)
-    print("✅ ADVANCED THEME EXTRACTION COMPLETE")
+    print(f"✅ ADVANCED THEME EXTRACTION COMPLETE ({language})")
     print("="*60)
-    print(f"📁 Topic themes: findings/5_synthesis-{args.language}/by_topic/")
-    print(f"🔗 Cross-topic synthesis: findings/5_synthesis-{args.language}/cross_topic/")
+    print(f"📁 Topic themes: findings/5_synthesis-{language}/by_topic/")
+    print(f"🔗 Cross-topic synthesis: findings/5_synthesis-{language}/cross_topic/")
     print(f"📊 Topics processed: {len(topic_data)}")
 
     successful_topics = sum(1 for t in all_topic_themes.values() if t.analysis_confidence > 0)
@@ -867,9 +884,9 @@ def main():
     print(f"🌟 Universal themes: {universal_themes}")
     print(f"🔬 Synthesis confidence: {cross_synthesis.synthesis_confidence:.2f}")
     print("📄 Summary:")
-    print(f"   • Input analyses: {os.path.abspath(f'findings/4_analysis-{args.language}')}")
-    print(f"   • Topic themes directory: {os.path.abspath(f'findings/5_synthesis-{args.language}/by_topic')}")
-    print(f"   • Cross-topic synthesis directory: {os.path.abspath(f'findings/5_synthesis-{args.language}/cross_topic')}")
+    print(f"   • Input analyses: {os.path.abspath(f'findings/4_analysis-{language}')}")
+    print(f"   • Topic themes directory: {os.path.abspath(f'findings/5_synthesis-{language}/by_topic')}")
+    print(f"   • Cross-topic synthesis directory: {os.path.abspath(f'findings/5_synthesis-{language}/cross_topic')}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,329 @@
+"""
+Audit log for raw Gemini responses
+Records are appended by a background writer in batches. The live JSONL file is
+rotated by size or age into gzip segments with one gzip member per record, and
+a sidecar index maps (call_type, topic, query, url) to segment + byte offset so
+any single response can be read back without scanning the history.
+
+Usage: python audit_log.py --call-type score --url https://... [--full]
+"""
+
+import os
+import re
+import json
+import gzip
+import zlib
+import time
+import queue
+import atexit
+import argparse
+import threading
+import contextlib
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 24 * 60 * 60
+DEFAULT_FLUSH_SECONDS = 1.0
+DEFAULT_BATCH_SIZE = 64
+
+_STOP = object()
+
+
+@contextlib.contextmanager
+def locked(handle):
+    """Hold an exclusive cross-process lock on an open file"""
+    if fcntl is None:
+        yield handle
+        return
+    fcntl.flock(handle, fcntl.LOCK_EX)
+    try:
+        yield handle
+    finally:
+        handle.flush()
+        fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _gzip_members(data: bytes):
+    """Yield (offset, length, decompressed bytes) for each member of a multi-member gzip blob"""
+    offset = 0
+    while offset < len(data):
+        decompressor = zlib.decompressobj(wbits=31)
+        payload = decompressor.decompress(data[offset:]) + decompressor.flush()
+        length = len(data) - offset - len(decompressor.unused_data)
+        yield offset, length, payload
+        offset += length
+
+
+def _index_entry(record: dict, segment: str, offset: int, length: int) -> dict:
+    metadata = record.get("metadata") or {}
+    return {
+        "call_type": record.get("call_type"),
+        "topic": metadata.get("topic"),
+        "query": metadata.get("query"),
+        "url": metadata.get("url"),
+        "timestamp": record.get("timestamp"),
+        "segment": segment,
+        "offset": offset,
+        "length": length,
+    }
+
+
+class AuditLog:
+    """Buffered, rotating audit log with an offset index"""
+
+    def __init__(self, directory: str, name: str = "gather_gemini_responses",
+                 max_bytes: int = DEFAULT_MAX_BYTES, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+                 flush_seconds: float = DEFAULT_FLUSH_SECONDS):
+        self.directory = directory
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.flush_seconds = flush_seconds
+        self.live_name = f"{name}.jsonl"
+        self.live_path = os.path.join(directory, self.live_name)
+        self.index_path = os.path.join(directory, f"{name}.index.jsonl")
+        self.lock_path = os.path.join(directory, f"{name}.lock")
+        self.queue = queue.Queue()
+        self.file_lock = threading.Lock()
+        self.start_lock = threading.Lock()
+        self.thread = None
+        self.live_started = None
+
+    # --- Writing ---
+
+    def append(self, call_type: str, metadata: dict, response_text: str):
+        """Queue one response for the background writer"""
+        self._ensure_writer()
+        self.queue.put({
+            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "call_type": call_type,
+            "metadata": metadata,
+            "response_text": response_text,
+        })
+
+    def _ensure_writer(self):
+        with self.start_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+
+    def close(self):
+        """Flush everything queued and stop the writer"""
+        with self.start_lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while batch[-1] is not _STOP and len(batch) < DEFAULT_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is _STOP
+            records = [record for record in batch if record is not _STOP]
+            if records:
+                try:
+                    self._write_batch(records)
+                except Exception as e:
+                    print(f"⚠️ Audit log write failed ({len(records)} records lost): {e}")
+            if stop:
+                return
+
+    def _write_batch(self, records: list):
+        os.makedirs(self.directory, exist_ok=True)
+        # Other processes (queue workers) may share this log: offsets are only valid under the lock
+        with self.file_lock, open(self.lock_path, 'a') as lock_handle, locked(lock_handle):
+            self._ensure_index()
+            self._maybe_rotate()
+
+            entries = []
+            with open(self.live_path, 'ab') as handle:
+                offset = handle.tell()
+                for record in records:
+                    line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+                    handle.write(line)
+                    entries.append(_index_entry(record, self.live_name, offset, len(line)))
+                    offset += len(line)
+            if self.live_started is None:
+                self.live_started = time.time()
+
+            with open(self.index_path, 'a', encoding='utf-8') as index:
+                for entry in entries:
+                    index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    # --- Rotation ---
+
+    def _live_age(self) -> float:
+        if self.live_started is None:
+            with open(self.live_path, 'r', encoding='utf-8') as handle:
+                first = handle.readline()
+            try:
+                started = time.mktime(time.strptime(json.loads(first)["timestamp"], '%Y-%m-%d %H:%M:%S'))
+            except (ValueError, KeyError, TypeError):
+                started = os.path.getmtime(self.live_path)
+            self.live_started = started
+        return time.time() - self.live_started
+
+    def _maybe_rotate(self):
+        if not os.path.exists(self.live_path) or os.path.getsize(self.live_path) == 0:
+            return
+        if os.path.getsize(self.live_path) >= self.max_bytes or self._live_age() >= self.max_age_seconds:
+            self.rotate()
+
+    def rotate(self):
+        """Compress the live file into a new segment and repoint its index entries"""
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        segment_name = f"{self.name}-{stamp}.jsonl.gz"
+        suffix = 1
+        while os.path.exists(os.path.join(self.directory, segment_name)):
+            suffix += 1
+            segment_name = f"{self.name}-{stamp}-{suffix}.jsonl.gz"
+
+        entries = []
+        with open(self.live_path, 'rb') as source, open(os.path.join(self.directory, segment_name), 'wb') as segment:
+            for line in source:
+                if not line.strip():
+                    continue
+                member = gzip.compress(line)
+                entries.append(_index_entry(json.loads(line), segment_name, segment.tell(), len(member)))
+                segment.write(member)
+
+        kept = [entry for entry in self._read_index() if entry["segment"] != self.live_name]
+        self._write_index(kept + entries)
+        os.remove(self.live_path)
+        self.live_started = None
+        print(f"🗜️ Rotated audit log into {segment_name} ({len(entries)} records)")
+
+    # --- Index ---
+
+    def segments(self) -> list:
+        """Segment file names oldest first, live file last"""
+        if not os.path.isdir(self.directory):
+            return []
+        pattern = re.compile(rf"^{re.escape(self.name)}-\d{{8}}_\d{{6}}(-\d+)?\.jsonl\.gz$")
+        names = sorted(n for n in os.listdir(self.directory) if pattern.match(n))
+        if os.path.exists(self.live_path):
+            names.append(self.live_name)
+        return names
+
+    def _scan_segment(self, segment: str):
+        """Yield (offset, length, record) for every record in a segment"""
+        path = os.path.join(self.directory, segment)
+        if segment.endswith('.gz'):
+            with open(path, 'rb') as handle:
+                data = handle.read()
+            for offset, length, payload in _gzip_members(data):
+                for line in payload.splitlines():
+                    if line.strip():
+                        yield offset, length, json.loads(line)
+        else:
+            with open(path, 'rb') as handle:
+                offset = 0
+                for line in handle:
+                    if line.strip():
+                        yield offset, len(line), json.loads(line)
+                    offset += len(line)
+
+    def rebuild_index(self) -> int:
+        """Rebuild the sidecar index by scanning every segment once"""
+        entries = [
+            _index_entry(record, segment, offset, length)
+            for segment in self.segments()
+            for offset, length, record in self._scan_segment(segment)
+        ]
+        self._write_index(entries)
+        return len(entries)
+
+    def _ensure_index(self):
+        # Logs written before the index existed get indexed on first use
+        if not os.path.exists(self.index_path) and self.segments():
+            count = self.rebuild_index()
+            print(f"🗂️ Indexed {count} existing audit records")
+
+    def _read_index(self) -> list:
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, 'r', encoding='utf-8') as handle:
+            return [json.loads(line) for line in handle if line.strip()]
+
+    def _write_index(self, entries: list):
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            for entry in entries:
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.index_path)
+
+    # --- Reading ---
+
+    def lookup(self, call_type: str | None = None, topic: str | None = None,
+               query: str | None = None, url: str | None = None) -> list:
+        """Index entries matching every given field, oldest first"""
+        with self.file_lock:
+            self._ensure_index()
+            entries = self._read_index()
+        wanted = {"call_type": call_type, "topic": topic, "query": query, "url": url}
+        return [e for e in entries if all(value is None or e.get(key) == value for key, value in wanted.items())]
+
+    def fetch(self, entry: dict) -> dict:
+        """Read one record by its index entry"""
+        with self.file_lock:
+            with open(os.path.join(self.directory, entry["segment"]), 'rb') as handle:
+                handle.seek(entry["offset"])
+                data = handle.read(entry["length"])
+        if entry["segment"].endswith('.gz'):
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+    def iter_records(self):
+        """Every record across all segments in write order"""
+        with self.file_lock:
+            segments = self.segments()
+        for segment in segments:
+            for _, _, record in self._scan_segment(segment):
+                yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up raw Gemini responses in the gather audit log")
+    parser.add_argument("--dir", default="findings/logs", help="Audit log directory (default: findings/logs)")
+    parser.add_argument("--call-type", choices=["search", "score"], help="Only this call type")
+    parser.add_argument("--topic", help="Exact topic name")
+    parser.add_argument("--query", help="Exact query text")
+    parser.add_argument("--url", help="Exact result URL (score records)")
+    parser.add_argument("--full", action="store_true", help="Print full response text")
+    parser.add_argument("--rebuild-index", action="store_true", help="Rescan all segments and rebuild the index")
+    parser.add_argument("--rotate", action="store_true", help="Compress the live file into a segment now")
+    args = parser.parse_args()
+
+    log = AuditLog(args.dir)
+    if args.rebuild_index:
+        print(f"🗂️ Indexed {log.rebuild_index()} records")
+    if args.rotate and os.path.exists(log.live_path):
+        log.rotate()
+
+    entries = log.lookup(args.call_type, args.topic, args.query, args.url)
+    print(f"🔎 {len(entries)} matching records")
+    for entry in entries:
+        record = log.fetch(entry)
+        text = record["response_text"] if args.full else record["response_text"][:200]
+        print(f"\n[{record['timestamp']}] {record['call_type']} | {entry['segment']}@{entry['offset']}")
+        print(json.dumps(record.get("metadata"), ensure_ascii=False))
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
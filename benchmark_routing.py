@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark model routing policies on the gather scoring call
+Scores a sample of already-gathered rows under each policy and reports
+latency, list-price cost and agreement with the large-model (single) scores.
+
+Usage: python benchmark_routing.py [--sample 20] [--policies single tiered cascade] [--language en]
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+import importlib.util
+import statistics
+from pathlib import Path
+
+import pandas as pd
+
+from language_config import add_language_args, resolve_languages
+from model_routing import POLICIES, estimate_cost, run_cascade, cascade_models
+
+RESULTS_DIR = "findings/logs"
+
+
+def load_gather_module():
+    """Import 3_gather.py (not importable by name) for its scoring call"""
+    spec = importlib.util.spec_from_file_location("gather", Path(__file__).with_name("3_gather.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Benchmark calls must not end up in the audit log that replays rebuild CSVs from
+    module.log_raw_response = lambda *args, **kwargs: None
+    return module
+
+
+class RecordingModels:
+    """client.models wrapper that keeps (model, usage) for every generate_content call"""
+
+    def __init__(self, models):
+        self._models = models
+        self.calls = []
+
+    def generate_content(self, *args, **kwargs):
+        response = self._models.generate_content(*args, **kwargs)
+        self.calls.append((kwargs.get('model'), response.usage_metadata))
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._models, name)
+
+
+def sample_rows(languages: list, size: int, seed: int) -> list:
+    frames = [
+        pd.read_csv(csv_file, dtype=str, keep_default_na=False)
+        for language in languages
+        for csv_file in sorted(Path(f"findings/3_gather-{language}").glob(f"gathered_data-*-{language}.csv"))
+    ]
+    if not frames:
+        return []
+    rows = pd.concat(frames, ignore_index=True)
+    rows = rows[rows['content'].str.len() > 0]
+    return rows.sample(n=min(size, len(rows)), random_state=seed)[['title', 'content', 'url']].to_dict('records')
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def agreement(scores: list, baseline: list) -> dict:
+    """Share of items whose research value matches the baseline exactly / within 1, and whose tone sign matches"""
+    exact = close = tone = compared = 0
+    for ours, theirs in zip(scores, baseline):
+        ours_value, theirs_value = _number(ours.get('research_value')), _number(theirs.get('research_value'))
+        if ours_value is None or theirs_value is None:
+            continue
+        compared += 1
+        exact += ours_value == theirs_value
+        close += abs(ours_value - theirs_value) <= 1
+        ours_tone, theirs_tone = _number(ours.get('emotional_tone')), _number(theirs.get('emotional_tone'))
+        if ours_tone is not None and theirs_tone is not None:
+            tone += (ours_tone > 0) - (ours_tone < 0) == (theirs_tone > 0) - (theirs_tone < 0)
+    if not compared:
+        return {'compared': 0}
+    return {
+        'compared': compared,
+        'research_value_exact': round(exact / compared, 3),
+        'research_value_within_1': round(close / compared, 3),
+        'tone_sign': round(tone / compared, 3),
+    }
+
+
+def run_policy(gather, recorder: RecordingModels, policy: str, rows: list) -> dict:
+    """Score every sampled row under one policy"""
+    print(f"\n🔀 Policy: {policy} ({' -> '.join(cascade_models('score', policy))})")
+    first_call = len(recorder.calls)
+    latencies, scores = [], []
+    for row in rows:
+        item_prompt = f"""
+    Title: {row['title']}
+    Content: {row['content']}
+    """
+        start = time.perf_counter()
+        result, _ = run_cascade(
+            "score",
+            lambda model: gather.score_with_model(model, item_prompt, row['title']),
+            gather.validate_scores,
+            policy=policy,
+        )
+        latencies.append(time.perf_counter() - start)
+        scores.append(result)
+
+    calls = recorder.calls[first_call:]
+    by_model = {}
+    for model, _ in calls:
+        by_model[model] = by_model.get(model, 0) + 1
+    return {
+        'policy': policy,
+        'items': len(rows),
+        'calls': by_model,
+        'escalations': max(len(calls) - len(rows), 0) if policy == 'cascade' else 0,
+        'latency_mean': round(statistics.mean(latencies), 2) if latencies else None,
+        'latency_p90': round(sorted(latencies)[int(0.9 * (len(latencies) - 1))], 2) if latencies else None,
+        'cost_usd': round(sum(estimate_cost(model, usage) for model, usage in calls), 5),
+        'scores': scores,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scoring under each model routing policy")
+    parser.add_argument("--sample", type=int, default=20, help="Rows to score per policy (default: 20)")
+    parser.add_argument("--policies", nargs="+", choices=POLICIES, default=list(POLICIES),
+                        help="Policies to compare; 'single' (large model) is the agreement baseline")
+    parser.add_argument("--seed", type=int, default=7, help="Sampling seed (default: 7)")
+    add_language_args(parser)
+    args = parser.parse_args()
+
+    rows = sample_rows(resolve_languages(args.language), args.sample, args.seed)
+    if not rows:
+        print("❌ No gathered rows to benchmark - run 3_gather.py first")
+        return
+    print(f"🧪 Benchmarking {len(rows)} sampled rows")
+
+    gather = load_gather_module()
+    recorder = RecordingModels(gather.client.models)
+    gather.client.models = recorder
+
+    policies = ['single'] + [p for p in args.policies if p != 'single'] if 'single' in args.policies else args.policies
+    results = [run_policy(gather, recorder, policy, rows) for policy in policies]
+    baseline = next((r['scores'] for r in results if r['policy'] == 'single'), None)
+
+    print("\n📊 Routing benchmark (scoring)")
+    print(f"   {'policy':<8} {'calls':<34} {'mean s':>7} {'p90 s':>7} {'cost $':>9}  agreement vs single")
+    for result in results:
+        result['agreement'] = agreement(result['scores'], baseline) if baseline is not None else None
+        calls = ", ".join(f"{model} {n}" for model, n in result['calls'].items())
+        agree = result['agreement'] or {}
+        agree_text = (f"exact {agree['research_value_exact']:.0%}, ±1 {agree['research_value_within_1']:.0%}, tone {agree['tone_sign']:.0%}"
+                      if agree.get('compared') else "n/a")
+        print(f"   {result['policy']:<8} {calls:<34} {result['latency_mean']:>7} {result['latency_p90']:>7} {result['cost_usd']:>9.4f}  {agree_text}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = os.path.join(RESULTS_DIR, f"routing_benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'rows': [row['url'] for row in rows], 'results': results}, f, indent=2, ensure_ascii=False, default=str)
+    print(f"\n💾 Saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
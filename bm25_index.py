@@ -0,0 +1,211 @@
+"""
+BM25 inverted index over gathered rows
+Gather appends one term-frequency document per written row to an index file
+next to the theme CSVs, so the index grows as rows land and never needs a full
+rebuild. Later stages load it into postings and fetch the top-k rows for a
+query (costs, partner dynamics, ...) instead of sending whole datasets.
+
+Usage: python bm25_index.py --query "insurance cost" [-k 10] [--rebuild] [--language en]
+"""
+
+import os
+import re
+import csv
+import json
+import math
+import argparse
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from audit_log import locked
+from language_config import add_language_args, resolve_languages
+
+INDEX_FILENAME = "bm25_index.jsonl"
+INDEXED_COLUMNS = ['title', 'content', 'comments_summary', 'key_insights']
+K1 = 1.5
+B = 0.75
+
+STOPWORDS = {
+    'a', 'an', 'the', 'of', 'and', 'or', 'to', 'in', 'on', 'for', 'with', 'about', 'is', 'are', 'was', 'were',
+    'be', 'been', 'it', 'its', 'this', 'that', 'these', 'those', 'as', 'at', 'by', 'from', 'but', 'not', 'no',
+    'they', 'their', 'them', 'she', 'her', 'he', 'his', 'i', 'my', 'me', 'we', 'our', 'you', 'your', 'has',
+    'have', 'had', 'do', 'does', 'did', 'so', 'if', 'than', 'then', 'into', 'who', 'which', 'what', 'how',
+    'de', 'la', 'el', 'en', 'y', 'que', 'los', 'las', 'un', 'una', 'por', 'con', 'para', 'del', 'se', 'su',
+}
+
+_index_lock = threading.Lock()
+
+
+def tokenize(text: str) -> list:
+    """Lowercased word tokens without stopwords; a trailing plural 's' is dropped"""
+    tokens = []
+    for word in re.findall(r'\w+', (text or "").lower()):
+        if len(word) < 2 or word in STOPWORDS or word.isdigit():
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def index_path_for(csv_file) -> str:
+    """Index file shared by every theme CSV in the same folder"""
+    return os.path.join(os.path.dirname(os.path.abspath(csv_file)), INDEX_FILENAME)
+
+
+def make_document(csv_file, row: dict) -> dict:
+    terms = Counter(tokenize(" ".join(row.get(column) or "" for column in INDEXED_COLUMNS)))
+    return {
+        'csv': os.path.basename(str(csv_file)),
+        'url': row.get('url', ''),
+        'timestamp': row.get('timestamp', ''),
+        'length': sum(terms.values()),
+        'tf': dict(terms),
+    }
+
+
+def append_document(csv_file, row: dict):
+    """Index one freshly written CSV row (called by gather after each append)"""
+    document = make_document(csv_file, row)
+    with _index_lock:
+        with open(index_path_for(csv_file), 'a', encoding='utf-8') as handle, locked(handle):
+            handle.write(json.dumps(document, ensure_ascii=False) + "\n")
+
+
+class BM25Index:
+    """In-memory postings for one gather folder, loaded from its index file"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.path = self.directory / INDEX_FILENAME
+        self.documents = []
+        self.postings = defaultdict(dict)
+        self.total_length = 0
+        self._load()
+
+    def _load(self):
+        self.documents = []
+        self.postings = defaultdict(dict)
+        self.total_length = 0
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as handle:
+            for line in handle:
+                if line.strip():
+                    self._add(json.loads(line))
+
+    def _add(self, document: dict):
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        self.total_length += document['length']
+        for term, count in document['tf'].items():
+            self.postings[term][doc_id] = count
+
+    def _keys(self, csv_name: str) -> Counter:
+        return Counter((d['url'], d['timestamp']) for d in self.documents if d['csv'] == csv_name)
+
+    def sync(self, csv_file, rows: list | None = None) -> bool:
+        """Reindex one CSV if its rows no longer match the index (new file, replay, manual edits)
+
+        rows are the CSV's dict rows if the caller already loaded them. Returns
+        True if the CSV was reindexed.
+        """
+        csv_name = os.path.basename(str(csv_file))
+        if rows is None:
+            with open(csv_file, 'r', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        if self._keys(csv_name) == Counter((row.get('url', ''), row.get('timestamp', '')) for row in rows):
+            return False
+
+        kept = [d for d in self.documents if d['csv'] != csv_name]
+        documents = kept + [make_document(csv_name, row) for row in rows]
+        with _index_lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a+', encoding='utf-8') as handle, locked(handle):
+                handle.seek(0)
+                handle.truncate()
+                for document in documents:
+                    handle.write(json.dumps(document, ensure_ascii=False) + "\n")
+        self._load()
+        return True
+
+    def rebuild(self, csv_files: list) -> int:
+        """Reindex every given CSV; returns the number of documents"""
+        for csv_file in csv_files:
+            self.sync(csv_file)
+        return len(self.documents)
+
+    def search(self, query: str, k: int = 10, csv_file=None) -> list:
+        """Top-k (score, document) pairs for a query, optionally limited to one theme CSV"""
+        if not self.documents:
+            return []
+        csv_name = os.path.basename(str(csv_file)) if csv_file else None
+        count = len(self.documents)
+        average_length = self.total_length / count or 1.0
+
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = self.documents[doc_id]['length']
+                scores[doc_id] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / average_length))
+
+        ranked = sorted(
+            ((score, doc_id) for doc_id, score in scores.items()
+             if csv_name is None or self.documents[doc_id]['csv'] == csv_name),
+            reverse=True,
+        )
+        return [(round(score, 3), self.documents[doc_id]) for score, doc_id in ranked[:k]]
+
+    def top_rows(self, query: str, rows: list, k: int = 10, csv_file=None) -> list:
+        """The (row_number, row) pairs among rows that best match a query, best first"""
+        by_key = {(row.get('url', ''), row.get('timestamp', '')): (row_number, row) for row_number, row in rows}
+        matches = []
+        for _, document in self.search(query, len(self.documents), csv_file):
+            pair = by_key.get((document['url'], document['timestamp']))
+            if pair is not None:
+                matches.append(pair)
+                if len(matches) >= k:
+                    break
+        return matches
+
+
+def load_index_for(csv_file, rows: list | None = None) -> BM25Index:
+    """Index for a theme CSV's folder, reindexing that CSV first if it is stale"""
+    index = BM25Index(os.path.dirname(os.path.abspath(csv_file)))
+    if index.sync(csv_file, rows):
+        print(f"🗂️ Reindexed {os.path.basename(str(csv_file))} for retrieval ({len(index.documents)} documents)")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the BM25 index of gathered rows")
+    parser.add_argument("--query", "-q", help="Search terms")
+    parser.add_argument("-k", type=int, default=10, help="Results to show (default: 10)")
+    parser.add_argument("--csv", help="Only search this theme CSV (file name)")
+    parser.add_argument("--rebuild", action="store_true", help="Reindex every theme CSV from scratch")
+    add_language_args(parser)
+    args = parser.parse_args()
+
+    for language in resolve_languages(args.language):
+        directory = Path(f"findings/3_gather-{language}")
+        csv_files = sorted(directory.glob(f"gathered_data-*-{language}.csv"))
+        if not csv_files:
+            print(f"❌ No gathered data for language '{language}'")
+            continue
+        if args.rebuild and (directory / INDEX_FILENAME).exists():
+            os.remove(directory / INDEX_FILENAME)
+        index = BM25Index(directory)
+        print(f"🗂️ {language}: {index.rebuild(csv_files)} documents indexed")
+
+        if args.query:
+            for score, document in index.search(args.query, args.k, args.csv):
+                print(f"   {score:6.2f}  {document['csv']}  {document['url']}")
+
+
+if __name__ == "__main__":
+    main()
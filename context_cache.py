@@ -0,0 +1,262 @@
+"""
+Explicit Gemini context caching for repeated prompt prefixes
+Long fixed prefixes (instruction blocks, rubrics, datasets) are uploaded once
+as server-side cached content and referenced by name on later calls, so they
+are not re-sent and re-processed each time. A small registry file remembers
+live caches across runs until they expire.
+
+Set GEMINI_BASE_URL to point every stage at a local stand-in server, and
+GEMINI_CONTEXT_CACHE=off to disable caching.
+
+Usage: python context_cache.py [--list] [--clear]
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+
+from google.genai import types
+
+DEFAULT_REGISTRY = "findings/logs/context_caches.json"
+DEFAULT_TTL_SECONDS = 60 * 60
+REUSE_MARGIN_SECONDS = 120  # don't hand out a cache that could expire mid-call
+CHARS_PER_TOKEN = 4
+# Smallest prefix the API will cache, by model family
+MIN_CACHE_TOKENS = {'flash': 1024, 'pro': 4096}
+
+
+def client_http_options():
+    """HttpOptions for genai.Client, honouring GEMINI_BASE_URL (e.g. a local stand-in server)"""
+    base_url = os.environ.get("GEMINI_BASE_URL")
+    return types.HttpOptions(base_url=base_url) if base_url else None
+
+
+def caching_enabled() -> bool:
+    return os.environ.get("GEMINI_CONTEXT_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+
+def min_tokens_for(model: str) -> int:
+    override = os.environ.get("GEMINI_CACHE_MIN_TOKENS")
+    if override:
+        return int(override)
+    return MIN_CACHE_TOKENS['flash'] if 'flash' in model else MIN_CACHE_TOKENS['pro']
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_missing_cache_error(error: Exception) -> bool:
+    """True if a call failed because its cached content no longer exists (deleted or expired)"""
+    if getattr(error, 'code', None) == 404 or getattr(error, 'status', None) == 'NOT_FOUND':
+        return True
+    message = str(error).lower()
+    return 'cache' in message and ('not found' in message or 'expired' in message)
+
+
+class ContextCacheManager:
+    """Create, reuse and expire cached contents keyed by (model, prefix)
+
+    `prepare` returns the contents and config for one call: the suffix plus a
+    cached_content reference when the prefix is cached, otherwise the whole
+    prompt unchanged; a cache that can't be created falls back to the
+    uncached prompt. `run` also covers a cache that disappears before use
+    (cleared elsewhere or expired): it forgets it and retries uncached.
+    """
+
+    def __init__(self, client, registry_path: str = DEFAULT_REGISTRY,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS, enabled: bool | None = None):
+        self.client = client
+        self.registry_path = registry_path
+        self.ttl_seconds = ttl_seconds
+        self.enabled = caching_enabled() if enabled is None else enabled
+        self.lock = threading.Lock()
+        self.stats = {
+            'created': 0, 'reused': 0, 'too_small': 0, 'errors': 0, 'fallbacks': 0,
+            'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0,
+        }
+
+    # --- Registry ---
+
+    def _read_registry(self) -> dict:
+        if not os.path.exists(self.registry_path):
+            return {}
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_registry(self, registry: dict):
+        os.makedirs(os.path.dirname(os.path.abspath(self.registry_path)), exist_ok=True)
+        temp_path = f"{self.registry_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(registry, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.registry_path)
+
+    @staticmethod
+    def cache_key(model: str, prefix: str) -> str:
+        return hashlib.sha256(f"{model}\0{prefix}".encode('utf-8')).hexdigest()[:32]
+
+    # --- Caches ---
+
+    def get_cache(self, model: str, prefix: str, label: str) -> str | None:
+        """Name of a live cache holding prefix, creating one if needed; None if not cacheable"""
+        if not self.enabled:
+            return None
+        if estimate_tokens(prefix) < min_tokens_for(model):
+            with self.lock:
+                self.stats['too_small'] += 1
+            return None
+
+        key = self.cache_key(model, prefix)
+        with self.lock:
+            registry = self._read_registry()
+            entry = registry.get(key)
+            if entry and entry['expires'] - time.time() > REUSE_MARGIN_SECONDS:
+                self.stats['reused'] += 1
+                return entry['name']
+
+            try:
+                cache = self.client.caches.create(model=model, config=types.CreateCachedContentConfig(
+                    contents=[prefix],
+                    display_name=label[:100],
+                    ttl=f"{self.ttl_seconds}s",
+                ))
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"   ⚠️ Context cache for {label} unavailable, sending full prompt: {str(e)[:120]}")
+                return None
+
+            registry[key] = {
+                'name': cache.name,
+                'label': label,
+                'model': model,
+                'tokens': estimate_tokens(prefix),
+                'created': time.time(),
+                'expires': time.time() + self.ttl_seconds,
+            }
+            self._write_registry(registry)
+            self.stats['created'] += 1
+        print(f"   🧊 Cached {label} (~{estimate_tokens(prefix):,} tokens) as {cache.name}")
+        return cache.name
+
+    def prepare(self, model: str, prefix: str, suffix: str, label: str, config=None) -> tuple:
+        """(contents, config) for a call whose prompt is prefix + suffix"""
+        name = self.get_cache(model, prefix, label)
+        if name is None:
+            return prefix + suffix, config
+        if config is None:
+            config = types.GenerateContentConfig(cached_content=name)
+        else:
+            config = config.model_copy(update={'cached_content': name})
+        return suffix, config
+
+    def run(self, model: str, prefix: str, suffix: str, label: str, call, config=None):
+        """call(contents, config) with the prefix served from cache when possible
+
+        If the call fails because the cache is gone on the server, it is
+        forgotten and the call is retried once with the full prompt. Any other
+        error (a dropped stream, a 429, a timeout) leaves the cache alone and
+        propagates to the caller.
+        """
+        contents, cached_config = self.prepare(model, prefix, suffix, label, config)
+        name = getattr(cached_config, 'cached_content', None) if cached_config is not config else None
+        if not name:
+            return call(contents, cached_config)
+        try:
+            return call(contents, cached_config)
+        except Exception as e:
+            if not is_missing_cache_error(e):
+                raise
+            print(f"   ⚠️ Cached {label} is gone ({str(e)[:120]}); expiring {name} and retrying uncached")
+            with self.lock:
+                self.stats['fallbacks'] += 1
+            self.expire(name)
+            return call(prefix + suffix, config)
+
+    def release(self, model: str, prefix: str) -> bool:
+        """Expire the cache holding a prefix that won't be used again (e.g. a one-shot dataset)"""
+        with self.lock:
+            entry = self._read_registry().get(self.cache_key(model, prefix))
+        return self.expire(entry['name']) if entry else False
+
+    def record(self, usage_metadata):
+        """Count prompt and cache-served tokens from a response's usage metadata"""
+        with self.lock:
+            self.stats['calls'] += 1
+            if usage_metadata is None:
+                return
+            self.stats['prompt_tokens'] += usage_metadata.prompt_token_count or 0
+            self.stats['cached_tokens'] += usage_metadata.cached_content_token_count or 0
+
+    def expire(self, name: str) -> bool:
+        """Delete a cache on the server and forget it"""
+        with self.lock:
+            registry = self._read_registry()
+            registry = {key: entry for key, entry in registry.items() if entry['name'] != name}
+            self._write_registry(registry)
+        try:
+            self.client.caches.delete(name=name)
+            return True
+        except Exception as e:
+            print(f"   ⚠️ Could not delete {name}: {str(e)[:120]}")
+            return False
+
+    def purge_expired(self) -> int:
+        """Drop registry entries whose caches have already expired on the server"""
+        with self.lock:
+            registry = self._read_registry()
+            live = {key: entry for key, entry in registry.items() if entry['expires'] > time.time()}
+            if len(live) != len(registry):
+                self._write_registry(live)
+            return len(registry) - len(live)
+
+    def savings_summary(self) -> dict:
+        stats = dict(self.stats)
+        stats['cached_share'] = round(stats['cached_tokens'] / stats['prompt_tokens'], 3) if stats['prompt_tokens'] else 0.0
+        return stats
+
+    def print_summary(self):
+        stats = self.savings_summary()
+        if not (stats['created'] or stats['reused'] or stats['cached_tokens'] or stats['too_small'] or stats['errors']):
+            return
+        fallbacks = f" | {stats['fallbacks']} calls retried uncached" if stats['fallbacks'] else ""
+        print(f"🧊 Context cache: {stats['created']} created, {stats['reused']} reused, "
+              f"{stats['too_small']} prefixes below the cache minimum, {stats['errors']} errors | "
+              f"{stats['cached_tokens']:,} of {stats['prompt_tokens']:,} prompt tokens served from cache ({stats['cached_share']:.0%}){fallbacks}")
+
+
+def main():
+    from google import genai
+
+    parser = argparse.ArgumentParser(description="Inspect or clear Gemini context caches made by the pipeline")
+    parser.add_argument("--registry", default=DEFAULT_REGISTRY, help=f"Registry file (default: {DEFAULT_REGISTRY})")
+    parser.add_argument("--list", action="store_true", help="List registered caches")
+    parser.add_argument("--clear", action="store_true", help="Delete every registered cache on the server")
+    args = parser.parse_args()
+
+    manager = ContextCacheManager(
+        genai.Client(api_key=os.environ.get("GOOGLE_API_KEY"), http_options=client_http_options()),
+        args.registry,
+    )
+    purged = manager.purge_expired()
+    if purged:
+        print(f"🧹 Forgot {purged} expired caches")
+
+    registry = manager._read_registry()
+    if args.list or not args.clear:
+        print(f"🧊 {len(registry)} live caches")
+        for entry in registry.values():
+            minutes = (entry['expires'] - time.time()) / 60
+            print(f"   • {entry['name']} | {entry['label']} | ~{entry['tokens']:,} tokens | expires in {minutes:.0f} min")
+    if args.clear:
+        deleted = sum(manager.expire(entry['name']) for entry in registry.values())
+        print(f"🗑️ Deleted {deleted} caches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Request hedging for tail latency
+Keeps a sliding window of observed latencies per call type. A call that has
+not answered by the window's p90/p95 gets one duplicate request, and whichever
+answers first is used. Hedges are capped at a share of calls so the extra
+load stays bounded, and each hedge that wins records how much latency it saved.
+"""
+
+import math
+import threading
+from collections import deque
+
+DEFAULT_PERCENTILE = 95
+DEFAULT_MAX_HEDGE_RATE = 0.1  # at most 1 hedge per 10 calls
+MIN_SAMPLES = 8  # no hedging until the percentile means something
+WINDOW = 100
+MIN_DELAY_SECONDS = 1.0
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+class Hedger:
+    """Thread-safe hedge delays, rate cap and savings per call type"""
+
+    def __init__(self, enabled: bool = False, percentile: float = DEFAULT_PERCENTILE,
+                 max_rate: float = DEFAULT_MAX_HEDGE_RATE, min_samples: int = MIN_SAMPLES, window: int = WINDOW):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.stats = {}
+
+    def configure(self, enabled: bool, percentile: float = DEFAULT_PERCENTILE, max_rate: float = DEFAULT_MAX_HEDGE_RATE):
+        with self.lock:
+            self.enabled = enabled
+            self.percentile = percentile
+            self.max_rate = max_rate
+
+    def _stats(self, call_type: str) -> dict:
+        return self.stats.setdefault(call_type, {
+            'calls': 0, 'hedged': 0, 'capped': 0, 'won': 0, 'lost': 0, 'abandoned': 0, 'saved_seconds': [],
+        })
+
+    def record_latency(self, call_type: str, seconds: float):
+        """One observed (unhedged) latency, e.g. a primary request's time to first chunk"""
+        with self.lock:
+            self.samples.setdefault(call_type, deque(maxlen=self.window)).append(seconds)
+
+    def delay(self, call_type: str) -> float | None:
+        """Seconds to wait before hedging, or None while there are too few samples"""
+        with self.lock:
+            samples = list(self.samples.get(call_type, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return max(percentile(samples, self.percentile), MIN_DELAY_SECONDS)
+
+    def start_call(self, call_type: str) -> float | None:
+        """Count a call; returns its hedge delay, or None if it won't be hedged"""
+        with self.lock:
+            self._stats(call_type)['calls'] += 1
+        return self.delay(call_type) if self.enabled else None
+
+    def allow_hedge(self, call_type: str) -> bool:
+        """Claim a hedge unless that would push the hedge rate over the cap"""
+        with self.lock:
+            stats = self._stats(call_type)
+            if stats['hedged'] + 1 > self.max_rate * stats['calls']:
+                stats['capped'] += 1
+                return False
+            stats['hedged'] += 1
+            return True
+
+    def record_outcome(self, call_type: str, hedge_won: bool):
+        """Whether a fired hedge answered before the original request"""
+        with self.lock:
+            self._stats(call_type)['won' if hedge_won else 'lost'] += 1
+
+    def record_abandoned(self, call_type: str):
+        """A raced request whose stream went unused: the other one answered first, or it failed while the other carried on"""
+        with self.lock:
+            self._stats(call_type)['abandoned'] += 1
+
+    def record_saving(self, call_type: str, seconds: float):
+        """How much later than a winning hedge the original request answered"""
+        with self.lock:
+            self._stats(call_type)['saved_seconds'].append(seconds)
+
+    def summary(self, call_type: str) -> dict:
+        with self.lock:
+            stats = dict(self._stats(call_type))
+            samples = list(self.samples.get(call_type, ()))
+        saved = stats.pop('saved_seconds')
+        stats['hedge_rate'] = round(stats['hedged'] / stats['calls'], 3) if stats['calls'] else 0.0
+        stats['saved_seconds'] = round(sum(saved), 1)
+        stats['max_saved_seconds'] = round(max(saved), 1) if saved else 0.0
+        stats[f'p{self.percentile:g}_seconds'] = round(percentile(samples, self.percentile), 1) if samples else None
+        return stats
+
+    def print_summary(self, call_type: str):
+        if not self.enabled:
+            return
+        stats = self.summary(call_type)
+        threshold = stats[f'p{self.percentile:g}_seconds']
+        print(f"⚡ Hedged {call_type}: {stats['hedged']} of {stats['calls']} calls ({stats['hedge_rate']:.0%}, cap {self.max_rate:.0%}) "
+              f"at p{self.percentile:g} = {threshold if threshold is not None else 'n/a'}s | "
+              f"{stats['won']} won, {stats['lost']} lost, {stats['capped']} capped, {stats['abandoned']} streams abandoned | "
+              f"tail latency saved {stats['saved_seconds']}s (max {stats['max_saved_seconds']}s)")
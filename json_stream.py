@@ -0,0 +1,93 @@
+"""
+Incremental JSON parsing for streamed model responses
+Yields each object of a JSON array as soon as its closing brace arrives.
+"""
+
+import json
+
+
+class IncrementalJSONArrayParser:
+    """Extract complete top-level objects from a JSON array fed in text chunks
+
+    Text before the first '[' (preambles, ```json fences) is ignored, as is
+    anything after the closing ']'. Objects that fail to decode are counted in
+    `errors` and skipped so one malformed item doesn't lose the rest.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.in_array = False
+        self.finished = False
+        self.depth = 0
+        self.object_start = None
+        self.in_string = False
+        self.escaped = False
+        self.objects_parsed = 0
+        self.errors = 0
+
+    def feed(self, text: str) -> list:
+        """Consume a chunk of text and return the objects completed by it"""
+        if self.finished or not text:
+            return []
+
+        self.buffer += text
+        completed = []
+
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+
+            if not self.in_array:
+                if char == '[':
+                    self.in_array = True
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                if self.depth > 0:
+                    self.in_string = True
+            elif char == '{':
+                if self.depth == 0:
+                    self.object_start = self.position
+                self.depth += 1
+            elif char == '}' and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    parsed = self._decode(self.buffer[self.object_start:self.position + 1])
+                    if parsed is not None:
+                        completed.append(parsed)
+                    self.object_start = None
+            elif char == ']' and self.depth == 0:
+                self.finished = True
+                self.position += 1
+                break
+
+            self.position += 1
+
+        self._compact()
+        return completed
+
+    def _decode(self, text: str):
+        try:
+            parsed = json.loads(text)
+        except json.JSONDecodeError:
+            self.errors += 1
+            return None
+        if not isinstance(parsed, dict):
+            self.errors += 1
+            return None
+        self.objects_parsed += 1
+        return parsed
+
+    def _compact(self):
+        """Drop consumed text so the buffer only holds the object in progress"""
+        keep_from = self.object_start if self.object_start is not None else self.position
+        if keep_from > 0:
+            self.buffer = self.buffer[keep_from:]
+            self.position -= keep_from
+            if self.object_start is not None:
+                self.object_start = 0
@@ -14,6 +14,12 @@ LANGUAGES = {
         'fertility_terms': [
             'fertility journey', 'trying to conceive', 'TTC', 'infertility',
             'IVF', 'IUI', 'fertility struggles', 'conception difficulties'
+        ],
+        # Counted in gathered rows by quant_stats.py
+        'stats_keywords': [
+            'ivf', 'iui', 'egg freezing', 'miscarriage', 'pcos', 'endometriosis', 'unexplained',
+            'insurance', 'cost', 'clinic', 'doctor', 'partner', 'husband', 'anxiety', 'depression',
+            'grief', 'hope', 'support group', 'therapy', 'waiting',
         ]
     },
     'es': {
@@ -24,6 +30,11 @@ LANGUAGES = {
             'viaje de fertilidad', 'tratando de concebir', 'infertilidad',
             'FIV', 'IIU', 'problemas de fertilidad', 'dificultades para concebir',
             'embarazo', 'reproducción asistida'
+        ],
+        'stats_keywords': [
+            'fiv', 'iiu', 'congelación de óvulos', 'aborto espontáneo', 'sop', 'endometriosis', 'sin causa aparente',
+            'seguro', 'costo', 'clínica', 'médico', 'pareja', 'marido', 'esposo', 'ansiedad', 'depresión',
+            'duelo', 'esperanza', 'grupo de apoyo', 'terapia', 'espera',
         ]
     }
 }
@@ -32,11 +43,23 @@ def add_language_args(parser: argparse.ArgumentParser):
     """Add language arguments to argument parser"""
     parser.add_argument(
         '--language', '-l',
-        choices=list(LANGUAGES.keys()),
-        default='en',
-        help=f"Language for search and output. Options: {', '.join(LANGUAGES.keys())} (default: en)"
+        nargs='+',
+        choices=list(LANGUAGES.keys()) + ['all'],
+        default=['en'],
+        help=f"One or more languages for search and output, run concurrently. Options: {', '.join(LANGUAGES.keys())}, all (default: en)"
     )
 
+def resolve_languages(values) -> list:
+    """Expand --language values into language codes ('all' means every supported language)"""
+    if isinstance(values, str):
+        values = [values]
+    languages = []
+    for value in values:
+        for language in (LANGUAGES.keys() if value == 'all' else [value]):
+            if language not in languages:
+                languages.append(language)
+    return languages
+
 def get_language_config(language: str) -> dict:
     """Get language configuration"""
     if language not in LANGUAGES:
@@ -64,6 +87,11 @@ def get_fertility_terms(language: str) -> list:
     config = get_language_config(language)
     return config['fertility_terms']
 
+def get_stats_keywords(language: str) -> list:
+    """Get keywords whose prevalence is counted in gathered rows (empty if none are defined)"""
+    config = get_language_config(language)
+    return config.get('stats_keywords', [])
+
 def get_folder_name(step: int, base_name: str, language: str) -> str:
     """Get language-tagged folder name with step number"""
     return f"findings/{step}_{base_name}-{language}"
@@ -0,0 +1,136 @@
+"""
+Per-call-type model routing
+Small, structured calls (scoring, discovery, JSON extraction) go to a fast
+model and long interpretive generations (coding, analysis, synthesis) to the
+large one. In cascade mode a call type with a validator tries the fast model
+first and escalates only when its output fails validation.
+
+Environment:
+  GEMINI_MODEL              large model (default gemini-2.5-pro)
+  GEMINI_FAST_MODEL         fast model (default gemini-2.5-flash)
+  GEMINI_ROUTING            single | tiered | cascade (default tiered)
+  GEMINI_MODEL_<CALL_TYPE>  pin one call type to a model, e.g. GEMINI_MODEL_SCORE
+"""
+
+import os
+import threading
+
+LARGE_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.5-pro")
+FAST_MODEL = os.environ.get("GEMINI_FAST_MODEL", "gemini-2.5-flash")
+
+POLICIES = ('single', 'tiered', 'cascade')
+DEFAULT_POLICY = 'tiered'
+
+# Which tier each call type uses under the tiered and cascade policies
+CALL_TYPE_TIERS = {
+    'discover': 'fast',
+    'search': 'large',
+    'score': 'fast',
+    'coding': 'large',
+    'extract': 'fast',
+    'analysis': 'large',
+    'synthesis': 'large',
+}
+
+# USD per million (input, output) tokens at list price, for cost estimates only
+PRICES_PER_MILLION = {
+    'gemini-2.5-pro': (1.25, 10.00),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-2.5-flash-lite': (0.10, 0.40),
+}
+
+
+def routing_policy() -> str:
+    policy = os.environ.get("GEMINI_ROUTING", DEFAULT_POLICY).lower()
+    return policy if policy in POLICIES else DEFAULT_POLICY
+
+
+def _pinned(call_type: str) -> str | None:
+    return os.environ.get(f"GEMINI_MODEL_{call_type.upper()}")
+
+
+def model_for(call_type: str, policy: str | None = None) -> str:
+    """Model a call type starts on under the routing policy"""
+    pinned = _pinned(call_type)
+    if pinned:
+        return pinned
+    if (policy or routing_policy()) == 'single':
+        return LARGE_MODEL
+    return FAST_MODEL if CALL_TYPE_TIERS.get(call_type) == 'fast' else LARGE_MODEL
+
+
+def cascade_models(call_type: str, policy: str | None = None) -> list:
+    """Models to try in order: fast then large in cascade mode, otherwise just one"""
+    policy = policy or routing_policy()
+    first = model_for(call_type, policy)
+    if policy == 'cascade' and not _pinned(call_type) and first != LARGE_MODEL:
+        return [first, LARGE_MODEL]
+    return [first]
+
+
+def estimate_cost(model: str, usage_metadata) -> float:
+    """List-price USD cost of one call from its usage metadata (0 for unknown models)"""
+    if usage_metadata is None:
+        return 0.0
+    input_price, output_price = PRICES_PER_MILLION.get(model, (0.0, 0.0))
+    prompt = usage_metadata.prompt_token_count or 0
+    output = (usage_metadata.candidates_token_count or 0) + (getattr(usage_metadata, 'thoughts_token_count', 0) or 0)
+    return (prompt * input_price + output * output_price) / 1_000_000
+
+
+class RoutingStats:
+    """Thread-safe per-call-type counts of which model answered and why calls escalated"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.escalations = {}
+
+    def record(self, call_type: str, model: str):
+        with self.lock:
+            by_model = self.calls.setdefault(call_type, {})
+            by_model[model] = by_model.get(model, 0) + 1
+
+    def record_escalation(self, call_type: str, reason: str):
+        with self.lock:
+            reasons = self.escalations.setdefault(call_type, {})
+            reasons[reason] = reasons.get(reason, 0) + 1
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {'calls': {k: dict(v) for k, v in self.calls.items()},
+                    'escalations': {k: dict(v) for k, v in self.escalations.items()}}
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary['calls']:
+            return
+        print(f"🔀 Model routing ({routing_policy()}):")
+        for call_type, by_model in summary['calls'].items():
+            models = ", ".join(f"{model} {count}" for model, count in by_model.items())
+            reasons = summary['escalations'].get(call_type)
+            escalated = f" | escalated: {', '.join(f'{r} {n}' for r, n in reasons.items())}" if reasons else ""
+            print(f"   • {call_type}: {models}{escalated}")
+
+
+routing_stats = RoutingStats()
+
+
+def run_cascade(call_type: str, attempt, validate, policy: str | None = None):
+    """Run attempt(model) along the cascade until validate(result) passes
+
+    validate returns None when the result is acceptable, or a short reason
+    to escalate. The last model's result is returned even if it fails.
+    Returns (result, model).
+    """
+    models = cascade_models(call_type, policy)
+    for position, model in enumerate(models):
+        result = attempt(model)
+        routing_stats.record(call_type, model)
+        if position == len(models) - 1:
+            return result, model
+        failure = validate(result)
+        if failure is None:
+            return result, model
+        routing_stats.record_escalation(call_type, failure)
+        print(f"      ⤴️ {call_type} on {model} escalating to {models[position + 1]}: {failure}")
@@ -0,0 +1,130 @@
+"""
+Near-duplicate content detection
+MinHash signatures banded into a locality-sensitive hash index, so each lookup
+only compares against the few items sharing a band bucket instead of every
+item seen so far.
+"""
+
+import re
+import random
+import threading
+import zlib
+
+NUM_PERM = 64
+BANDS = 8  # 8 bands x 8 rows: pairs around 0.8 similarity almost always share a bucket
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+MIN_WORDS = 8  # shorter content (titles only, mock results) is never treated as a duplicate
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingles(text: str) -> set:
+    """Word n-gram hashes of normalized text"""
+    words = re.findall(r'\w+', (text or "").lower())
+    if len(words) < MIN_WORDS:
+        return set()
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(text: str) -> tuple | None:
+    """MinHash signature of text, or None if it is too short to compare"""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def estimate_similarity(a: tuple, b: tuple) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class NearDuplicateIndex:
+    """Thread-safe LSH index of content signatures with the scores they received
+
+    Entries added before their content is scored carry an unset `ready` event;
+    a later duplicate can wait on it and reuse the score once it lands.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.size = 0
+        self.rows = NUM_PERM // BANDS
+
+    def _bands(self, signature: tuple):
+        for band in range(BANDS):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def _find(self, signature: tuple):
+        best, best_similarity = None, 0.0
+        seen = set()
+        for key in self._bands(signature):
+            for entry in self.buckets.get(key, []):
+                if id(entry) in seen:
+                    continue
+                seen.add(id(entry))
+                similarity = estimate_similarity(signature, entry['signature'])
+                if similarity >= self.threshold and similarity > best_similarity:
+                    best, best_similarity = entry, similarity
+        if best is not None:
+            return dict(best, similarity=round(best_similarity, 2), entry=best)
+        return None
+
+    def _add(self, signature: tuple, scores: dict | None, **info) -> dict:
+        entry = dict(info, signature=signature, scores=scores, ready=threading.Event())
+        if scores is not None:
+            entry['ready'].set()
+        for key in self._bands(signature):
+            self.buckets.setdefault(key, []).append(entry)
+        self.size += 1
+        return entry
+
+    def add(self, text: str, scores: dict | None = None, **info) -> dict | None:
+        """Index already-scored content (e.g. rows from an earlier run)"""
+        signature = minhash(text)
+        if signature is None:
+            return None
+        with self.lock:
+            return self._add(signature, scores, **info)
+
+    def check_and_add(self, text: str, **info) -> tuple:
+        """Return (match, None) for a near-duplicate, else (None, new pending entry)
+
+        Content too short to compare returns (None, None).
+        """
+        signature = minhash(text)
+        if signature is None:
+            return None, None
+        with self.lock:
+            match = self._find(signature)
+            if match is not None:
+                return match, None
+            return None, self._add(signature, None, **info)
+
+    def resolve(self, entry: dict | None, scores: dict | None):
+        """Publish the scores of a pending entry; None withdraws it from the index"""
+        if entry is None:
+            return
+        with self.lock:
+            entry['scores'] = scores
+            if scores is None:
+                for key in self._bands(entry['signature']):
+                    bucket = self.buckets.get(key, [])
+                    bucket[:] = [e for e in bucket if e is not entry]
+                self.size -= 1
+        entry['ready'].set()
+
+    def wait(self, match: dict, timeout: float | None = None) -> dict | None:
+        """Scores of a matched entry, waiting while its original is still being scored"""
+        entry = match['entry']
+        if not entry['ready'].wait(timeout):
+            return None
+        return entry['scores']
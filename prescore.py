@@ -0,0 +1,144 @@
+"""
+Local heuristic pre-scorer for search results
+Cheap signals (content length, first-person voice, source type, the search
+call's own relevance estimate, repetitive or title-only content) pick out
+clear rejects before they reach the scoring model. Rejects get a fixed low
+local score and are flagged `prefiltered`; everything else is model-scored.
+
+Usage: python prescore.py [--language en]   (dry run over gathered rows)
+"""
+
+import re
+import argparse
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+
+from language_config import add_language_args, resolve_languages
+
+MIN_WORDS = 15  # shorter content is a snippet or a title, not a story
+THIN_ARTICLE_WORDS = 60  # articles this short without comments or first-person voice carry no lived experience
+MIN_RELEVANCE = 0.3  # the search call's own relevance estimate
+MIN_UNIQUE_RATIO = 0.3  # share of distinct words; lower means repeated boilerplate
+ARTICLE_SOURCES = {'news', 'article', 'blog', 'website', 'web', 'government', 'academic', 'journal'}
+NO_COMMENTS = {'', 'n/a', 'na', 'none', 'no comments available', 'no comments captured'}
+
+# First-person markers (English and Spanish) that signal a personal account
+FIRST_PERSON = {
+    'i', "i'm", "i've", "i'd", 'im', 'ive', 'me', 'my', 'mine', 'myself', 'we', 'our', 'us',
+    'yo', 'mi', 'mis', 'estoy', 'tengo', 'nosotros', 'nuestro', 'nuestra',
+}
+MIN_FIRST_PERSON = 3
+
+# score_status values written to the gather CSVs
+STATUS_MODEL = 'model'
+STATUS_PREFILTERED = 'prefiltered'
+STATUS_PROVISIONAL = 'provisional'  # placeholder after a timeout, API or parse error; queued for re-scoring
+# Placeholder key_insights written by failed scoring calls before score_status existed ('' was a timeout)
+LEGACY_PROVISIONAL_MARKERS = {'', 'Parse error', 'Error', 'Timeout'}
+
+
+def row_score_status(row: dict) -> str:
+    """score_status of a CSV row, inferred from its scores for rows written before the column existed"""
+    if row.get('score_status'):
+        return row['score_status']
+    if row.get('emotional_tone') == 'mixed' or (row.get('key_insights') or '').strip() in LEGACY_PROVISIONAL_MARKERS:
+        return STATUS_PROVISIONAL
+    return STATUS_MODEL
+
+
+def _words(text: str) -> list:
+    return re.findall(r"[\w']+", (text or "").lower())
+
+
+def reject_reasons(result: dict) -> list:
+    """Reasons a search result is a clear reject; empty if it should be model-scored"""
+    words = _words(result.get('content', ''))
+    reasons = []
+    if len(words) < MIN_WORDS:
+        reasons.append(f"too short ({len(words)} words)")
+
+    try:
+        if float(result.get('relevance', 1.0)) < MIN_RELEVANCE:
+            reasons.append("low search relevance")
+    except (TypeError, ValueError):
+        pass
+
+    if len(words) >= MIN_WORDS and len(set(words)) / len(words) < MIN_UNIQUE_RATIO:
+        reasons.append("repetitive content")
+    title_words = _words(result.get('title', ''))
+    if words and words == title_words:
+        reasons.append("content repeats the title")
+
+    first_person = sum(1 for word in words if word in FIRST_PERSON)
+    source = (result.get('source') or '').strip().lower()
+    comments = (result.get('comments_summary') or '').strip().lower()
+    if (source in ARTICLE_SOURCES and comments in NO_COMMENTS
+            and first_person < MIN_FIRST_PERSON and len(words) < THIN_ARTICLE_WORDS):
+        reasons.append(f"thin {source} without comments or first-person voice")
+    return reasons
+
+
+def local_scores(reasons: list) -> dict:
+    """Scores written for a pre-filtered reject, in the shape of a model score"""
+    return {
+        "research_value": 1,
+        "emotional_tone": 0,
+        "detail_level": 1,
+        "personal_story": False,
+        "key_insights": f"Pre-filtered: {'; '.join(reasons)}",
+        "score_status": STATUS_PREFILTERED,
+    }
+
+
+def prescore(result: dict) -> dict | None:
+    """Local scores for a clear reject, or None if the result needs the model"""
+    reasons = reject_reasons(result)
+    return local_scores(reasons) if reasons else None
+
+
+class PrefilterStats:
+    """Counts of rejected results and their reasons for a run (not thread-safe on its own)"""
+
+    def __init__(self):
+        self.rejected = 0
+        self.reasons = Counter()
+
+    def record(self, scores: dict):
+        self.rejected += 1
+        for reason in scores['key_insights'].removeprefix("Pre-filtered: ").split('; '):
+            self.reasons[re.sub(r" \(\d+ words\)$", "", reason)] += 1
+
+    def summary(self) -> str:
+        if not self.rejected:
+            return "0"
+        return f"{self.rejected} ({', '.join(f'{reason} {n}' for reason, n in self.reasons.most_common())})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dry-run the pre-filter over gathered rows")
+    add_language_args(parser)
+    args = parser.parse_args()
+
+    for language in resolve_languages(args.language):
+        csv_files = sorted(Path(f"findings/3_gather-{language}").glob(f"gathered_data-*-{language}.csv"))
+        if not csv_files:
+            print(f"❌ No gathered data for language '{language}'")
+            continue
+        rows = pd.concat([pd.read_csv(f, dtype=str, keep_default_na=False) for f in csv_files], ignore_index=True)
+        stats = PrefilterStats()
+        rejected_values = Counter()
+        for row in rows.to_dict('records'):
+            scores = prescore(row)
+            if scores is not None:
+                stats.record(scores)
+                rejected_values[row.get('research_value', '')] += 1
+        print(f"🧹 {language}: {stats.rejected} of {len(rows)} rows would skip the scoring model")
+        if stats.rejected:
+            print(f"   • Reasons: {stats.summary()}")
+            print(f"   • Their model research values: {dict(sorted(rejected_values.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Local quantitative stats over gathered theme CSVs
+Score distributions, source mix and keyword prevalence are counted with pandas
+in milliseconds, so reports cite exact numbers instead of model estimates.
+
+Usage: python quant_stats.py [--language en] [--keywords ivf insurance ...]
+"""
+
+import re
+import json
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from language_config import add_language_args, resolve_languages, get_stats_keywords
+from prescore import row_score_status, STATUS_PREFILTERED, STATUS_PROVISIONAL
+
+SCORE_COLUMNS = ['research_value', 'emotional_tone', 'detail_level']
+TEXT_COLUMNS = ['title', 'content', 'key_insights']
+TOP_SOURCES = 10
+
+
+def load_gathered(csv_file) -> pd.DataFrame:
+    """Read a gather CSV as strings, with missing columns added empty"""
+    df = pd.read_csv(csv_file, dtype=str, keep_default_na=False)
+    for column in SCORE_COLUMNS + TEXT_COLUMNS + ['personal_story', 'source', 'url', 'score_status']:
+        if column not in df.columns:
+            df[column] = ""
+    return df
+
+
+def _distribution(series: pd.Series) -> dict:
+    """Count, mean, median and per-value counts of a numeric column (non-numeric values ignored)"""
+    values = pd.to_numeric(series, errors='coerce').dropna()
+    if values.empty:
+        return {'count': 0, 'mean': None, 'median': None, 'counts': {}}
+    counts = values.astype(int).value_counts().sort_index()
+    return {
+        'count': int(values.size),
+        'mean': round(float(values.mean()), 2),
+        'median': float(values.median()),
+        'counts': {str(value): int(n) for value, n in counts.items()},
+    }
+
+
+def keyword_prevalence(df: pd.DataFrame, keywords: list) -> dict:
+    """Rows (and share of rows) whose title, content or insights mention each keyword"""
+    if df.empty or not keywords:
+        return {}
+    text = df[TEXT_COLUMNS].agg(' '.join, axis=1).str.lower()
+    prevalence = {}
+    for keyword in keywords:
+        hits = int(text.str.contains(rf"\b{re.escape(keyword.lower())}\b", regex=True).sum())
+        prevalence[keyword] = {'rows': hits, 'share': round(hits / len(df), 3)}
+    return dict(sorted(prevalence.items(), key=lambda item: item[1]['rows'], reverse=True))
+
+
+def topic_stats(df: pd.DataFrame, keywords: list | None = None) -> dict:
+    """Exact per-topic numbers for a gathered theme (no keyword prevalence without keywords)"""
+    rows = len(df)
+    status = pd.Series([row_score_status(row) for row in df.to_dict('records')], index=df.index, dtype=object)
+    # Provisional rows hold placeholder scores until the re-score backlog replaces them
+    unscored = status == STATUS_PROVISIONAL
+    prefiltered = status == STATUS_PREFILTERED  # fixed local scores, kept out of the distributions
+    scored = df[~unscored & ~prefiltered]
+
+    personal = scored['personal_story'].str.strip().str.lower().isin(['true', '1', 'yes'])
+    sources = df['source'].replace('', 'unknown').str.lower().value_counts()
+    tone = pd.to_numeric(scored['emotional_tone'], errors='coerce').dropna()
+
+    return {
+        'rows': rows,
+        'unique_urls': int(df['url'].nunique()),
+        'unscored_rows': int(unscored.sum()),
+        'prefiltered_rows': int(prefiltered.sum()),
+        'research_value': _distribution(scored['research_value']),
+        'emotional_tone': dict(
+            _distribution(scored['emotional_tone']),
+            negative_share=round(float((tone < 0).mean()), 3) if tone.size else None,
+            positive_share=round(float((tone > 0).mean()), 3) if tone.size else None,
+        ),
+        'detail_level': _distribution(scored['detail_level']),
+        'personal_story': {
+            'rows': int(personal.sum()),
+            'share': round(float(personal.mean()), 3) if len(scored) else None,
+        },
+        'sources': {source: int(n) for source, n in sources.head(TOP_SOURCES).items()},
+        'keywords': keyword_prevalence(df, keywords),
+    }
+
+
+def stats_for_file(csv_file, keywords: list | None = None, language: str = 'en') -> dict:
+    """Stats for one CSV; keywords default to the language's list in language_config"""
+    return topic_stats(load_gathered(csv_file), get_stats_keywords(language) if keywords is None else keywords)
+
+
+def _percent(share) -> str:
+    return "n/a" if share is None else f"{share:.0%}"
+
+
+def _counts_line(distribution: dict) -> str:
+    total = distribution['count']
+    return ", ".join(f"{value}: {n} ({n / total:.0%})" for value, n in distribution['counts'].items())
+
+
+def format_stats(stats: dict) -> str:
+    """Markdown block of the stats, used in prompts and at the top of reports"""
+    prefiltered = f", {stats['prefiltered_rows']} pre-filtered as low value" if stats.get('prefiltered_rows') else ""
+    lines = [
+        f"- Rows: {stats['rows']} ({stats['unique_urls']} unique URLs, {stats['unscored_rows']} without model scores{prefiltered})",
+    ]
+    for column, label in (('research_value', 'Research value (1-5)'), ('emotional_tone', 'Emotional tone (-2 to +2)'),
+                          ('detail_level', 'Detail level (1-5)')):
+        distribution = stats[column]
+        if not distribution['count']:
+            continue
+        lines.append(f"- {label}: mean {distribution['mean']}, median {distribution['median']:g} - {_counts_line(distribution)}")
+    tone = stats['emotional_tone']
+    if tone['count']:
+        lines.append(f"- Negative tone: {_percent(tone['negative_share'])} of scored rows; positive: {_percent(tone['positive_share'])}")
+    lines.append(f"- First-person stories: {stats['personal_story']['rows']} ({_percent(stats['personal_story']['share'])} of scored rows)")
+    if stats['sources']:
+        lines.append("- Sources: " + ", ".join(f"{source} {n} ({n / stats['rows']:.0%})" for source, n in stats['sources'].items()))
+    mentioned = [(keyword, value) for keyword, value in stats['keywords'].items() if value['rows']]
+    if mentioned:
+        lines.append("- Keyword prevalence (rows mentioning): " + ", ".join(
+            f"{keyword} {value['rows']} ({value['share']:.0%})" for keyword, value in mentioned))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact per-topic stats for gathered theme CSVs")
+    parser.add_argument("--keywords", nargs="+", default=None,
+                        help="Keywords to count (default: the language's list in language_config.py)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON instead of markdown")
+    add_language_args(parser)
+    args = parser.parse_args()
+
+    for language in resolve_languages(args.language):
+        csv_files = sorted(Path(f"findings/3_gather-{language}").glob(f"gathered_data-*-{language}.csv"))
+        if not csv_files:
+            print(f"❌ No gathered data for language '{language}'")
+            continue
+        for csv_file in csv_files:
+            stats = stats_for_file(csv_file, args.keywords, language)
+            if args.json:
+                print(json.dumps({'file': str(csv_file), **stats}, ensure_ascii=False))
+            else:
+                print(f"\n📈 {csv_file.name}")
+                print(format_stats(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Streaming helpers for long Gemini generations
+Chunks are appended to a .partial file as they arrive, so a dropped connection
+keeps everything generated so far and the next run resumes from it. A
+.partial.sig file beside it holds a hash of the model and prompt, so a partial
+is only resumed by the same call.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+STREAM_METRICS_FILE = "findings/logs/stream_metrics.jsonl"
+
+RESUME_INSTRUCTION = """
+
+**RESUMING AN INTERRUPTED RESPONSE:** A previous attempt at this task was cut off. The text it produced is shown below between the markers. Continue EXACTLY where it stops - do not repeat any of it, do not restart sections, and do not add any preamble.
+
+<<<PARTIAL RESPONSE>>>
+{partial}
+<<<END PARTIAL RESPONSE>>>
+"""
+
+
+def partial_path(output_path) -> str:
+    """Path of the in-progress file for an output"""
+    return f"{output_path}.partial"
+
+
+def load_partial(output_path) -> str:
+    """Text already streamed for an output by an interrupted run"""
+    path = partial_path(output_path)
+    if not os.path.exists(path):
+        return ""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def signature_path(output_path) -> str:
+    """Path of the prompt signature stored beside a partial file"""
+    return f"{partial_path(output_path)}.sig"
+
+
+def prompt_signature(model: str, contents, config=None) -> str:
+    """Hash of everything that determines a generation: model, prompt and any cached prefix"""
+    text = contents if isinstance(contents, str) else json.dumps(contents, default=str, ensure_ascii=False)
+    cached = getattr(config, 'cached_content', None) or ""
+    return hashlib.sha256(f"{model}\0{cached}\0{text}".encode('utf-8')).hexdigest()
+
+
+def is_structured(config) -> bool:
+    """True for calls constrained to a JSON schema, whose output can't be continued piecewise"""
+    if config is None:
+        return False
+    return bool(getattr(config, 'response_json_schema', None) or getattr(config, 'response_schema', None)
+                or getattr(config, 'response_mime_type', None) == 'application/json')
+
+
+def discard_partial(output_path):
+    """Remove the in-progress file once the final output has been written"""
+    for path in (partial_path(output_path), signature_path(output_path)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def resumable_partial(output_path, signature: str, structured: bool, label: str) -> str:
+    """Partial text this call may continue from; stale or unusable partials are discarded"""
+    existing = load_partial(output_path)
+    if not existing:
+        return ""
+    stored = None
+    if os.path.exists(signature_path(output_path)):
+        with open(signature_path(output_path), 'r', encoding='utf-8') as f:
+            stored = f.read().strip()
+    if structured:
+        reason = "schema-constrained output restarts as a whole"
+    elif stored != signature:
+        reason = "prompt or model changed since it was written"
+    else:
+        return existing
+    print(f"   🗑️ Discarding partial {label} ({len(existing):,} chars): {reason}")
+    discard_partial(output_path)
+    return ""
+
+
+def record_stream_metrics(metrics: dict):
+    """Append one stream's timing metrics to the shared metrics log"""
+    os.makedirs(os.path.dirname(STREAM_METRICS_FILE), exist_ok=True)
+    with open(STREAM_METRICS_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(metrics, ensure_ascii=False) + "\n")
+
+
+def stream_generate(client, model: str, prompt: str, output_path, label: str, config=None, on_usage=None,
+                    full_prompt: str | None = None) -> str:
+    """Stream a generation into output_path.partial and return the full text
+
+    If a partial file exists from an interrupted run of the same prompt and
+    model, the model is asked to continue from it and the new chunks are
+    appended. Calls with a response schema always restart, since a resumed
+    model returns a new complete JSON object. On error the partial file is
+    left in place and the exception propagates to the caller.
+    on_usage, if given, receives the stream's final usage metadata.
+    When prompt is only the suffix after a cached prefix, full_prompt is the
+    whole prompt: the partial is signed with it rather than the cache name,
+    so a cached and an uncached attempt at the same call share one partial.
+    """
+    path = partial_path(output_path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    signature = prompt_signature(model, full_prompt) if full_prompt is not None else prompt_signature(model, prompt, config)
+    existing = resumable_partial(output_path, signature, is_structured(config), label)
+    if not existing:
+        with open(signature_path(output_path), 'w', encoding='utf-8') as f:
+            f.write(signature)
+    contents = prompt + RESUME_INSTRUCTION.format(partial=existing) if existing else prompt
+    if existing:
+        print(f"   ↩️ Resuming {label} from {len(existing):,} streamed characters")
+
+    start = time.perf_counter()
+    first_token_at = None
+    chunk_count = 0
+    pieces = []
+    usage = None
+
+    completed = False
+    try:
+        with open(path, 'a', encoding='utf-8') as handle:
+            for chunk in client.models.generate_content_stream(model=model, contents=contents, config=config):
+                usage = getattr(chunk, 'usage_metadata', None) or usage
+                text = chunk.text or ""
+                if not text:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    print(f"   ⚡ {label}: first token after {first_token_at - start:.1f}s")
+                handle.write(text)
+                handle.flush()
+                pieces.append(text)
+                chunk_count += 1
+        completed = True
+    finally:
+        total_seconds = time.perf_counter() - start
+        new_text = "".join(pieces)
+        record_stream_metrics({
+            "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "label": label,
+            "model": model,
+            "output": str(output_path),
+            "resumed": bool(existing),
+            "completed": completed,
+            "time_to_first_token": round(first_token_at - start, 3) if first_token_at else None,
+            "total_seconds": round(total_seconds, 3),
+            "chunks": chunk_count,
+            "characters": len(new_text),
+        })
+        if on_usage is not None:
+            on_usage(usage)
+
+    print(f"   📶 {label}: {chunk_count} chunks, {len(new_text):,} chars in {total_seconds:.1f}s")
+    return existing + new_text
@@ -0,0 +1,170 @@
+"""
+Durable work queue backed by SQLite
+Tasks are leased to one worker at a time. Workers heartbeat to keep their
+leases, and a task whose lease expires (crashed or stalled worker) is handed
+out again until it runs out of attempts. Any number of processes, on this
+machine or others sharing the filesystem, can drain the same queue file.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import contextlib
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 3
+BUSY_TIMEOUT_SECONDS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, priority DESC, id);
+"""
+
+
+class WorkQueue:
+    """Lease-based task queue in a single SQLite file
+
+    Each task has a unique key, so enqueueing the same work twice (from a
+    rerun or from two workers finding the same URL) is a no-op. Every call
+    opens its own connection, so one instance can be shared across threads.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # Rollback journal rather than WAL: WAL needs shared memory, which network filesystems don't provide
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, kind: str, key: str, payload: dict, priority: int = 0) -> bool:
+        """Add a task; returns False if a task with this key already exists"""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO tasks (kind, key, payload, priority, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, json.dumps(payload, ensure_ascii=False), priority, now, now),
+            )
+            return cursor.rowcount == 1
+
+    def lease(self, worker_id: str) -> dict | None:
+        """Claim the highest-priority ready task (pending, or leased but expired)"""
+        tasks = self.lease_many(worker_id, 1)
+        return tasks[0] if tasks else None
+
+    def lease_many(self, worker_id: str, limit: int, exclude=()) -> list:
+        """Claim up to limit ready tasks in one transaction, highest priority first
+
+        Task ids in exclude are skipped (e.g. ones this worker already tried).
+        """
+        now = time.time()
+        exclude = list(exclude)
+        skip = f"AND id NOT IN ({', '.join('?' * len(exclude))}) " if exclude else ""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Expired leases that are out of attempts fail instead of being retried
+                conn.execute(
+                    "UPDATE tasks SET status = 'failed', error = COALESCE(error, 'lease expired'), updated = ? "
+                    "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                rows = conn.execute(
+                    "SELECT * FROM tasks WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                    f"{skip}ORDER BY priority DESC, id LIMIT ?",
+                    (now, *exclude, limit),
+                ).fetchall()
+                for row in rows:
+                    conn.execute(
+                        "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1, updated = ? "
+                        "WHERE id = ?",
+                        (worker_id, now + self.lease_seconds, now, row['id']),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        tasks = []
+        for row in rows:
+            task = dict(row)
+            task['payload'] = json.loads(task['payload'])
+            task['attempts'] += 1
+            tasks.append(task)
+        return tasks
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend a lease; False means the lease was lost to another worker"""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, now, task_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str, result=None) -> bool:
+        """Mark a task done; False if this worker no longer holds its lease"""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, lease_expires = NULL, updated = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False), now, task_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> str:
+        """Release a failed task for retry, or fail it for good once out of attempts"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (self.max_attempts, error[:500], now, task_id, worker_id),
+            )
+            row = conn.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            return row['status'] if row else 'missing'
+
+    def counts(self, kind: str | None = None) -> dict:
+        """Task counts by status"""
+        with self._connect() as conn:
+            if kind:
+                rows = conn.execute("SELECT status, COUNT(*) AS n FROM tasks WHERE kind = ? GROUP BY status", (kind,))
+            else:
+                rows = conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status")
+            counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+            counts.update({row['status']: row['n'] for row in rows})
+            return counts
+
+    def has_open_work(self) -> bool:
+        counts = self.counts()
+        return counts['pending'] + counts['leased'] > 0
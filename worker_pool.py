@@ -0,0 +1,97 @@
+"""
+Shared worker pool and rate limiter for multi-language runs
+Every API call in a process goes through one limiter, so running several
+languages at once shares a single request budget instead of multiplying it.
+"""
+
+import os
+import time
+import threading
+import concurrent.futures
+
+DEFAULT_CALLS_PER_MINUTE = 0  # no throttle unless GEMINI_CALLS_PER_MINUTE asks for one
+
+
+class RateLimiter:
+    """Spaces call starts evenly so no more than `calls_per_minute` begin per minute
+
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, calls_per_minute: float):
+        self.interval = 60.0 / calls_per_minute if calls_per_minute > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+        self.waited_seconds = 0.0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+            self.waited_seconds += slot - now
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RateLimitedModels:
+    """client.models wrapper that takes a limiter slot before each generation call"""
+
+    def __init__(self, models, limiter: RateLimiter):
+        self._models = models
+        self._limiter = limiter
+
+    def generate_content(self, *args, **kwargs):
+        self._limiter.acquire()
+        return self._models.generate_content(*args, **kwargs)
+
+    def generate_content_stream(self, *args, **kwargs):
+        self._limiter.acquire()
+        return self._models.generate_content_stream(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._models, name)
+
+
+class RateLimitedClient:
+    """genai.Client wrapper whose model calls share a rate limiter"""
+
+    def __init__(self, client, limiter: RateLimiter):
+        self._client = client
+        self.models = RateLimitedModels(client.models, limiter)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+shared_limiter = RateLimiter(float(os.environ.get("GEMINI_CALLS_PER_MINUTE", DEFAULT_CALLS_PER_MINUTE)))
+
+
+def rate_limited(client) -> RateLimitedClient:
+    """Route a client's model calls through the process-wide limiter"""
+    return RateLimitedClient(client, shared_limiter)
+
+
+def run_languages(languages: list, task, workers: int | None = None) -> dict:
+    """Run task(language) for every language on one pool; returns results by language
+
+    A single language runs inline. A failing language is reported and maps to
+    None so the others still finish.
+    """
+    if len(languages) == 1:
+        return {languages[0]: task(languages[0])}
+
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or len(languages),
+                                               thread_name_prefix="language") as pool:
+        futures = {pool.submit(task, language): language for language in languages}
+        for future in concurrent.futures.as_completed(futures):
+            language = futures[future]
+            try:
+                results[language] = future.result()
+            except Exception as e:
+                print(f"❌ {language}: {e}")
+                results[language] = None
+    return {language: results[language] for language in languages}